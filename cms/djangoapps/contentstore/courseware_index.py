@@ -1,12 +1,15 @@
 """ Code to allow module store to interface with courseware index """
 from __future__ import absolute_import
 
+import hashlib
+import json
 import logging
 import re
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import resolve
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
@@ -28,6 +31,17 @@ from xmodule.modulestore import ModuleStoreEnum
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Maximum number of documents sent to the search engine in one request.
+INDEX_BATCH_SIZE = 500
+
+# Cache keys of the manifest of the documents last indexed for a structure: its
+# header holds the version of the structure and its number of chunks, and each
+# chunk holds the hashes of up to INDEX_MANIFEST_CHUNK_SIZE documents, so that
+# the manifests of large courses fit in cache entries.
+INDEX_MANIFEST_KEY = u'courseware_index.manifest.{index_name}.{structure_key}'
+INDEX_MANIFEST_CHUNK_KEY = INDEX_MANIFEST_KEY + u'.{version}.{chunk}'
+INDEX_MANIFEST_CHUNK_SIZE = 2000
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -115,6 +129,61 @@ class SearchIndexerBase(object):
         result_ids = [result["data"]["id"] for result in response["results"]]
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
+    @classmethod
+    def _get_index_manifest(cls, structure_key):
+        """
+        Returns the manifest of the documents last indexed for the structure,
+        as a dict with the `version` of the structure and the hashes of the
+        `documents` by id, or None if it or any of its chunks isn't cached.
+        """
+        header = cache.get(INDEX_MANIFEST_KEY.format(index_name=cls.INDEX_NAME, structure_key=structure_key))
+        if header is None:
+            return None
+
+        chunk_keys = [
+            INDEX_MANIFEST_CHUNK_KEY.format(
+                index_name=cls.INDEX_NAME, structure_key=structure_key, version=header['version'], chunk=chunk,
+            )
+            for chunk in range(header['chunks'])
+        ]
+        chunks = cache.get_many(chunk_keys)
+        if len(chunks) < len(chunk_keys):
+            return None
+
+        document_hashes = {}
+        for chunk_key in chunk_keys:
+            document_hashes.update(chunks[chunk_key])
+        return {'version': header['version'], 'documents': document_hashes}
+
+    @classmethod
+    def _set_index_manifest(cls, structure_key, version, document_hashes):
+        """
+        Stores the manifest of the documents indexed for the structure, in
+        chunks of INDEX_MANIFEST_CHUNK_SIZE documents.  The header is stored
+        last, so that it never refers to chunks that weren't stored.
+        """
+        items = sorted(document_hashes.items())
+        chunks = {
+            INDEX_MANIFEST_CHUNK_KEY.format(
+                index_name=cls.INDEX_NAME, structure_key=structure_key, version=version, chunk=chunk,
+            ): dict(items[start:start + INDEX_MANIFEST_CHUNK_SIZE])
+            for chunk, start in enumerate(range(0, len(items), INDEX_MANIFEST_CHUNK_SIZE))
+        }
+        cache.set_many(chunks, settings.COURSEWARE_INDEX_MANIFEST_TIMEOUT)
+        cache.set(
+            INDEX_MANIFEST_KEY.format(index_name=cls.INDEX_NAME, structure_key=structure_key),
+            {'version': version, 'chunks': len(chunks)},
+            settings.COURSEWARE_INDEX_MANIFEST_TIMEOUT,
+        )
+
+    @classmethod
+    def _index_documents(cls, searcher, documents):
+        """
+        Sends the documents to the search engine in batches.
+        """
+        for start in range(0, len(documents), INDEX_BATCH_SIZE):
+            searcher.index(cls.DOCUMENT_TYPE, documents[start:start + INDEX_BATCH_SIZE])
+
     @classmethod
     def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
         """
@@ -132,6 +201,14 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        When COURSEWARE_INDEX_MANIFEST_TIMEOUT is positive, the hashes of the
+        indexed documents are kept in a manifest along with the version of the
+        structure.  Index updates with a manifest then skip the structure if its
+        version hasn't changed, and otherwise only send the documents that
+        changed and remove the ones that are gone, instead of relying on
+        REINDEX_AGE.  Without a manifest, e.g. after it was evicted, REINDEX_AGE
+        is used, and a new manifest is only stored if no subtree was skipped.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -143,11 +220,19 @@ class SearchIndexerBase(object):
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
 
+        use_manifest = settings.COURSEWARE_INDEX_MANIFEST_TIMEOUT > 0
+        previous_manifest = cls._get_index_manifest(structure_key) if use_manifest and triggered_at else None
+
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
             "count": 0
         }
 
+        # Whether all the documents were prepared, so that they can be recorded in a new manifest.
+        walked_all = {
+            "value": True
+        }
+
         # indexed_items is a list of all the items that we wish to remain in the
         # index, whether or not we are planning to actually update their index.
         # This is used in order to build a query to remove those items not in this
@@ -212,8 +297,13 @@ class SearchIndexerBase(object):
             indexed_items.add(item_id)
             if item.has_children:
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
-                skip_child_index = skip_index or \
-                    (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
+                # (all the documents are needed to compare them to the manifest)
+                skip_child_index = skip_index or (
+                    not previous_manifest and triggered_at is not None and
+                    (triggered_at - item.subtree_edited_on) > reindex_age
+                )
+                if skip_child_index:
+                    walked_all["value"] = False
                 children_groups_usage = []
                 for child_item in item.get_children():
                     if modulestore.has_published_version(child_item):
@@ -241,7 +331,6 @@ class SearchIndexerBase(object):
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
                 item_index.update(cls.supplemental_fields(item))
                 items_index.append(item_index)
-                indexed_count["count"] += 1
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
@@ -256,11 +345,43 @@ class SearchIndexerBase(object):
                 # First perform any additional indexing from the structure object
                 cls.supplemental_index_information(modulestore, structure)
 
+                version = getattr(structure, 'course_version', None)
+                version = unicode(version) if version else None
+                if previous_manifest and version and previous_manifest['version'] == version:
+                    log.info(u'Search index of %s is up to date with version %s', structure_key, version)
+                    return 0
+
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+
+                if use_manifest:
+                    document_hashes = {
+                        item_index['id']: _document_hash(item_index) for item_index in items_index
+                    }
+                    removed_items = []
+                    if previous_manifest:
+                        previous_hashes = previous_manifest['documents']
+                        items_index = [
+                            item_index for item_index in items_index
+                            if previous_hashes.get(item_index['id']) != document_hashes[item_index['id']]
+                        ]
+                        removed_items = [item_id for item_id in previous_hashes if item_id not in indexed_items]
+
+                indexed_count["count"] = len(items_index)
+                cls._index_documents(searcher, items_index)
+                if previous_manifest:
+                    if removed_items:
+                        searcher.remove(cls.DOCUMENT_TYPE, removed_items)
+                    log.info(
+                        u'Updated search index of %s: %d documents indexed, %d removed, %d unchanged',
+                        structure_key, len(items_index), len(removed_items),
+                        len(document_hashes) - len(items_index),
+                    )
+                else:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if use_manifest and walked_all["value"]:
+                    cls._set_index_manifest(structure_key, version, document_hashes)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -339,6 +460,13 @@ class SearchIndexerBase(object):
         return {}
 
 
+def _document_hash(document):
+    """
+    Returns a hash of the content of the index document.
+    """
+    return hashlib.md5(json.dumps(document, sort_keys=True, default=unicode)).hexdigest()
+
+
 class CoursewareSearchIndexer(SearchIndexerBase):
     """
     Class to perform indexing for courseware search from different modulestores
@@ -34,6 +34,13 @@ class Command(BaseCommand):
         parser.add_argument('--python-lib-filename',
                             default=DEFAULT_PYTHON_LIB_FILENAME,
                             help='Filename of the course code library (if it exists)')
+        parser.add_argument('--static-import-threads',
+                            type=int,
+                            default=0,
+                            help='Number of threads saving static content while the course blocks are imported')
+        parser.add_argument('--incremental',
+                            action='store_true',
+                            help='Skip static content that is unchanged since the last import')
 
     def handle(self, *args, **options):
         data_dir = options['data_directory']
@@ -66,6 +73,8 @@ class Command(BaseCommand):
             do_import_static=do_import_static, do_import_python_lib=do_import_python_lib,
             create_if_not_present=True,
             python_lib_filename=python_lib_filename,
+            static_import_threads=options.get('static_import_threads', 0),
+            incremental=options.get('incremental', False),
         )
 
         for course in course_items:
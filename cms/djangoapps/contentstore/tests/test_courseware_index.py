@@ -11,6 +11,8 @@ from uuid import uuid4
 import ddt
 import pytest
 from django.conf import settings
+from django.core.cache import cache
+from django.test.utils import override_settings
 from lazy.lazy import lazy
 from mock import patch
 from pytz import UTC
@@ -441,6 +443,64 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that index updates based on the manifest only send the changed documents """
+        cache.clear()
+        self.publish_item(store, self.vertical.location)
+        # store the manifest in several chunks
+        with override_settings(COURSEWARE_INDEX_MANIFEST_TIMEOUT=60), \
+                patch('contentstore.courseware_index.INDEX_MANIFEST_CHUNK_SIZE', 3):
+            self.assertEqual(self.reindex_course(store), 4)
+
+            # nothing was published since the full index
+            self.assertEqual(self.index_recent_changes(store, datetime.now(UTC)), 0)
+
+            # only the new unit is sent to the index
+            ItemFactory.create(
+                parent_location=self.vertical.location,
+                category="html",
+                display_name="Some other content",
+                publish_item=False,
+                modulestore=store,
+            )
+            self.publish_item(store, self.vertical.location)
+            self.assertEqual(self.index_recent_changes(store, datetime.now(UTC)), 1)
+            self.assertEqual(self.search()["total"], 5)
+
+            # deleted units are removed without sending anything else
+            self.delete_item(store, self.html_unit.location)
+            self.publish_item(store, self.vertical.location)
+            self.assertEqual(self.index_recent_changes(store, datetime.now(UTC)), 0)
+            self.assertEqual(self.search()["total"], 4)
+
+    def _test_index_without_manifest(self, store):
+        """ Make sure that index updates without a manifest only send the recent changes """
+        cache.clear()
+        self.publish_item(store, self.vertical.location)
+        with override_settings(COURSEWARE_INDEX_MANIFEST_TIMEOUT=60):
+            self.assertEqual(self.reindex_course(store), 4)
+            # the manifest was evicted
+            cache.clear()
+
+            before_time = datetime.now(UTC)
+            ItemFactory.create(
+                parent_location=self.chapter.location,
+                category='sequential',
+                display_name='Section 2',
+                modulestore=store,
+                publish_item=True,
+            )
+            # as without a manifest, the old sequential's subtree is skipped: only the
+            # chapter and its sequentials are sent
+            self.assertEqual(self.index_recent_changes(store, before_time), 3)
+            self.assertEqual(self.search()["total"], 5)
+
+            # the old subtree was skipped, so no partial manifest was stored
+            get_manifest = CoursewareSearchIndexer._get_index_manifest  # pylint: disable=protected-access
+            self.assertIsNone(get_manifest(self.course.id))
+            self.reindex_course(store)
+            self.assertIsNotNone(get_manifest(self.course.id))
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -572,6 +632,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_index_without_manifest(self, store_type):
+        self._perform_test_using_store(store_type, self._test_index_without_manifest)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
@@ -16,7 +16,7 @@ from pymongo import ASCENDING, DESCENDING
 from six import text_type
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
-from xmodule.exceptions import NotFoundError
+from xmodule.exceptions import InvalidAssetCursorError, NotFoundError
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
@@ -37,6 +37,7 @@ REQUEST_DEFAULTS = {
     'direction': '',
     'asset_type': '',
     'text_search': '',
+    'cursor': '',
 }
 
 
@@ -58,6 +59,8 @@ def assets_handler(request, course_key_string=None, asset_key_string=None):
             direction: the sort direction (defaults to 'descending')
             asset_type: the file type to filter items to (defaults to All)
             text_search: string to filter results by file name (defaults to '')
+            cursor: the nextCursor of the previous page, to find the requested page from the end of
+                the previous one rather than by skipping the assets before it (optional)
     POST
         json: create (or update?) an asset. The only updating that can be done is changing the lock state.
     PUT
@@ -140,10 +143,19 @@ def _assets_json(request, course_key):
         'current_page': current_page,
         'page_size': requested_page_size,
         'sort': sort_type_and_direction,
-        'filter_params': filter_parameters
+        'filter_params': filter_parameters,
+        'cursor': request_options['requested_cursor'],
     }
 
-    assets, total_count = _get_assets_for_page(course_key, query_options)
+    try:
+        assets, total_count = _get_assets_for_page(course_key, query_options)
+    except InvalidAssetCursorError:
+        error_message = {
+            'error_code': 'invalid_asset_cursor',
+            'developer_message': u'The cursor parameter to the request is not the nextCursor of a page with '
+                                 u'the same sort.'
+        }
+        return JsonResponse({'error': error_message}, status=400)
 
     if request_options['requested_page'] > 0 and first_asset_to_display_index >= total_count and total_count > 0:
         _update_options_to_requery_final_page(query_options, total_count)
@@ -154,6 +166,10 @@ def _assets_json(request, course_key):
     last_asset_to_display_index = first_asset_to_display_index + len(assets)
     assets_in_json_format = _get_assets_in_json_format(assets, course_key)
 
+    next_cursor = None
+    if assets and last_asset_to_display_index < total_count:
+        next_cursor = contentstore().get_asset_cursor(assets[-1], query_options['sort'])
+
     response_payload = {
         'start': first_asset_to_display_index,
         'end': last_asset_to_display_index,
@@ -165,6 +181,7 @@ def _assets_json(request, course_key):
         'direction': request_options['requested_sort_direction'],
         'assetTypes': _get_requested_file_types_from_requested_filter(request_options['requested_asset_type']),
         'textSearch': request_options['requested_text_search'],
+        'nextCursor': next_cursor,
     }
 
     return JsonResponse(response_payload)
@@ -178,6 +195,7 @@ def _parse_request_to_dictionary(request):
         'requested_sort_direction': _get_requested_attribute(request, 'direction'),
         'requested_asset_type': _get_requested_attribute(request, 'asset_type'),
         'requested_text_search': _get_requested_attribute(request, 'text_search'),
+        'requested_cursor': _get_requested_attribute(request, 'cursor'),
     }
 
 
@@ -326,12 +344,14 @@ def _get_assets_for_page(course_key, options):
     filter_params = options['filter_params'] if options['filter_params'] else None
     start = current_page * page_size
     return contentstore().get_all_content_for_course(
-        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params
+        course_key, start=start, maxresults=page_size, sort=sort, filter_params=filter_params,
+        after=options['cursor'] or None,
     )
 
 
 def _update_options_to_requery_final_page(query_options, total_asset_count):
     query_options['current_page'] = int(math.floor((total_asset_count - 1) / query_options['page_size']))
+    query_options['cursor'] = None
 
 
 def _get_assets_in_json_format(assets, course_key):
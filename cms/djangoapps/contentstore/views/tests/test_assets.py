@@ -237,6 +237,32 @@ class PaginationTestCase(AssetsTestCase):
         # Verify valid page requests
         self.assert_correct_filter_response(self.url, 'asset_type', 'OTHER')
 
+    def test_cursor_pagination(self):
+        """
+        Test paging through the assets with the nextCursor of each page
+        """
+        for name in ("asset-1", "asset-2", "asset-3", "asset-4"):
+            self.upload_asset(name)
+        all_assets = json.loads(self.client.get(self.url, HTTP_ACCEPT='application/json').content)['assets']
+
+        paged_assets = []
+        cursor = ''
+        for page in range(2):
+            json_response = json.loads(self.client.get(
+                self.url, {'page_size': 2, 'page': page, 'cursor': cursor}, HTTP_ACCEPT='application/json'
+            ).content)
+            self.assertEquals(json_response['start'], page * 2)
+            paged_assets.extend(json_response['assets'])
+            cursor = json_response['nextCursor']
+        self.assertIsNone(cursor)
+        self.assertEquals(
+            [asset['id'] for asset in paged_assets],
+            [asset['id'] for asset in all_assets],
+        )
+
+        resp = self.client.get(self.url, {'page': 1, 'cursor': 'invalid'}, HTTP_ACCEPT='application/json')
+        self.assertEquals(resp.status_code, 400)
+
     def assert_correct_asset_response(self, url, expected_start, expected_length, expected_total):
         """
         Get from the url and ensure it contains the expected number of responses
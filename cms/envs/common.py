@@ -108,6 +108,7 @@ from lms.envs.common import (
     # django-debug-toolbar
     DEBUG_TOOLBAR_PATCH_SETTINGS,
     BLOCK_STRUCTURES_SETTINGS,
+    COURSE_OVERVIEW_CACHE_TIMEOUT,
 
     # File upload defaults
     FILE_UPLOAD_STORAGE_BUCKET_NAME,
@@ -672,6 +673,8 @@ STATICFILES_DIRS = [
     # ("book", ENV_ROOT / "book_images"),
 ]
 
+COURSE_ASSETS_DISK_CACHE = dict(lms.envs.common.COURSE_ASSETS_DISK_CACHE)
+
 # Locale/Internationalization
 CELERY_TIMEZONE = 'UTC'
 TIME_ZONE = 'America/New_York'  # http://en.wikipedia.org/wiki/List_of_tz_zones_by_name
@@ -697,6 +700,15 @@ MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 
 COURSE_IMPORT_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# The number of threads saving the static files of an imported course into the
+# contentstore, while its blocks are imported.  0 saves them before the blocks,
+# one at a time.
+COURSE_IMPORT_STATIC_THREADS = 0
+
+# Whether static files of an imported course that are unchanged since its last
+# import are skipped, rather than saved into the contentstore again.
+COURSE_IMPORT_INCREMENTAL = False
+
 ##### EMBARGO #####
 EMBARGO_SITE_REDIRECT_URL = None
 
@@ -1410,6 +1422,11 @@ FILES_AND_UPLOAD_TYPE_FILTERS = {
 
 # Default to no Search Engine
 SEARCH_ENGINE = None
+
+# Number of seconds the manifests of the documents indexed for courses and
+# libraries are kept, or 0 to always update the index based on REINDEX_AGE.
+# With a manifest, publishing only sends the changed documents to the index.
+COURSEWARE_INDEX_MANIFEST_TIMEOUT = 0
 ELASTIC_FIELD_MAPPINGS = {
     "start_date": {
         "type": "date"
@@ -238,6 +238,7 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
+COURSE_ASSETS_DISK_CACHE.update(ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE', {}))
 
 COMPREHENSIVE_THEME_DIRS = ENV_TOKENS.get('COMPREHENSIVE_THEME_DIRS', COMPREHENSIVE_THEME_DIRS) or []
 
@@ -360,6 +361,8 @@ else:
     DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
 COURSE_IMPORT_EXPORT_BUCKET = ENV_TOKENS.get('COURSE_IMPORT_EXPORT_BUCKET', '')
+COURSE_IMPORT_STATIC_THREADS = ENV_TOKENS.get('COURSE_IMPORT_STATIC_THREADS', COURSE_IMPORT_STATIC_THREADS)
+COURSE_IMPORT_INCREMENTAL = ENV_TOKENS.get('COURSE_IMPORT_INCREMENTAL', COURSE_IMPORT_INCREMENTAL)
 
 if COURSE_IMPORT_EXPORT_BUCKET:
     COURSE_IMPORT_EXPORT_STORAGE = 'contentstore.storage.ImportExportS3Storage'
@@ -499,6 +502,9 @@ if FEATURES['ENABLE_COURSEWARE_INDEX'] or FEATURES['ENABLE_LIBRARY_INDEX']:
     SEARCH_ENGINE = "search.elastic.ElasticSearchEngine"
 
 ELASTIC_SEARCH_CONFIG = ENV_TOKENS.get('ELASTIC_SEARCH_CONFIG', [{}])
+COURSEWARE_INDEX_MANIFEST_TIMEOUT = ENV_TOKENS.get(
+    'COURSEWARE_INDEX_MANIFEST_TIMEOUT', COURSEWARE_INDEX_MANIFEST_TIMEOUT
+)
 
 XBLOCK_SETTINGS = ENV_TOKENS.get('XBLOCK_SETTINGS', {})
 XBLOCK_SETTINGS.setdefault("VideoDescriptor", {})["licensing_enabled"] = FEATURES.get("LICENSING", False)
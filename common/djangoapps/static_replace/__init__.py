@@ -4,15 +4,20 @@ import re
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.contrib.staticfiles import finders
 from django.conf import settings
+from django.utils.lru_cache import lru_cache
 
 from xmodule.contentstore.content import StaticContent
 
 from opaque_keys.edx.locator import AssetLocator
+from openedx.core.djangoapps.theming.helpers import get_current_site_theme
 from six import text_type
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# The number of staticfiles_storage lookups that are memoized.
+STATICFILES_LOOKUP_CACHE_SIZE = 4096
+
 
 def _url_replace_regex(prefix):
     """
@@ -30,13 +35,60 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+@lru_cache()
+def _url_replace_pattern(prefix):
+    """
+    Returns the compiled _url_replace_regex of the prefix.
+    """
+    return re.compile(_url_replace_regex(prefix))
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the prefix regex of the static urls that are rewritten, excluding
+    the ones already in the data directory.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
+@lru_cache(maxsize=STATICFILES_LOOKUP_CACHE_SIZE)
+def _staticfiles_exists(storage, path):
+    """
+    Returns whether the path exists in the staticfiles storage.  Static files
+    don't change while the process runs, so the lookups are memoized.
+    """
+    return storage.exists(path)
+
+
+def _staticfiles_url(storage, path):
+    """
+    Returns the url of the path in the staticfiles storage, memoized like
+    _staticfiles_exists.  The urls of a ThemeStorage depend on the theme of
+    the current site, so they're memoized for each theme.
+    """
+    site_theme = get_current_site_theme()
+    return _themed_staticfiles_url(storage, path, site_theme.theme_dir_name if site_theme else None)
+
+
+@lru_cache(maxsize=STATICFILES_LOOKUP_CACHE_SIZE)
+def _themed_staticfiles_url(storage, path, theme_dir_name):  # pylint: disable=unused-argument
+    """
+    Returns the url of the path in the staticfiles storage, for the site
+    theme with the given directory name.
+    """
+    return storage.url(path)
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
     a dead link instead of raising an exception.
     """
     try:
-        url = staticfiles_storage.url(path)
+        url = _staticfiles_url(staticfiles_storage, path)
     except Exception as err:
         log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
             path, str(err)))
@@ -71,7 +123,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _url_replace_pattern('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -91,7 +143,19 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _url_replace_pattern('/course/').sub(replace_course_url, text)
+
+
+def _is_xblock_resource_url(url):
+    """
+    Returns whether the static url is an XBlock resource link, which isn't rewritten.
+    """
+    # Probably wasn't a good idea that /static works for actual static assets and
+    # for magical course asset URLs....
+    starts_with_static_url = url.startswith(unicode(settings.STATIC_URL))
+    starts_with_prefix = url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
+    contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in url
+    return starts_with_prefix or (starts_with_static_url and contains_prefix)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -109,26 +173,13 @@ def process_static_urls(text, replacement_function, data_dir=None):
         quote = match.group('quote')
         rest = match.group('rest')
 
-        # Don't rewrite XBlock resource links.  Probably wasn't a good idea that /static
-        # works for actual static assets and for magical course asset URLs....
-        full_url = prefix + rest
-
-        starts_with_static_url = full_url.startswith(unicode(settings.STATIC_URL))
-        starts_with_prefix = full_url.startswith(XBLOCK_STATIC_RESOURCE_PREFIX)
-        contains_prefix = XBLOCK_STATIC_RESOURCE_PREFIX in full_url
-        if starts_with_prefix or (starts_with_static_url and contains_prefix):
+        # Don't rewrite XBlock resource links.
+        if _is_xblock_resource_url(prefix + rest):
             return original
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _url_replace_pattern(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -148,22 +199,10 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path='', static_paths_out=None):
+def _static_url_replacer(data_directory=None, course_id=None, static_asset_path='', static_paths_out=None):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..)
-
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
-    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
-      * the original unmodified static URI
-      * the updated static URI (will match the original if unchanged)
+    Returns the process_static_urls replacement function of replace_static_urls.
     """
-
     if static_paths_out is None:
         static_paths_out = []
 
@@ -189,13 +228,13 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
 
             exists_in_staticfiles_storage = False
             try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                exists_in_staticfiles_storage = _staticfiles_exists(staticfiles_storage, rest)
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
 
             if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
+                url = _staticfiles_url(staticfiles_storage, rest)
             else:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
@@ -213,10 +252,10 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             course_path = "/".join((static_asset_path or data_directory, rest))
 
             try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
+                if _staticfiles_exists(staticfiles_storage, rest):
+                    url = _staticfiles_url(staticfiles_storage, rest)
                 else:
-                    url = staticfiles_storage.url(course_path)
+                    url = _staticfiles_url(staticfiles_storage, course_path)
             # And if that fails, assume that it's course content, and add manually data directory
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
@@ -226,4 +265,62 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         static_paths_out.append((original_uri, url))
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
+
+
+def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path='', static_paths_out=None):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..)
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    static_paths_out: (optional) pass an array to collect tuples for each static URI found:
+      * the original unmodified static URI
+      * the updated static URI (will match the original if unchanged)
+    """
+    return process_static_urls(
+        text,
+        _static_url_replacer(data_directory, course_id, static_asset_path, static_paths_out),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+def replace_urls(text, data_directory=None, course_id=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Applies replace_static_urls, replace_course_urls and, if jump_to_id_base_url
+    is given, replace_jump_to_id_urls to the text, in a single pass over it.
+
+    text: The source text to do the substitution in
+    data_directory, course_id, static_asset_path: As for replace_static_urls
+    jump_to_id_base_url: As for replace_jump_to_id_urls
+    """
+    data_dir = static_asset_path or data_directory
+    prefixes = [_static_url_prefix(data_dir), '/course/']
+    if jump_to_id_base_url is not None:
+        prefixes.append('/jump_to_id/')
+    replace_static_url = _static_url_replacer(data_directory, course_id, static_asset_path)
+    course_url_base = '/courses/' + text_type(course_id) + '/'
+
+    def replace_url(match):
+        """
+        Rewrites the matched url as the function of its prefix would.
+        """
+        original = match.group(0)
+        prefix = match.group('prefix')
+        quote = match.group('quote')
+        rest = match.group('rest')
+
+        if prefix == '/course/':
+            return "".join([quote, course_url_base, rest, quote])
+        elif prefix == '/jump_to_id/':
+            return "".join([quote, jump_to_id_base_url + rest, quote])
+        elif _is_xblock_resource_url(prefix + rest):
+            return original
+        return replace_static_url(original, prefix, quote, rest)
+
+    return _url_replace_pattern(u'|'.join(prefixes)).sub(replace_url, text)
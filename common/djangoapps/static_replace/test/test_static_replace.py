@@ -3,6 +3,8 @@
 from __future__ import print_function
 
 import re
+import timeit
+import unittest
 from cStringIO import StringIO
 from urlparse import parse_qsl, urlparse, urlunparse
 
@@ -19,7 +21,9 @@ from static_replace import (
     make_static_urls_absolute,
     process_static_urls,
     replace_course_urls,
-    replace_static_urls
+    replace_jump_to_id_urls,
+    replace_static_urls,
+    replace_urls
 )
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.content import StaticContent
@@ -199,6 +203,56 @@ def test_static_paths_out(mock_modulestore, mock_storage):
     assert static_paths == [(static_url, static_course_url), (raw_url, raw_url)]
 
 
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_replace_urls(mock_storage):
+    """
+    Make sure replace_urls rewrites urls like the separate replace functions do
+    """
+    mock_storage.exists.side_effect = lambda path: path == 'file.png'
+    mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+
+    text = (
+        '<img src="/static/file.png"/><img src="/static/other.png"/><a href="/static/{}/file.png">'
+        '<a href="/course/info"><a href=\'/jump_to_id/intro\'><img src="/static/foo.png?raw"/>'
+    ).format(DATA_DIRECTORY)
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(text, DATA_DIRECTORY), COURSE_KEY),
+        COURSE_KEY,
+        '/courses/org/course/run/jump_to_id/',
+    )
+    assert replace_urls(
+        text, DATA_DIRECTORY, COURSE_KEY, jump_to_id_base_url='/courses/org/course/run/jump_to_id/'
+    ) == expected
+    assert replace_urls(text, DATA_DIRECTORY, COURSE_KEY) == replace_course_urls(
+        replace_static_urls(text, DATA_DIRECTORY), COURSE_KEY
+    )
+
+
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_staticfiles_lookups_memoized(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/hashed/file.png'
+
+    for __ in range(3):
+        assert replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY) == '"/static/hashed/file.png"'
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
+
+
+@patch('static_replace.staticfiles_storage', autospec=True)
+@patch('static_replace.get_current_site_theme')
+def test_staticfiles_urls_memoized_for_each_theme(mock_get_current_site_theme, mock_storage):
+    mock_storage.exists.return_value = True
+    for theme_dir_name in ('red-theme', 'blue-theme'):
+        mock_get_current_site_theme.return_value = Mock(theme_dir_name=theme_dir_name)
+        mock_storage.url.return_value = '/static/{}/hashed/file.png'.format(theme_dir_name)
+        for __ in range(2):
+            assert replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY) == '"/static/{}/hashed/file.png"'.format(
+                theme_dir_name
+            )
+    assert mock_storage.url.call_count == 2
+
+
 def test_regex():
     yes = ('"/static/foo.png"',
            '"/static/foo.png"',
@@ -787,3 +841,40 @@ class CanonicalContentTest(SharedModuleStoreTestCase):
             print(expected)
             print(asset_path)
             self.assertIsNotNone(re.match(expected, asset_path))
+
+
+@unittest.skip
+class ReplaceUrlsBenchmark(unittest.TestCase):
+    """
+    Compares applying the separate url replace functions to a large HTML
+    module against replace_urls.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_RUNS = 20
+
+    @patch('static_replace.staticfiles_storage', autospec=True)
+    def test_replace_urls(self, mock_storage):
+        mock_storage.exists.return_value = True
+        mock_storage.url.side_effect = lambda path: '/static/hashed/' + path
+        text = u''.join(
+            u'<p>Paragraph {0} of the module.</p><img src="/static/images/figure{0}.png"/>'
+            u'<a href="/course/wiki/page{0}">wiki</a> <a href="/jump_to_id/unit{0}">unit</a>'.format(index)
+            for index in range(2000)
+        )
+        jump_to_id_base_url = '/courses/org/course/run/jump_to_id/'
+
+        def _separate():
+            replace_jump_to_id_urls(
+                replace_course_urls(replace_static_urls(text, DATA_DIRECTORY), COURSE_KEY),
+                COURSE_KEY,
+                jump_to_id_base_url,
+            )
+
+        def _single_pass():
+            replace_urls(text, DATA_DIRECTORY, COURSE_KEY, jump_to_id_base_url=jump_to_id_base_url)
+
+        print(u'{} characters:'.format(len(text)))
+        print(u'  separate: {:.4f}s'.format(timeit.timeit(_separate, number=self.NUM_RUNS) / self.NUM_RUNS))
+        print(u'  single pass: {:.4f}s'.format(timeit.timeit(_single_pass, number=self.NUM_RUNS) / self.NUM_RUNS))
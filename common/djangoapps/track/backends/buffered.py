@@ -0,0 +1,203 @@
+"""
+Event tracker backend that sends events to another backend in batches,
+from a background thread.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.db import close_old_connections
+from six.moves import queue
+
+from track.backends import BaseBackend
+
+log = logging.getLogger(__name__)
+
+# Queued by flush() to stop the background thread, once it has sent the
+# events queued before it.
+_STOP = object()
+
+
+class BufferedBackend(BaseBackend):
+    """
+    Event tracker backend that queues events in memory, and sends them to
+    another backend in batches from a background thread, so that a slow
+    backend doesn't add latency to the requests emitting events.
+
+    When the queue is full, events are dropped, after waiting for up to
+    `block_timeout` seconds for room in the queue.  The numbers of queued,
+    sent and dropped events are counted.
+
+    Example configuration::
+
+      TRACKING_BACKENDS = {
+          'mongo': {
+              'ENGINE': 'track.backends.buffered.BufferedBackend',
+              'OPTIONS': {
+                  'backend': {
+                      'ENGINE': 'track.backends.mongodb.MongoBackend',
+                      'OPTIONS': {...}
+                  },
+                  'batch_size': 100,
+                  'flush_interval': 1,
+              }
+          }
+      }
+
+    """
+
+    def __init__(
+        self, backend, max_queue_size=10000, batch_size=100, flush_interval=1.0, block_timeout=0, flush_timeout=10,
+        **kwargs
+    ):
+        """
+        Configure the buffering, and the backend the events are sent to.
+
+        :Parameters:
+
+          - `backend`: configuration of the backend, with an `ENGINE` and
+            optional `OPTIONS`, as in the `TRACKING_BACKENDS` setting
+          - `max_queue_size`: maximum number of queued events
+          - `batch_size`: maximum number of events sent in a batch
+          - `flush_interval`: maximum number of seconds an event waits
+            for its batch to fill up
+          - `block_timeout`: number of seconds to wait for room in a
+            full queue before dropping the event, or 0 not to wait
+          - `flush_timeout`: maximum number of seconds `flush` waits for
+            the background thread to send the events it's sending
+
+        """
+        super(BufferedBackend, self).__init__(**kwargs)
+
+        # Imported here, since the tracker instantiates this backend.
+        from track.tracker import _instantiate_backend_from_name
+        self.backend = _instantiate_backend_from_name(backend['ENGINE'], backend.get('OPTIONS', {}))
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.flush_timeout = flush_timeout
+
+        self.queued = 0
+        self.sent = 0
+        self.dropped = 0
+
+        self._queue = queue.Queue(max_queue_size)
+        self._send_lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+        atexit.register(self.flush)
+
+    def send(self, event):
+        """Queue the event, or drop it if the queue is full."""
+        self._ensure_worker()
+        try:
+            self._queue.put(event, block=self.block_timeout > 0, timeout=self.block_timeout or None)
+        except queue.Full:
+            with self._counters_lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # Don't flood the logs while the backend can't keep up.
+            if dropped == 1 or dropped % 1000 == 0:
+                log.warning(u'Tracking event queue is full, %d events dropped so far', dropped)
+        else:
+            with self._counters_lock:
+                self.queued += 1
+
+    def flush(self):
+        """
+        Send all the queued events.  The background thread is stopped once
+        it has sent the events it already took off the queue, and any events
+        left are sent in the current thread.
+        """
+        worker = self._worker
+        if worker is not None and self._worker_pid == os.getpid() and worker.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=self.flush_timeout)
+            except queue.Full:
+                pass
+            else:
+                worker.join(self.flush_timeout)
+
+        while True:
+            batch = self._get_batch(block=False)
+            if not batch:
+                break
+            batch = [event for event in batch if event is not _STOP]
+            if batch:
+                self._send_batch(batch)
+
+    def _ensure_worker(self):
+        """
+        Starts the background thread, unless it's running.  A new thread is
+        started after a fork, since threads aren't copied in the child process.
+        """
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._counters_lock:
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name='tracking-event-sender')
+            self._worker.daemon = True
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _run(self):
+        """Send the queued events in batches, until flush() stops the thread."""
+        while True:
+            batch = self._get_batch(block=True)
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                # The backend may use the database, from this long-lived thread.
+                close_old_connections()
+                self._send_batch(batch)
+            if stop:
+                return
+
+    def _get_batch(self, block):
+        """
+        Returns the next batch of queued events.  If `block` is true, waits
+        for a first event, then for up to `flush_interval` seconds for the
+        batch to fill up.  A batch ends at the _STOP marker queued by flush().
+        """
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                if not block:
+                    event = self._queue.get_nowait()
+                elif deadline is None:
+                    event = self._queue.get()
+                    deadline = time.time() + self.flush_interval
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    event = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(event)
+            if event is _STOP:
+                break
+        return batch
+
+    def _send_batch(self, batch):
+        """Send the batch of events to the backend."""
+        # The background thread and flush() may send batches concurrently.
+        with self._send_lock:
+            try:
+                self.backend.send_many(batch)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u'Error sending %d tracking events', len(batch))
+            else:
+                with self._counters_lock:
+                    self.sent += len(batch)
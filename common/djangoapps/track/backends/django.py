@@ -86,3 +86,10 @@ class DjangoBackend(BaseBackend):
             tldat.save(using=self.name)
         except Exception as e:  # pylint: disable=broad-except
             log.exception(e)
+
+    def send_many(self, events):
+        tldats = [TrackingLog(**{x: event.get(x, '') for x in LOGFIELDS}) for event in events]
+        try:
+            TrackingLog.objects.using(self.name).bulk_create(tldats)
+        except Exception as e:  # pylint: disable=broad-except
+            log.exception(e)
@@ -96,3 +96,12 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert the events in to the Mongo collection, in a single batch"""
+        try:
+            self.collection.insert(list(events), manipulate=False)
+        except (PyMongoError, BSONError):
+            # As for send, the events will be lost.
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
@@ -0,0 +1,100 @@
+from __future__ import absolute_import
+
+import os
+import threading
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.backends.buffered import BufferedBackend
+
+
+class BatchRecordingBackend(BaseBackend):
+    """A backend that records the batches of events it's sent"""
+    def __init__(self, **options):
+        super(BatchRecordingBackend, self).__init__(**options)
+        self.batches = []
+
+    def send(self, event):
+        self.batches.append([event])
+
+    def send_many(self, events):
+        self.batches.append(list(events))
+
+
+class TestBufferedBackend(TestCase):
+    def setUp(self):
+        super(TestBufferedBackend, self).setUp()
+        # Send the queued events from the test thread only.
+        worker_patcher = patch.object(BufferedBackend, '_ensure_worker')
+        worker_patcher.start()
+        self.addCleanup(worker_patcher.stop)
+
+    def _create_backend(self, **options):
+        return BufferedBackend(
+            backend={'ENGINE': 'track.backends.tests.test_buffered.BatchRecordingBackend'},
+            **options
+        )
+
+    def test_batches(self):
+        backend = self._create_backend(batch_size=2)
+        events = [{'test': index} for index in range(5)]
+        for event in events:
+            backend.send(event)
+
+        self.assertEqual(backend.backend.batches, [])
+        backend.flush()
+
+        self.assertEqual(backend.backend.batches, [events[0:2], events[2:4], events[4:]])
+        self.assertEqual((backend.queued, backend.sent, backend.dropped), (5, 5, 0))
+
+    def test_full_queue(self):
+        backend = self._create_backend(max_queue_size=2)
+        for index in range(3):
+            backend.send({'test': index})
+        backend.flush()
+
+        self.assertEqual(backend.backend.batches, [[{'test': 0}, {'test': 1}]])
+        self.assertEqual((backend.queued, backend.sent, backend.dropped), (2, 2, 1))
+
+    def test_backend_error(self):
+        backend = self._create_backend()
+        backend.send({'test': 1})
+        with patch.object(backend.backend, 'send_many', side_effect=Exception):
+            backend.flush()
+
+        self.assertEqual((backend.queued, backend.sent, backend.dropped), (1, 0, 0))
+
+    def test_worker(self):
+        backend = self._create_backend(flush_interval=0.01)
+        backend.send({'test': 1})
+        # pylint: disable=protected-access
+        self.assertEqual(backend._get_batch(block=True), [{'test': 1}])
+
+    @patch('track.backends.buffered.close_old_connections')
+    def test_flush_waits_for_the_worker(self, mock_close_old_connections):
+        backend = self._create_backend(flush_interval=0.01)
+        sending, release = threading.Event(), threading.Event()
+        send_many = backend.backend.send_many
+
+        def slow_send_many(events):
+            """Send the events once the test releases them"""
+            sending.set()
+            release.wait()
+            send_many(events)
+
+        # pylint: disable=protected-access
+        backend._worker = threading.Thread(target=backend._run)
+        backend._worker_pid = os.getpid()
+        backend._worker.start()
+        with patch.object(backend.backend, 'send_many', side_effect=slow_send_many):
+            backend.send({'test': 1})
+            # The worker has taken the event off the queue.
+            sending.wait()
+            threading.Timer(0.1, release.set).start()
+            backend.flush()
+
+        self.assertEqual(backend.backend.batches, [[{'test': 1}]])
+        self.assertFalse(backend._worker.is_alive())
+        mock_close_old_connections.assert_called_once_with()
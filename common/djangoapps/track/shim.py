@@ -101,9 +101,9 @@ class PrefixedEventProcessor(object):
         If the event is registered with the EventTransformerRegistry, transform
         it.  Otherwise do nothing to it, and continue processing.
         """
-        try:
-            event = EventTransformerRegistry.create_transformer(event)
-        except KeyError:
+        transformer = EventTransformerRegistry.get_transformer(event)
+        if transformer is None:
             return
+        event = transformer(event)
         event.transform()
         return event
@@ -1,5 +1,8 @@
 """Ensure emitted events contain the fields legacy processors expect to find."""
 
+import json
+import timeit
+import unittest
 from collections import namedtuple
 
 import ddt
@@ -259,6 +262,46 @@ class EventTransformerRegistryTestCase(EventTrackingTestCase):
             self.registry.create_transformer(event)
 
 
+@ddt.ddt
+class DottedPathMappingTestCase(unittest.TestCase):
+    """
+    Test the matching of keys in DottedPathMapping
+    """
+
+    def setUp(self):
+        super(DottedPathMappingTestCase, self).setUp()
+        self.mapping = transformers.DottedPathMapping()
+        self.mapping['edx.'] = 'edx'
+        self.mapping['edx.ui.lms.'] = 'lms'
+        self.mapping['edx.ui.lms.sequence.tab_selected'] = 'tab_selected'
+
+    @ddt.data(
+        ('edx.ui.lms.sequence.tab_selected', 'tab_selected'),
+        ('edx.ui.lms.sequence.next_selected', 'lms'),
+        ('edx.ui.lms.', 'lms'),
+        ('edx.ui.lms', 'edx'),
+        ('edx.ui', 'edx'),
+        ('edx', None),
+        ('edxx.ui', None),
+        ('problem_check', None),
+        (None, None),
+    )
+    @ddt.unpack
+    def test_lookup(self, key, expected_value):
+        self.assertEqual(self.mapping.get(key), expected_value)
+        self.assertEqual(key in self.mapping, expected_value is not None)
+        if expected_value is None:
+            with self.assertRaises(KeyError):
+                self.mapping[key]  # pylint: disable=pointless-statement
+        else:
+            self.assertEqual(self.mapping[key], expected_value)
+
+    def test_delete_prefix(self):
+        del self.mapping['edx.ui.lms.']
+        self.assertEqual(self.mapping.get('edx.ui.lms.sequence.next_selected'), 'edx')
+        self.assertEqual(sorted(self.mapping.keys()), ['edx.', 'edx.ui.lms.sequence.tab_selected'])
+
+
 @ddt.ddt
 class PrefixedEventProcessorTestCase(EventTrackingTestCase):
     """
@@ -318,3 +361,60 @@ class PrefixedEventProcessorTestCase(EventTrackingTestCase):
         self.assertEqual(result[u'event_type'], u'seq_goto')
         self.assertEqual(result[u'event'][u'old'], 2)
         self.assertEqual(result[u'event'][u'new'], 5)
+
+    def test_unchanged_payload_not_reencoded(self):
+        payload = u'{"id": "i4x-foo-bar-baz", "code": "mobile"}'
+        event = {
+            u'name': u'edx.video.unknown',
+            u'event': payload,
+        }
+
+        process_event_shim = PrefixedEventProcessor()
+        result = process_event_shim(event)
+        self.assertIs(result[u'event'], payload)
+
+    def test_untransformed_event(self):
+        process_event_shim = PrefixedEventProcessor()
+        self.assertIsNone(process_event_shim({u'name': u'problem_check', u'event': {}}))
+
+
+@unittest.skip
+class PrefixedEventProcessorBenchmark(unittest.TestCase):
+    """
+    Times the PrefixedEventProcessor over a mix of events, most of which
+    have no transformer.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_RUNS = 20000
+
+    def test_event_mix(self):
+        video_payload = json.dumps({
+            u'module_id': u'i4x://foo/bar/baz/some_module',
+            u'current_time': 132.134456,
+            u'seek_type': u'skip',
+            u'requested_skip_interval': -30,
+        })
+        events = [
+            {u'name': u'edx.video.played', u'event': video_payload, u'context': {}},
+            {u'name': u'edx.video.position.changed', u'event': video_payload, u'context': {}},
+            {u'name': u'edx.ui.lms.sequence.next_selected', u'event': {u'current_tab': 1, u'tab_count': 5}},
+            {u'name': u'edx.ui.lms.sequence.tab_selected', u'event': {u'current_tab': 1, u'target_tab': 3}},
+            {u'name': u'problem_check', u'event': {}},
+            {u'name': u'edx.course.enrollment.activated', u'event': {}},
+            {u'name': u'/courses/course-v1:org+course+run/courseware', u'event': {}},
+            {u'name': u'page_close', u'event': u''},
+            {u'name': u'edx.bi.user.account.updated', u'event': {}},
+            {u'name': u'play_video', u'event': video_payload},
+        ]
+        process_event_shim = PrefixedEventProcessor()
+
+        def _process_all():
+            for event in events:
+                process_event_shim(dict(event))
+
+        print(u'{} events: {:.2f}us per event'.format(
+            len(events),
+            timeit.timeit(_process_all, number=self.NUM_RUNS) / self.NUM_RUNS / len(events) * 1e6,
+        ))
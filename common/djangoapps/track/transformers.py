@@ -24,56 +24,83 @@ class DottedPathMapping(object):
     be used.
     """
 
-    # TODO: The current implementation of the prefix registry requires
-    # O(number of prefix event transformers) to access an event.  If we get a
-    # large number of EventTransformers, it may be worth writing a tree-based
-    # map structure where each node is a segment of the match key, which would
-    # reduce access time to O(len(match.key.split('.'))), or essentially constant
-    # time.
+    # Prefixes are stored in a tree where each node is a segment of the
+    # prefix, so finding the longest matching prefix of a key takes
+    # O(len(key.split('.'))) time, whatever the number of prefixes.  Each node
+    # is a dict of its child nodes by segment, where the value of the prefix
+    # ending at the node, if any, is stored under _PREFIX_VALUE.
+    _PREFIX_VALUE = object()
 
     def __init__(self, registry=None):
         self._match_registry = {}
         self._prefix_registry = {}
+        self._prefix_tree = {}
         self.update(registry or {})
 
     def __contains__(self, key):
-        try:
-            _ = self[key]
-            return True
-        except KeyError:
-            return False
+        return self._lookup(key, self._PREFIX_VALUE) is not self._PREFIX_VALUE
 
     def __getitem__(self, key):
-        if key in self._match_registry:
-            return self._match_registry[key]
-        if isinstance(key, basestring):
-            # Reverse-sort the keys to find the longest matching prefix.
-            for prefix in sorted(self._prefix_registry, reverse=True):
-                if key.startswith(prefix):
-                    return self._prefix_registry[prefix]
-        raise KeyError('Key {} not found in {}'.format(key, type(self)))
+        value = self._lookup(key, self._PREFIX_VALUE)
+        if value is self._PREFIX_VALUE:
+            raise KeyError('Key {} not found in {}'.format(key, type(self)))
+        return value
 
     def __setitem__(self, key, value):
         if key.endswith('.'):
             self._prefix_registry[key] = value
+            self._build_prefix_tree()
         else:
             self._match_registry[key] = value
 
     def __delitem__(self, key):
         if key.endswith('.'):
             del self._prefix_registry[key]
+            self._build_prefix_tree()
         else:
             del self._match_registry[key]
 
+    def _build_prefix_tree(self):
+        """
+        Rebuild the tree of the prefixes.
+        """
+        tree = {}
+        for prefix, value in self._prefix_registry.iteritems():
+            node = tree
+            for segment in prefix[:-1].split('.'):
+                node = node.setdefault(segment, {})
+            node[self._PREFIX_VALUE] = value
+        self._prefix_tree = tree
+
+    def _lookup(self, key, default):
+        """
+        Return the value of the exact match of the key, or else of its longest
+        matching prefix, or `default` if there's none.
+        """
+        try:
+            return self._match_registry[key]
+        except (KeyError, TypeError):
+            pass
+        if not isinstance(key, basestring) or not self._prefix_tree:
+            return default
+
+        value = default
+        node = self._prefix_tree
+        segments = key.split('.')
+        # A prefix only matches keys with at least one more segment.
+        for segment in segments[:-1]:
+            node = node.get(segment)
+            if node is None:
+                break
+            value = node.get(self._PREFIX_VALUE, value)
+        return value
+
     def get(self, key, default=None):
         """
         Return `self[key]` if it exists, otherwise, return `None` or `default`
         if it is specified.
         """
-        try:
-            self[key]
-        except KeyError:
-            return default
+        return self._lookup(key, default)
 
     def update(self, dict_):
         """
@@ -120,6 +147,15 @@ class EventTransformerRegistry(object):
         name = event.get(u'name')
         return cls.mapping[name](event)
 
+    @classmethod
+    def get_transformer(cls, event):
+        """
+        Return the EventTransformer class registered to handle the given
+        event, or None if there's none.  Unlike `create_transformer`, this
+        doesn't raise an exception for the many events without a transformer.
+        """
+        return cls.mapping.get(event.get(u'name'))
+
 
 class EventTransformer(dict):
     """
@@ -180,10 +216,28 @@ class EventTransformer(dict):
         self.process_event()
             This method modifies the event payload unconditionally.  It will
             always be run.
+
+    The event payload is available as `self.event`.  It's only decoded when
+    first accessed, and only written back to the event if it was.
     """
     def __init__(self, *args, **kwargs):
         super(EventTransformer, self).__init__(*args, **kwargs)
-        self.load_payload()
+        self._event = None
+        self._payload_loaded = False
+
+    @property
+    def event(self):
+        """
+        Returns the event payload, decoded.
+        """
+        if not self._payload_loaded:
+            self.load_payload()
+        return self._event
+
+    @event.setter
+    def event(self, value):
+        self._event = value
+        self._payload_loaded = True
 
     # Properties to be overridden
 
@@ -227,10 +281,12 @@ class EventTransformer(dict):
 
     def dump_payload(self):
         """
-        Write self.event back to self[u'event'].
+        Write self.event back to self[u'event'], if it was loaded.
 
         Keep the same format we were originally given.
         """
+        if not self._payload_loaded:
+            return
         if isinstance(self.get(u'event'), basestring):
             self[u'event'] = json.dumps(self.event)
         else:
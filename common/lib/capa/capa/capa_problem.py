@@ -881,6 +881,9 @@ class LoncapaProblem(object):
                     cache=self.capa_system.cache,
                     slug=self.problem_id,
                     unsafely=self.capa_system.can_execute_unsafe_code(),
+                    # Share cached results between learners, unless the
+                    # problem's code uses their anonymous id.
+                    unkeyed_globals=['anonymous_student_id'],
                 )
             except Exception as err:
                 log.exception("Error while execing script code: " + all_code)
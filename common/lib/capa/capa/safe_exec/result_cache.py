@@ -0,0 +1,122 @@
+"""
+Caches for the results of safe_exec.
+
+Running code in the sandbox takes hundreds of milliseconds, so its results
+are cached by safe_exec, keyed by the code, its globals and its random seed.
+Besides the shared cache (usually the django cache), results can be kept
+in a SQLite database on the local disk of each server, which is much larger
+than the shared cache allows and survives its evictions and restarts.
+
+`TieredResultCache` combines the two, and counts cache hits and misses
+per problem slug.
+"""
+import logging
+import sqlite3
+from collections import Counter, defaultdict
+
+from six.moves import cPickle as pickle
+
+from openedx.core.lib.sqlite_lru import SQLiteLRUIndex
+
+log = logging.getLogger(__name__)
+
+# Where a result was found by TieredResultCache.
+LOCAL_HIT = 'local_hit'
+SHARED_HIT = 'shared_hit'
+MISS = 'miss'
+
+
+class LocalResultCache(object):
+    """
+    A cache of safe_exec results in a SQLite database on the local disk.
+
+    When the total size of the stored results grows beyond `max_size`
+    bytes, the least recently used results are evicted.
+
+    The database may be shared by all the processes on a server.  Database
+    errors are logged and treated as cache misses, so that a broken local
+    cache never breaks the execution of a problem.
+    """
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+        self._index = SQLiteLRUIndex(path, 'results', max_size, extra_columns=[('value', 'BLOB')])
+
+    def get(self, key):
+        """
+        Returns the cached value for the key, or None.
+        """
+        try:
+            row = self._index.get(key, columns=['value'])
+        except sqlite3.Error:
+            log.exception(u'Unable to read from the safe_exec result cache at %s', self.path)
+            return None
+        if row is None:
+            return None
+        return pickle.loads(bytes(row[0]))
+
+    def set(self, key, value):
+        """
+        Stores the value for the key, evicting old results if needed.
+        """
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        try:
+            self._index.put(key, len(key) + len(data), value=sqlite3.Binary(data))
+        except sqlite3.Error:
+            log.exception(u'Unable to write to the safe_exec result cache at %s', self.path)
+
+    def size(self):
+        """
+        Returns the total size of the stored results, in bytes.
+        """
+        return self._index.total_size()
+
+
+class TieredResultCache(object):
+    """
+    A cache of safe_exec results that checks a local cache before a shared
+    one.  Results found in the shared cache are copied to the local cache,
+    and new results are stored in both.
+
+    safe_exec calls record_lookup after each lookup, which counts where the
+    result was found for the problem slug in `stats`, and passes the slug
+    and the result (LOCAL_HIT, SHARED_HIT or MISS) to `on_lookup`, if given.
+    """
+    def __init__(self, local_cache, shared_cache, on_lookup=None):
+        self.local_cache = local_cache
+        self.shared_cache = shared_cache
+        self.on_lookup = on_lookup
+        self.stats = defaultdict(Counter)
+        self._last_lookup = MISS
+
+    def get(self, key):
+        """
+        Returns the cached value for the key, or None.
+        """
+        value = self.local_cache.get(key)
+        if value is not None:
+            self._last_lookup = LOCAL_HIT
+            return value
+
+        value = self.shared_cache.get(key)
+        if value is not None:
+            self._last_lookup = SHARED_HIT
+            self.local_cache.set(key, value)
+        else:
+            self._last_lookup = MISS
+        return value
+
+    def set(self, key, value):
+        """
+        Stores the value for the key in both caches.
+        """
+        self.local_cache.set(key, value)
+        self.shared_cache.set(key, value)
+
+    def record_lookup(self, slug):
+        """
+        Records the result of the last lookup for the given problem slug.
+        """
+        self.stats[slug][self._last_lookup] += 1
+        if self.on_lookup is not None:
+            self.on_lookup(slug, self._last_lookup)
@@ -3,7 +3,7 @@
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
-from . import lazymod
+from . import lazymod, sandbox_pool
 from six import text_type
 
 import hashlib
@@ -49,6 +49,9 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# Modules that sandbox pool workers import before forking for each execution.
+PRELOADED_MODULES = [modname for _, modname in ASSUMED_IMPORTS]
+
 
 def update_hash(hasher, obj):
     """
@@ -82,6 +85,7 @@ def safe_exec(
     cache=None,
     slug=None,
     unsafely=False,
+    unkeyed_globals=(),
 ):
     """
     Execute python code safely.
@@ -101,7 +105,13 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  If `cache` also has a .record_lookup(slug) method, it is
+    called after each lookup, so the cache can collect per-problem metrics.
+
+    `unkeyed_globals` is a list of names of globals that don't affect the result
+    of code that doesn't refer to them.  When `code` doesn't contain the name,
+    the global is left out of the cache key and of the cached globals, so the
+    result can be shared between callers with different values for it.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -111,12 +121,15 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
+        ignored_globals = [name for name in unkeyed_globals if name not in code]
+        safe_globals = _without_keys(json_safe(globals_dict), ignored_globals)
         md5er = hashlib.md5()
         md5er.update(repr(code))
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
         cached = cache.get(key)
+        if hasattr(cache, 'record_lookup'):
+            cache.record_lookup(slug)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -134,6 +147,9 @@ def safe_exec(
         exec_fn = codejail_not_safe_exec
     else:
         exec_fn = codejail_safe_exec
+        pool = sandbox_pool.get_pool(PRELOADED_MODULES)
+        if pool is not None and pool.can_execute(python_path, extra_files):
+            exec_fn = pool.safe_exec
 
     # Run the code!  Results are side effects in globals_dict.
     try:
@@ -149,9 +165,16 @@ def safe_exec(
     # Put the result back in the cache.  This is complicated by the fact that
     # the globals dict might not be entirely serializable.
     if cache:
-        cleaned_results = json_safe(globals_dict)
+        cleaned_results = _without_keys(json_safe(globals_dict), ignored_globals)
         cache.set(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
     if emsg:
         raise e
+
+
+def _without_keys(dictionary, keys):
+    """
+    Returns a copy of the dictionary without the given keys.
+    """
+    return {key: value for key, value in dictionary.iteritems() if key not in keys}
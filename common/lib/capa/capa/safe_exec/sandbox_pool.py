@@ -0,0 +1,207 @@
+"""
+A pool of pre-forked sandbox workers for safe_exec.
+
+codejail starts a new sandboxed Python process for each execution, which then
+has to import numpy, scipy and the other assumed modules again.  The workers
+of a SandboxPool are long-lived sandboxed processes (started with codejail's
+configured Python executable and user) that import these modules once, and
+fork a child for each execution.  The child applies codejail's resource
+limits before running the code, so executions stay isolated.
+
+Each worker runs in its own process group, which is killed as a whole when
+the worker is stopped, so that no sandboxed process outlives it.  When codejail
+runs Python as another user, the group is killed with `sudo -u <user> pkill`,
+which the sudoers configuration must allow, as it does for codejail.  What
+workers write to stderr is kept in a temporary file and logged when they stop.
+
+The pool is disabled unless configure() is called with a positive size.
+"""
+import base64
+import logging
+import os
+import select
+import signal
+import subprocess
+import tempfile
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+from six.moves import queue
+
+from . import sandbox_worker
+from .sandbox_worker import read_message, write_message
+
+log = logging.getLogger(__name__)
+
+# The source of the workers' main loop, which is run with -c.
+sandbox_worker_py_file = sandbox_worker.__file__
+if sandbox_worker_py_file.endswith("c"):
+    sandbox_worker_py_file = sandbox_worker_py_file[:-1]
+
+with open(sandbox_worker_py_file) as worker_file:
+    SANDBOX_WORKER_PY = worker_file.read()
+
+# How long to wait for a worker beyond the REALTIME limit of an execution,
+# before considering it broken.
+WORKER_TIMEOUT_MARGIN = 5
+
+# How much of the end of a stopped worker's stderr to log, in bytes.
+WORKER_STDERR_LOG_SIZE = 4096
+
+_POOL_SIZE = 0
+_POOL = None
+
+
+def configure(size):
+    """
+    Sets the number of sandbox workers of each process.  0 disables the pool.
+    """
+    global _POOL_SIZE  # pylint: disable=global-statement
+    _POOL_SIZE = size
+
+
+def get_pool(preload_modules):
+    """
+    Returns the SandboxPool of the current process, or None if the pool is
+    disabled or codejail isn't configured for Python.  A new pool is created
+    after a fork, since workers can't be shared between processes.
+    """
+    global _POOL  # pylint: disable=global-statement
+    if not _POOL_SIZE or not jail_code.is_configured('python'):
+        return None
+    if _POOL is None or _POOL.pid != os.getpid():
+        _POOL = SandboxPool(_POOL_SIZE, preload_modules)
+    return _POOL
+
+
+class SandboxPool(object):
+    """
+    A fixed number of sandbox workers, which are started on first use and
+    restarted when they fail.  Executions wait for an idle worker.
+    """
+    def __init__(self, size, preload_modules=()):
+        self.pid = os.getpid()
+        self.preload_modules = list(preload_modules)
+        # Reuse the most recently used workers first.
+        self._workers = queue.LifoQueue()
+        for _ in range(size):
+            self._workers.put(None)
+
+    @staticmethod
+    def can_execute(python_path, extra_files):
+        """
+        Returns whether an execution with these arguments can run in the pool.
+        Workers only get the contents of `extra_files`, so each entry of
+        `python_path` must name one of them rather than a file on disk.
+        """
+        extra_file_names = {name for name, _ in extra_files or ()}
+        return all(path in extra_file_names for path in python_path or ())
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Executes the code in a sandbox worker, with the same arguments and
+        results as codejail's safe_exec.
+        """
+        request = {
+            'code': code,
+            'globals': json_safe(globals_dict),
+            'python_path': python_path or [],
+            'extra_files': [(name, base64.b64encode(content)) for name, content in extra_files or ()],
+            'limits': {
+                'CPU': jail_code.LIMITS.get('CPU', 1),
+                'REALTIME': jail_code.LIMITS.get('REALTIME', 3),
+                'VMEM': jail_code.LIMITS.get('VMEM', 0),
+                'FSIZE': jail_code.LIMITS.get('FSIZE', 0),
+            },
+        }
+
+        worker = self._workers.get()
+        try:
+            if worker is None or worker.poll() is not None:
+                self._stop_worker(worker)
+                worker = self._start_worker()
+            reply = self._call(worker, request)
+        except (IOError, OSError, ValueError) as error:
+            log.exception(u'Sandbox worker failed executing %s', slug)
+            self._stop_worker(worker)
+            worker = None
+            raise SafeExecException(u"Couldn't execute jailed code: {}".format(error))
+        finally:
+            self._workers.put(worker)
+
+        if 'error' in reply:
+            raise SafeExecException(
+                u"Couldn't execute jailed code: stdout: {!r}, stderr: {!r} with status code: {}".format(
+                    '', reply['error'], reply['status'],
+                )
+            )
+        globals_dict.update(reply['globals'])
+
+    def _start_worker(self):
+        """
+        Starts a sandbox worker with codejail's Python command, in a new
+        process group, with its stderr written to a temporary file.
+        """
+        command = jail_code.COMMANDS['python']
+        cmd = []
+        if command['user']:
+            cmd.extend(['sudo', '-u', command['user']])
+        cmd.extend(command['cmdline_start'])
+        cmd.extend(['-c', SANDBOX_WORKER_PY])
+        cmd.extend(self.preload_modules)
+        stderr_file = tempfile.TemporaryFile(prefix='sandbox-worker-')
+        try:
+            worker = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr_file,
+                env={}, close_fds=True, preexec_fn=os.setsid,
+            )
+        except OSError:
+            stderr_file.close()
+            raise
+        worker.stderr_file = stderr_file
+        return worker
+
+    @staticmethod
+    def _call(worker, request):
+        """
+        Sends the request to the worker and returns its reply.
+        """
+        write_message(worker.stdin, request)
+        realtime = request['limits']['REALTIME']
+        timeout = realtime + WORKER_TIMEOUT_MARGIN if realtime else None
+        if not select.select([worker.stdout], [], [], timeout)[0]:
+            raise IOError(u'No reply from sandbox worker after {} seconds'.format(timeout))
+        reply = read_message(worker.stdout)
+        if reply is None:
+            raise IOError(u'Sandbox worker exited with status {}'.format(worker.wait()))
+        return reply
+
+    @staticmethod
+    def _stop_worker(worker):
+        """
+        Kills the process group of the worker, including the children it
+        forked, and logs what the worker wrote to stderr.
+        """
+        if worker is None:
+            return
+
+        user = jail_code.COMMANDS['python']['user']
+        # The worker's pid is its process group id, as it called setsid.
+        if user:
+            # The worker runs as the sandbox user, under a root-owned sudo,
+            # so it can't be killed directly.  The sudo exits with it.
+            subprocess.call(['sudo', '-u', user, 'pkill', '-9', '-g', str(worker.pid)], close_fds=True)
+        else:
+            try:
+                os.killpg(worker.pid, signal.SIGKILL)
+            except OSError:
+                # The group has already exited.
+                pass
+        worker.wait()
+
+        worker.stderr_file.seek(0, os.SEEK_END)
+        worker.stderr_file.seek(max(worker.stderr_file.tell() - WORKER_STDERR_LOG_SIZE, 0))
+        stderr = worker.stderr_file.read()
+        worker.stderr_file.close()
+        if stderr:
+            log.warning(u'Sandbox worker %s exited with status %s, stderr: %r', worker.pid, worker.returncode, stderr)
@@ -0,0 +1,188 @@
+"""
+The main loop of a pre-forked sandbox worker.
+
+This file isn't imported: its source is run by the sandboxed Python
+executable with -c, the way lazymod.py is sent into the sandbox.  The worker
+imports the modules named in its arguments once, then reads execution
+requests from stdin.  Each request is run in a forked child process, with
+the resource limits of the request, in its own temporary directory, so that
+executions are isolated from each other and from the worker.  Replies are
+written to stdout.
+
+Requests and replies are JSON messages, prefixed by their length.
+"""
+import base64
+import json
+import os
+import resource
+import select
+import shutil
+import signal
+import struct
+import sys
+import tempfile
+import time
+import traceback
+
+HEADER = struct.Struct('!I')
+
+# Types of globals that are sent back, as done by codejail.
+OK_TYPES = (type(None), int, float, str, list, tuple, dict)
+try:
+    OK_TYPES += (long, unicode)  # pylint: disable=undefined-variable
+except NameError:
+    pass
+BAD_KEYS = ('__builtins__',)
+
+
+def read_message(stream):
+    """
+    Returns the next message from the stream, or None at the end of it.
+    """
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    length, = HEADER.unpack(header)
+    return json.loads(stream.read(length).decode('utf-8'))
+
+
+def write_message(stream, message):
+    """
+    Writes the message to the stream.
+    """
+    data = json.dumps(message).encode('utf-8')
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def set_limits(limits):
+    """
+    Sets the resource limits of the current process, as codejail does for
+    each sandboxed process.
+    """
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    if limits['CPU']:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits['CPU'], limits['CPU']))
+    if limits['VMEM']:
+        resource.setrlimit(resource.RLIMIT_AS, (limits['VMEM'], limits['VMEM']))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (limits['FSIZE'], limits['FSIZE']))
+
+
+def jsonable(value):
+    """
+    Returns whether the value can be sent back as JSON.
+    """
+    if not isinstance(value, OK_TYPES):
+        return False
+    try:
+        json.dumps(value)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def run_child(request, workdir, result_fd):
+    """
+    Runs the request's code in the current (forked) process, and writes the
+    resulting globals to result_fd.  Never returns.
+    """
+    status = 1
+    try:
+        os.chdir(workdir)
+        for filename, content in request['extra_files']:
+            with open(filename, 'wb') as extra_file:
+                extra_file.write(base64.b64decode(content))
+        set_limits(request['limits'])
+        sys.path.extend(request['python_path'])
+
+        # Keep the code away from the worker's requests, replies and stderr.
+        devnull = os.open(os.devnull, os.O_RDWR)
+        os.dup2(devnull, 0)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+
+        globals_dict = request['globals']
+        exec(request['code'], globals_dict)  # pylint: disable=exec-used
+        result = {
+            'globals': {
+                key: value for key, value in globals_dict.items()
+                if key not in BAD_KEYS and jsonable(value)
+            },
+        }
+        status = 0
+    except BaseException:  # pylint: disable=broad-except
+        result = {'error': traceback.format_exc()}
+
+    try:
+        data = json.dumps(result).encode('utf-8')
+        while data:
+            data = data[os.write(result_fd, data):]
+    finally:
+        os._exit(status)  # pylint: disable=protected-access
+
+
+def execute(request):
+    """
+    Runs the request in a forked child process, and returns the reply.
+    """
+    workdir = tempfile.mkdtemp(prefix='codejail-')
+    read_fd, write_fd = os.pipe()
+    try:
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            run_child(request, workdir, write_fd)
+        os.close(write_fd)
+
+        chunks = []
+        timed_out = False
+        realtime = request['limits']['REALTIME']
+        deadline = time.time() + realtime
+        while True:
+            remaining = max(deadline - time.time(), 0) if realtime else None
+            if not select.select([read_fd], [], [], remaining)[0]:
+                timed_out = True
+                os.kill(pid, signal.SIGKILL)
+                break
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        os.close(read_fd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if timed_out:
+        return {'error': 'Timed out after {} seconds'.format(realtime), 'status': status}
+    try:
+        reply = json.loads(b''.join(chunks).decode('utf-8'))
+    except ValueError:
+        # The child was killed before writing its result, e.g. by a limit.
+        reply = {'error': ''}
+    reply['status'] = status
+    return reply
+
+
+def main():
+    """
+    Imports the modules named in the arguments, then serves requests from
+    stdin until it's closed.
+    """
+    for module_name in sys.argv[1:]:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+
+    stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+    stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+    while True:
+        request = read_message(stdin)
+        if request is None:
+            break
+        write_message(stdout, execute(request))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Test result_cache.py"""
+
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+
+from capa.safe_exec import LocalResultCache, TieredResultCache, safe_exec
+from capa.safe_exec.result_cache import LOCAL_HIT, MISS, SHARED_HIT
+from capa.safe_exec.tests.test_safe_exec import DictCache
+
+
+class TestLocalResultCache(unittest.TestCase):
+    """Test the SQLite cache of safe_exec results."""
+
+    def setUp(self):
+        super(TestLocalResultCache, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.path = os.path.join(self.temp_dir, 'results.sqlite')
+
+    def test_get_and_set(self):
+        cache = LocalResultCache(self.path, max_size=1024 * 1024)
+        self.assertIsNone(cache.get('key'))
+        cache.set('key', (None, {'a': 17}))
+        self.assertEqual(cache.get('key'), (None, {'a': 17}))
+
+        # The results are stored on disk, for other processes to read.
+        self.assertEqual(LocalResultCache(self.path, max_size=1024 * 1024).get('key'), (None, {'a': 17}))
+
+    def test_evicts_least_recently_used(self):
+        value = (None, {'a': 'x' * 1000})
+        cache = LocalResultCache(self.path, max_size=3500)
+        for key in ('first', 'second', 'third'):
+            cache.set(key, value)
+        cache.get('first')
+
+        cache.set('fourth', value)
+        self.assertLessEqual(cache.size(), 3500)
+        self.assertIsNone(cache.get('second'))
+        for key in ('first', 'third', 'fourth'):
+            self.assertEqual(cache.get(key), value)
+
+    def test_database_errors_are_misses(self):
+        cache = LocalResultCache(os.path.join(self.temp_dir, 'missing', 'results.sqlite'), max_size=1024)
+        cache.set('key', (None, {}))
+        self.assertIsNone(cache.get('key'))
+
+
+class TestTieredResultCache(unittest.TestCase):
+    """Test the combination of local and shared caches of safe_exec results."""
+
+    def setUp(self):
+        super(TestTieredResultCache, self).setUp()
+        self.local = {}
+        self.shared = {}
+        self.on_lookup = Mock()
+        self.cache = TieredResultCache(DictCache(self.local), DictCache(self.shared), on_lookup=self.on_lookup)
+
+    def test_set_stores_in_both_caches(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.local, {'key': 'value'})
+        self.assertEqual(self.shared, {'key': 'value'})
+
+    def test_shared_hits_are_stored_locally(self):
+        self.shared['key'] = 'value'
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.local, {'key': 'value'})
+
+    def test_safe_exec_lookups(self):
+        safe_exec("a = int(math.pi)", {}, cache=self.cache, slug='problem')
+        safe_exec("a = int(math.pi)", {}, cache=self.cache, slug='problem')
+        self.local.clear()
+        safe_exec("a = int(math.pi)", {}, cache=self.cache, slug='problem')
+        safe_exec("a = 1", {}, cache=self.cache, slug='other_problem')
+
+        self.assertEqual(dict(self.cache.stats['problem']), {MISS: 1, LOCAL_HIT: 1, SHARED_HIT: 1})
+        self.assertEqual(dict(self.cache.stats['other_problem']), {MISS: 1})
+        self.on_lookup.assert_called_with('other_problem', MISS)
+        self.assertEqual(self.on_lookup.call_count, 4)
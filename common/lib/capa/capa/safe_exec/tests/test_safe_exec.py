@@ -167,6 +167,27 @@ class TestSafeExecCaching(unittest.TestCase):
         safe_exec(code, g, cache=DictCache(cache))
         self.assertEqual(g['a'], 17)
 
+    def test_unkeyed_globals(self):
+        # Globals the code doesn't use don't change the cache key, and
+        # aren't overwritten by the cached results.
+        cache = {}
+        g = {'anonymous_student_id': 'student_1'}
+        safe_exec("a = 17", g, cache=DictCache(cache), unkeyed_globals=['anonymous_student_id'])
+        self.assertEqual(cache.values()[0], (None, {'a': 17}))
+
+        g = {'anonymous_student_id': 'student_2'}
+        safe_exec("a = 17", g, cache=DictCache(cache), unkeyed_globals=['anonymous_student_id'])
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(g, {'anonymous_student_id': 'student_2', 'a': 17})
+
+        # Code that uses them is cached for each of their values.
+        code = "a = anonymous_student_id"
+        for student_id in ('student_1', 'student_2'):
+            g = {'anonymous_student_id': student_id}
+            safe_exec(code, g, cache=DictCache(cache), unkeyed_globals=['anonymous_student_id'])
+            self.assertEqual(g['a'], student_id)
+        self.assertEqual(len(cache), 3)
+
     def test_unicode_submission(self):
         # Check that using non-ASCII unicode does not raise an encoding error.
         # Try several non-ASCII unicode characters.
@@ -0,0 +1,161 @@
+"""Test sandbox_pool.py"""
+
+import errno
+import glob
+import os.path
+import tempfile
+import timeit
+import unittest
+import zipfile
+from StringIO import StringIO
+
+import pytest
+from codejail.jail_code import is_configured
+from codejail.safe_exec import SafeExecException
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+from lxml import etree
+from mock import Mock, patch
+from six import text_type
+
+from capa.safe_exec import sandbox_pool
+from capa.safe_exec.safe_exec import CODE_PROLOG, LAZY_IMPORTS, PRELOADED_MODULES
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), '../../../../../test/data')
+
+
+class TestSandboxPoolConfiguration(unittest.TestCase):
+    """Test when the sandbox pool is used."""
+
+    def test_can_execute(self):
+        pool = sandbox_pool.SandboxPool(1)
+        self.assertTrue(pool.can_execute(None, None))
+        self.assertTrue(pool.can_execute(['python_lib.zip'], [('python_lib.zip', 'contents')]))
+        self.assertFalse(pool.can_execute(['/edx/var/course/python'], [('python_lib.zip', 'contents')]))
+
+    def test_disabled(self):
+        with patch.object(sandbox_pool, '_POOL_SIZE', 0):
+            self.assertIsNone(sandbox_pool.get_pool(PRELOADED_MODULES))
+
+    def test_new_pool_after_fork(self):
+        with patch.object(sandbox_pool, '_POOL_SIZE', 2), patch.object(sandbox_pool, '_POOL', None):
+            with patch.object(sandbox_pool.jail_code, 'is_configured', return_value=True):
+                pool = sandbox_pool.get_pool(PRELOADED_MODULES)
+                self.assertIs(sandbox_pool.get_pool(PRELOADED_MODULES), pool)
+                with patch('os.getpid', return_value=pool.pid + 1):
+                    self.assertIsNot(sandbox_pool.get_pool(PRELOADED_MODULES), pool)
+
+    def test_stop_worker_as_sandbox_user(self):
+        worker = Mock(pid=1234, returncode=-9, stderr_file=tempfile.TemporaryFile())
+        worker.stderr_file.write(b'Segmentation fault')
+        python_command = {'user': 'sandbox', 'cmdline_start': ['python']}
+        with patch.dict(sandbox_pool.jail_code.COMMANDS, {'python': python_command}):
+            with patch('subprocess.call') as mock_call, patch('os.killpg') as mock_killpg:
+                with patch.object(sandbox_pool.log, 'warning') as mock_warning:
+                    sandbox_pool.SandboxPool._stop_worker(worker)  # pylint: disable=protected-access
+
+        # The sudo wrapper can't be killed, so the whole group is killed as the sandbox user.
+        mock_call.assert_called_once_with(['sudo', '-u', 'sandbox', 'pkill', '-9', '-g', '1234'], close_fds=True)
+        mock_killpg.assert_not_called()
+        worker.wait.assert_called_once_with()
+        self.assertIn(b'Segmentation fault', mock_warning.call_args[0][-1])
+
+
+class TestSandboxPool(unittest.TestCase):
+    """Test executing code in sandbox workers."""
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        # Can't start sandbox workers if CodeJail isn't configured for python.
+        if not is_configured("python"):
+            pytest.skip()
+        self.pool = sandbox_pool.SandboxPool(1, PRELOADED_MODULES)
+
+    def test_set_values(self):
+        g = {'b': 2}
+        self.pool.safe_exec("a = b + 15", g)
+        self.assertEqual(g, {'a': 17, 'b': 2})
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", text_type(cm.exception))
+
+        # The worker is still usable.
+        g = {}
+        self.pool.safe_exec("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_executions_are_isolated(self):
+        g = {}
+        self.pool.safe_exec("import math; math.pi = 3", g)
+        self.pool.safe_exec("import math; a = math.pi", g)
+        self.assertGreater(g['a'], 3)
+
+    def test_cpu_limit(self):
+        with self.assertRaises(SafeExecException):
+            self.pool.safe_exec("while True: pass", {})
+
+    def test_cant_do_something_forbidden(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("import os; files = os.listdir('/')", {})
+        self.assertIn("Permission denied", text_type(cm.exception))
+
+    def test_python_lib_zip(self):
+        zip_file = StringIO()
+        with zipfile.ZipFile(zip_file, 'w') as zip_lib:
+            zip_lib.writestr('constant.py', 'THE_CONST = 23\n')
+
+        g = {}
+        self.pool.safe_exec(
+            "import constant; a = constant.THE_CONST", g,
+            python_path=['python_lib.zip'], extra_files=[('python_lib.zip', zip_file.getvalue())],
+        )
+        self.assertEqual(g['a'], 23)
+
+    def test_stop_worker_kills_its_process_group(self):
+        self.pool.safe_exec("a = 1", {})
+        worker = self.pool._workers.get()  # pylint: disable=protected-access
+        self.pool._stop_worker(worker)  # pylint: disable=protected-access
+
+        with self.assertRaises(OSError) as cm:
+            os.killpg(worker.pid, 0)
+        self.assertEqual(cm.exception.errno, errno.ESRCH)
+
+
+@unittest.skip
+class SandboxPoolBenchmark(unittest.TestCase):
+    """
+    Compares running the scripts of the test courses' problems in a new
+    sandboxed process against running them in a warm sandbox worker.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_RUNS = 5
+
+    def test_cold_vs_warm(self):
+        scripts = []
+        for problem_file in glob.glob(os.path.join(TEST_DATA_DIR, '*/problem/*.xml')):
+            for script in etree.parse(problem_file).iter('script'):
+                if script.get('type') == 'loncapa/python' and script.text:
+                    scripts.append(CODE_PROLOG % 1 + LAZY_IMPORTS + script.text)
+
+        pool = sandbox_pool.SandboxPool(1, PRELOADED_MODULES)
+
+        def _run_all(exec_fn):
+            for script in scripts:
+                try:
+                    exec_fn(script, {'seed': 1, 'anonymous_student_id': 'student'})
+                except SafeExecException:
+                    pass
+
+        # Start the worker before timing it.
+        pool.safe_exec("a = 1", {})
+
+        print(u'{} problem scripts:'.format(len(scripts)))
+        print(u'  cold: {:.4f}s per script'.format(
+            timeit.timeit(lambda: _run_all(codejail_safe_exec), number=self.NUM_RUNS) / self.NUM_RUNS / len(scripts)
+        ))
+        print(u'  warm: {:.4f}s per script'.format(
+            timeit.timeit(lambda: _run_all(pool.safe_exec), number=self.NUM_RUNS) / self.NUM_RUNS / len(scripts)
+        ))
@@ -359,10 +359,12 @@ class ContentStore(object):
     def find(self, filename):
         raise NotImplementedError
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None, after=None):
         '''
         Returns a list of static assets for a course, followed by the total number of assets.
         By default all assets are returned, but start and maxresults can be provided to limit the query.
+        When `after` is the cursor of an asset in the given sort order, as returned by `get_asset_cursor`,
+        the assets following that asset are returned instead of those from index `start`.
 
         The return format is a list of asset data dictionaries.
         The asset data dictionaries have the following keys:
@@ -374,6 +376,13 @@ class ContentStore(object):
         '''
         raise NotImplementedError
 
+    def get_asset_cursor(self, asset, sort):
+        '''
+        Returns an opaque cursor of the given asset data dictionary in the given sort order, which
+        can be passed as `after` to `get_all_content_for_course` to get the assets following it.
+        '''
+        raise NotImplementedError
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all of the assets which use this course_key as an identifier
@@ -3,20 +3,24 @@ MongoDB/GridFS-level code for the contentstore.
 """
 from __future__ import absolute_import
 
+import base64
 import json
 import os
+import time
 
 import gridfs
 import pymongo
 import six
+from bson import json_util
 from bson.son import SON
 from fs.osfs import OSFS
 from gridfs.errors import NoFile
 from mongodb_proxy import autoretry_read
+from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import AssetKey
 
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
-from xmodule.exceptions import NotFoundError
+from xmodule.exceptions import InvalidAssetCursorError, NotFoundError
 from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from xmodule.util.misc import escape_invalid_characters
@@ -28,6 +32,12 @@ class MongoContentStore(ContentStore):
     """
     MongoDB-backed ContentStore.
     """
+    # How long asset counts are cached, in seconds.
+    COUNT_CACHE_TTL = 30
+
+    # The number of queries whose counts are cached for each course.
+    MAX_CACHED_QUERIES = 1000
+
     # pylint: disable=unused-argument, bad-continuation
     def __init__(
         self, host, db,
@@ -52,6 +62,9 @@ class MongoContentStore(ContentStore):
         self.fs_files = mongo_db[bucket + ".files"]  # the underlying collection GridFS uses
         self.chunks = mongo_db[bucket + ".chunks"]
 
+        # Asset counts, by (org, course).
+        self._count_cache = {}
+
     def close_connections(self):
         """
         Closes any open connections to the underlying databases
@@ -105,6 +118,7 @@ class MongoContentStore(ContentStore):
             else:
                 fp.write(content.data)
 
+        self._invalidate_asset_caches(content.location)
         return content
 
     def delete(self, location_or_id):
@@ -113,6 +127,7 @@ class MongoContentStore(ContentStore):
         """
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
+        self._invalidate_asset_caches(location_or_id)
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
 
@@ -209,11 +224,29 @@ class MongoContentStore(ContentStore):
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
-    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None):
+    def get_all_content_for_course(self, course_key, start=0, maxresults=-1, sort=None, filter_params=None, after=None):
         return self._get_all_content_for_course(
-            course_key, start=start, maxresults=maxresults, get_thumbnails=False, sort=sort, filter_params=filter_params
+            course_key,
+            start=start,
+            maxresults=maxresults,
+            get_thumbnails=False,
+            sort=sort,
+            filter_params=filter_params,
+            after=after,
         )
 
+    def get_asset_cursor(self, asset, sort):
+        """
+        Returns an opaque cursor of the given asset in the given sort order: the asset's value of the
+        sort field and its _id, which break ties in the sort order.
+        """
+        sort_field = sort[0][0]
+        if sort_field == 'displayname':
+            sort_value = asset['insensitive_displayname']
+        else:
+            sort_value = asset.get(sort_field)
+        return base64.urlsafe_b64encode(json_util.dumps([sort_field, sort_value, asset['_id']]))
+
     def remove_redundant_content_for_courses(self):
         """
         Finds and removes all redundant files (Mac OS metadata files with filename ".DS_Store"
@@ -232,6 +265,7 @@ class MongoContentStore(ContentStore):
                 self.fs.delete(asset[prefix])
 
             self.fs_files.remove(query)
+        self._invalidate_asset_caches()
         return assets_to_delete
 
     @autoretry_read()
@@ -241,7 +275,8 @@ class MongoContentStore(ContentStore):
                                     start=0,
                                     maxresults=-1,
                                     sort=None,
-                                    filter_params=None):
+                                    filter_params=None,
+                                    after=None):
         '''
         Returns a list of all static assets for a course. The return format is a list of asset data dictionary elements.
 
@@ -252,65 +287,24 @@ class MongoContentStore(ContentStore):
             contentType: The mimetype string of the asset
             md5: An md5 hash of the asset content
         '''
-        # TODO: Using an aggregate() instead of a find() here is a hack to get around the fact that Mongo 3.2 does not
-        # support sorting case-insensitively.
-        # If a sort on displayname is requested, the aggregation pipeline creates a new field:
-        # `insensitive_displayname`, a lowercase version of `displayname` that is sorted on instead.
-        # Mongo 3.4 does not require this hack. When upgraded, change this aggregation back to a find and specifiy
-        # a collation based on user's language locale instead.
-        # See: https://openedx.atlassian.net/browse/EDUCATOR-2221
-        pipeline_stages = []
         query = query_for_course(course_key, 'asset' if not get_thumbnails else 'thumbnail')
         if filter_params:
             query.update(filter_params)
-        pipeline_stages.append({'$match': query})
-
-        if sort:
-            sort = dict(sort)
-            if 'displayname' in sort:
-                pipeline_stages.append({
-                    '$project': {
-                        'contentType': 1,
-                        'locked': 1,
-                        'chunkSize': 1,
-                        'content_son': 1,
-                        'displayname': 1,
-                        'filename': 1,
-                        'length': 1,
-                        'import_path': 1,
-                        'uploadDate': 1,
-                        'thumbnail_location': 1,
-                        'md5': 1,
-                        'insensitive_displayname': {
-                            '$toLower': '$displayname'
-                        }
-                    }
-                })
-                sort = {'insensitive_displayname': sort['displayname']}
-            pipeline_stages.append({'$sort': sort})
 
-        # This is another hack to get the total query result count, but only the Nth page of actual documents
-        # See: https://stackoverflow.com/a/39784851/6620612
-        pipeline_stages.append({'$group': {'_id': None, 'count': {'$sum': 1}, 'results': {'$push': '$$ROOT'}}})
-        if maxresults > 0:
-            pipeline_stages.append({
-                '$project': {
-                    'count': 1,
-                    'results': {
-                        '$slice': ['$results', start, maxresults]
-                    }
-                }
-            })
+        sort = list(sort) if sort else []
+        after = self._parse_asset_cursor(after, sort) if after else None
+        if sort and sort[0][0] == 'displayname':
+            assets = self._get_assets_sorted_by_displayname(query, sort[0][1], start, maxresults, after)
+        else:
+            assets = self._get_assets_page(query, sort, start, maxresults, after)
 
-        items = self.fs_files.aggregate(pipeline_stages)
-        if items['result']:
-            result = items['result'][0]
-            count = result['count']
-            assets = list(result['results'])
+        if maxresults > 0:
+            count = self._count_assets(course_key, query)
+        elif start:
+            count = self.fs_files.find(query).count()
         else:
-            # no results
-            count = 0
-            assets = []
+            # All the assets were returned.
+            count = len(assets)
 
         # We're constructing the asset key immediately after retrieval from the database so that
         # callers are insulated from knowing how our identifiers are stored.
@@ -319,6 +313,135 @@ class MongoContentStore(ContentStore):
             asset['asset_key'] = course_key.make_asset_key(asset_id['category'], asset_id['name'])
         return assets, count
 
+    def _count_assets(self, course_key, query):
+        """
+        Returns the number of assets matching the query, for paginated listings.  It's cached for
+        COUNT_CACHE_TTL seconds, or until the assets of the course are changed through this contentstore.
+        """
+        course_counts = self._count_cache.setdefault((course_key.org, course_key.course), {})
+        query_key = _query_cache_key(query)
+        cached = course_counts.get(query_key)
+        if cached is not None and cached[1] > time.time() - self.COUNT_CACHE_TTL:
+            return cached[0]
+
+        count = self.fs_files.find(query).count()
+        if len(course_counts) >= self.MAX_CACHED_QUERIES:
+            course_counts.clear()
+        course_counts[query_key] = (count, time.time())
+        return count
+
+    def _parse_asset_cursor(self, cursor, sort):
+        """
+        Returns the (sort value, _id) of the asset of the given cursor, which must be in the given sort order.
+        """
+        try:
+            sort_field, sort_value, asset_id = json_util.loads(base64.urlsafe_b64decode(str(cursor)))
+        except (TypeError, ValueError):
+            raise InvalidAssetCursorError(cursor)
+        if not sort or sort_field != sort[0][0]:
+            raise InvalidAssetCursorError(cursor)
+        if isinstance(asset_id, dict):
+            asset_id = self.make_id_son({'_id': asset_id})
+        return sort_value, asset_id
+
+    @staticmethod
+    def _after_asset_query(sort_field, direction, after):
+        """
+        Returns a query for the assets following the asset with the given (sort value, _id) in the
+        given sort order, which can use an index ending with the sort field and _id.
+        """
+        sort_value, asset_id = after
+        operator = '$gt' if direction == pymongo.ASCENDING else '$lt'
+        return {'$or': [
+            {sort_field: {operator: sort_value}},
+            {sort_field: sort_value, '_id': {operator: asset_id}},
+        ]}
+
+    def _get_assets_page(self, query, sort, start, maxresults, after=None):
+        """
+        Returns the assets matching the query, in the given order, from index `start`, or following
+        the asset with the given (sort value, _id) if `after` is set.
+        """
+        sort_field, direction = sort[0] if sort else (None, None)
+        if after:
+            # Keyset pagination: every page is found through the index, like the first one.
+            query = {'$and': [query, self._after_asset_query(sort_field, direction, after)]}
+        cursor = self.fs_files.find(query)
+        if sort_field:
+            # Break ties in the sort order, so that pages never overlap.
+            cursor = cursor.sort([(sort_field, direction), ('_id', direction)])
+        if start and not after:
+            cursor = cursor.skip(start)
+        if maxresults > 0:
+            cursor = cursor.limit(maxresults)
+        return list(cursor)
+
+    def _get_assets_sorted_by_displayname(self, query, direction, start, maxresults, after=None):
+        """
+        Returns the assets matching the query, sorted case-insensitively by display name, from index `start`,
+        or following the asset with the given (sort value, _id) if `after` is set.
+        """
+        # TODO: Using an aggregate() instead of a find() here is a hack to get around the fact that Mongo 3.2 does not
+        # support sorting case-insensitively.
+        # The aggregation pipeline creates a new field: `insensitive_displayname`, a lowercase version of
+        # `displayname` that is sorted on instead.
+        # Mongo 3.4 does not require this hack. When upgraded, change this aggregation back to a find and specifiy
+        # a collation based on user's language locale instead.
+        # See: https://openedx.atlassian.net/browse/EDUCATOR-2221
+        pipeline_stages = [
+            {'$match': query},
+            {
+                '$project': {
+                    'contentType': 1,
+                    'locked': 1,
+                    'chunkSize': 1,
+                    'content_son': 1,
+                    'displayname': 1,
+                    'filename': 1,
+                    'length': 1,
+                    'import_path': 1,
+                    'uploadDate': 1,
+                    'thumbnail_location': 1,
+                    'md5': 1,
+                    'insensitive_displayname': {
+                        '$toLower': '$displayname'
+                    }
+                }
+            },
+            {'$sort': SON([('insensitive_displayname', direction), ('_id', direction)])},
+        ]
+        if after:
+            pipeline_stages.append({'$match': self._after_asset_query('insensitive_displayname', direction, after)})
+        elif start:
+            pipeline_stages.append({'$skip': start})
+        if maxresults > 0:
+            pipeline_stages.append({'$limit': maxresults})
+        return list(self.fs_files.aggregate(pipeline_stages)['result'])
+
+    def _invalidate_asset_caches(self, key=None):
+        """
+        Forgets the cached asset counts of the course of the given course key,
+        asset key or asset _id, or of all courses if it's None or can't be parsed.
+        """
+        if isinstance(key, dict):
+            course = (key.get('org'), key.get('course'))
+        elif isinstance(key, six.string_types):
+            try:
+                asset_key = AssetKey.from_string(key)
+            except InvalidKeyError:
+                course = None
+            else:
+                course = (asset_key.org, asset_key.course)
+        elif key is not None:
+            course = (key.org, key.course)
+        else:
+            course = None
+
+        if course is None:
+            self._count_cache.clear()
+        else:
+            self._count_cache.pop(course, None)
+
     def set_attr(self, asset_key, attr, value=True):
         """
         Add/set the given attr on the asset at the given location. Does not allow overwriting gridFS built in
@@ -360,6 +483,7 @@ class MongoContentStore(ContentStore):
         asset_db_key, __ = self.asset_db_key(location)
         # catch upsert error and raise NotFoundError if asset doesn't exist
         result = self.fs_files.update({'_id': asset_db_key}, {"$set": attr_dict}, upsert=False)
+        self._invalidate_asset_caches(asset_db_key)
         if not result.get('updatedExisting', True):
             raise NotFoundError(asset_db_key)
 
@@ -418,6 +542,7 @@ class MongoContentStore(ContentStore):
                 # getattr b/c caching may mean some pickled instances don't have attr
                 locked=asset.get('locked', False)
             )
+        self._invalidate_asset_caches(dest_course_key)
 
     def delete_all_course_assets(self, course_key):
         """
@@ -430,6 +555,7 @@ class MongoContentStore(ContentStore):
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
             self.fs.delete(asset_key)
+        self._invalidate_asset_caches(course_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -492,12 +618,14 @@ class MongoContentStore(ContentStore):
         #      sparse=True,
         #      background=True
         #  )
+        # The indexes used to sort the asset pages end with `_id`, which breaks ties in the sort order.
         create_collection_index(
             self.fs_files,
             [
                 ('content_son.org', pymongo.ASCENDING),
                 ('content_son.course', pymongo.ASCENDING),
-                ('uploadDate', pymongo.DESCENDING)
+                ('uploadDate', pymongo.DESCENDING),
+                ('_id', pymongo.DESCENDING)
             ],
             sparse=True,
             background=True
@@ -527,7 +655,8 @@ class MongoContentStore(ContentStore):
             [
                 ('_id.org', pymongo.ASCENDING),
                 ('_id.course', pymongo.ASCENDING),
-                ('uploadDate', pymongo.ASCENDING)
+                ('uploadDate', pymongo.ASCENDING),
+                ('_id', pymongo.ASCENDING)
             ],
             sparse=True,
             background=True
@@ -537,7 +666,8 @@ class MongoContentStore(ContentStore):
             [
                 ('_id.org', pymongo.ASCENDING),
                 ('_id.course', pymongo.ASCENDING),
-                ('displayname', pymongo.ASCENDING)
+                ('displayname', pymongo.ASCENDING),
+                ('_id', pymongo.ASCENDING)
             ],
             sparse=True,
             background=True
@@ -547,7 +677,8 @@ class MongoContentStore(ContentStore):
             [
                 ('content_son.org', pymongo.ASCENDING),
                 ('content_son.course', pymongo.ASCENDING),
-                ('uploadDate', pymongo.ASCENDING)
+                ('uploadDate', pymongo.ASCENDING),
+                ('_id', pymongo.ASCENDING)
             ],
             sparse=True,
             background=True
@@ -557,11 +688,44 @@ class MongoContentStore(ContentStore):
             [
                 ('content_son.org', pymongo.ASCENDING),
                 ('content_son.course', pymongo.ASCENDING),
-                ('displayname', pymongo.ASCENDING)
+                ('displayname', pymongo.ASCENDING),
+                ('_id', pymongo.ASCENDING)
             ],
             sparse=True,
             background=True
         )
+        # Used by the asset pages filtered by type, which are sorted by `uploadDate` by default.
+        create_collection_index(
+            self.fs_files,
+            [
+                ('_id.org', pymongo.ASCENDING),
+                ('_id.course', pymongo.ASCENDING),
+                ('contentType', pymongo.ASCENDING),
+                ('uploadDate', pymongo.DESCENDING),
+                ('_id', pymongo.DESCENDING)
+            ],
+            sparse=True,
+            background=True
+        )
+        create_collection_index(
+            self.fs_files,
+            [
+                ('content_son.org', pymongo.ASCENDING),
+                ('content_son.course', pymongo.ASCENDING),
+                ('contentType', pymongo.ASCENDING),
+                ('uploadDate', pymongo.DESCENDING),
+                ('_id', pymongo.DESCENDING)
+            ],
+            sparse=True,
+            background=True
+        )
+
+
+def _query_cache_key(query):
+    """
+    Returns a hashable key identifying the asset query.
+    """
+    return json.dumps(query, sort_keys=True, default=six.text_type)
 
 
 def query_for_course(course_key, category=None):
@@ -51,3 +51,11 @@ class HeartbeatFailure(Exception):
         """
         self.service = service
         super(HeartbeatFailure, self).__init__(msg)
+
+
+class InvalidAssetCursorError(Exception):
+    """
+    Raised when the cursor of a page of assets can't be parsed, or doesn't
+    match the requested sort order.
+    """
+    pass
@@ -10,6 +10,7 @@ import logging
 from contextlib import contextmanager
 import itertools
 import functools
+from collections import defaultdict
 from contracts import contract, new_contract
 
 from opaque_keys import InvalidKeyError
@@ -399,6 +400,52 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except ItemNotFoundError:
             return None
 
+    @strip_key
+    def get_courses_bulk(self, course_keys, depth=0, **kwargs):
+        """
+        returns a dict of course_key to the course module for each of the given
+        course keys. Courses that don't exist are omitted.
+
+        Stores that support fetching courses in bulk are asked for all of the
+        course keys that aren't already mapped to another store; any courses
+        they don't find are fetched individually.
+
+        :param course_keys: an iterable of CourseKeys
+        """
+        courses = {}
+        keys_by_store = defaultdict(list)
+        unmapped_keys = []
+        for course_key in course_keys:
+            assert isinstance(course_key, CourseKey)
+            store = self.mappings.get(self._clean_locator_for_mapping(course_key))
+            if store is None:
+                unmapped_keys.append(course_key)
+            else:
+                keys_by_store[store].append(course_key)
+
+        bulk_stores = [store for store in self.modulestores if hasattr(store, 'get_courses_bulk')]
+        for store in bulk_stores:
+            store_keys = keys_by_store.pop(store, []) + unmapped_keys
+            if not store_keys:
+                continue
+            store_courses = store.get_courses_bulk(store_keys, depth=depth, **kwargs)
+            for course_key, course in store_courses.iteritems():
+                if course_key in unmapped_keys:
+                    self.mappings[self._clean_locator_for_mapping(course_key)] = store
+            courses.update(store_courses)
+            unmapped_keys = [course_key for course_key in unmapped_keys if course_key not in store_courses]
+
+        remaining_keys = unmapped_keys + [
+            course_key for store_keys in keys_by_store.itervalues() for course_key in store_keys
+        ]
+        for course_key in remaining_keys:
+            store = self._get_modulestore_for_courselike(course_key)
+            try:
+                courses[course_key] = store.get_course(course_key, depth=depth, **kwargs)
+            except ItemNotFoundError:
+                pass
+        return courses
+
     @strip_key
     @contract(library_key='LibraryLocator')
     def get_library(self, library_key, depth=0, **kwargs):
@@ -0,0 +1,69 @@
+"""
+Performance test for importing courses with and without static import threads.
+"""
+import itertools
+import time
+import unittest
+
+import ddt
+from path import Path as path
+
+from xmodule.modulestore.tests.utils import MIXED_MODULESTORE_SETUPS, SHORT_NAME_MAP, TEST_DATA_DIR
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+# Courses with static content to import.
+TEST_COURSES = ('manual-testing-complete', 'toy')
+
+# Numbers of static import threads to compare.
+STATIC_IMPORT_THREADS = (0, 4, 8)
+
+# pylint: disable=invalid-name
+TEST_DIR = path(__file__).dirname()
+PLATFORM_ROOT = TEST_DIR.parent.parent.parent.parent.parent.parent
+TEST_DATA_ROOT = PLATFORM_ROOT / TEST_DATA_DIR
+
+
+@ddt.ddt
+@unittest.skip
+class CourseImportTimings(unittest.TestCase):
+    """
+    This class exists to time course imports, with the static files saved
+    before the blocks and concurrently with them.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_RUNS = 3
+
+    @ddt.data(*itertools.product(
+        MIXED_MODULESTORE_SETUPS,
+        TEST_COURSES,
+        STATIC_IMPORT_THREADS,
+    ))
+    @ddt.unpack
+    def test_import_timings(self, store_builder, course_dir, static_import_threads):
+        """
+        Time the import of the course into a new course, with the given number of static import threads.
+        """
+        durations = []
+        with store_builder.build() as (content_store, store):
+            for run in range(self.NUM_RUNS):
+                course_key = store.make_course_key('a', course_dir, 'run{}'.format(run))
+                start = time.time()
+                import_course_from_xml(
+                    store,
+                    'test_user',
+                    TEST_DATA_ROOT,
+                    source_dirs=[course_dir],
+                    static_content_store=content_store,
+                    target_id=course_key,
+                    create_if_not_present=True,
+                    raise_on_failure=True,
+                    static_import_threads=static_import_threads,
+                )
+                durations.append(time.time() - start)
+
+        print(u'{}:{}:{} threads: {:.3f}s'.format(
+            SHORT_NAME_MAP[store_builder], course_dir, static_import_threads, min(durations)
+        ))
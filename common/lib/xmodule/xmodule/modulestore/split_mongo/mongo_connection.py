@@ -8,6 +8,8 @@ import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -15,6 +17,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -203,6 +206,115 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class LocalStructureCache(object):
+    """
+    A least-recently-used cache of deserialized course structures, local to
+    the current process and bounded by the total size (in bytes) of the
+    structures it holds.
+
+    Structures are immutable and keyed by their version, so entries never
+    need to be invalidated, only evicted. Callers must not mutate the
+    structures returned by this cache.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int): The maximum total size, in bytes, of the
+                cached structures. Structures larger than this are not cached.
+        """
+        self.max_size = max_size
+        self.resident_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the structure cached for the given version, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # Re-insert the entry to mark it as most recently used.
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, structure, size):
+        """
+        Cache the given structure, whose serialized size is ``size`` bytes,
+        evicting the least recently used structures as needed.
+        """
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self.resident_size -= previous_entry[1]
+
+            while self._entries and self.resident_size + size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.resident_size -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (structure, size)
+            self.resident_size += size
+
+    def clear(self):
+        """
+        Remove all cached structures and reset the metrics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.resident_size = self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        """
+        Return the fraction of lookups that were served from this cache.
+        """
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Return a dict of the metrics for this cache.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'resident_size': self.resident_size,
+            'max_size': self.max_size,
+        }
+
+
+_LOCAL_STRUCTURE_CACHE = None
+
+
+def get_local_structure_cache():
+    """
+    Return the process-wide LocalStructureCache, or None if it is disabled.
+
+    The cache is enabled by setting COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE to
+    the maximum number of bytes of structures to keep in each process.
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+    if _LOCAL_STRUCTURE_CACHE is None and DJANGO_AVAILABLE:
+        max_size = getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE', 0)
+        if max_size:
+            _LOCAL_STRUCTURE_CACHE = LocalStructureCache(max_size)
+    return _LOCAL_STRUCTURE_CACHE
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
@@ -210,6 +322,10 @@ class CourseStructureCache(object):
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
+
+    If enabled, the process-local LocalStructureCache is consulted first, so
+    that structures already deserialized by this process are not fetched and
+    deserialized again.
     """
     def __init__(self):
         self.cache = None
@@ -218,13 +334,23 @@ class CourseStructureCache(object):
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+        self.local_cache = get_local_structure_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
-        if self.cache is None:
+        if self.cache is None and self.local_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.local_cache is not None:
+                structure = self.local_cache.get(key)
+                tagger.tag(from_local_cache=str(structure is not None).lower())
+                if structure is not None:
+                    return structure
+
+            if self.cache is None:
+                return None
+
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
@@ -238,16 +364,55 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            return pickle.loads(pickled_data)
+            structure = pickle.loads(pickled_data)
+            self._set_local(key, structure, len(pickled_data), tagger)
+            return structure
+
+    def get_many(self, keys, course_context=None):
+        """
+        Pull the structures for all of the given keys from cache with a
+        single cache request.
+
+        Returns a dict of key to structure for each key found in the cache.
+        """
+        structures = {}
+        if self.cache is None and self.local_cache is None:
+            return structures
+
+        with TIMER.timer("CourseStructureCache.get_many", course_context) as tagger:
+            tagger.measure('requested_keys', len(keys))
+            remaining_keys = list(keys)
+            if self.local_cache is not None:
+                remaining_keys = []
+                for key in keys:
+                    structure = self.local_cache.get(key)
+                    if structure is None:
+                        remaining_keys.append(key)
+                    else:
+                        structures[key] = structure
+
+            if self.cache is not None and remaining_keys:
+                for key, compressed_pickled_data in self.cache.get_many(remaining_keys).iteritems():
+                    pickled_data = zlib.decompress(compressed_pickled_data)
+                    structure = pickle.loads(pickled_data)
+                    self._set_local(key, structure, len(pickled_data), tagger)
+                    structures[key] = structure
+
+            tagger.measure('found_keys', len(structures))
+            return structures
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and self.local_cache is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
+            self._set_local(key, structure, len(pickled_data), tagger)
+
+            if self.cache is None:
+                return None
 
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
@@ -256,6 +421,18 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+    def _set_local(self, key, structure, size, tagger):
+        """
+        Add the given structure to the local cache, if enabled, recording
+        the local cache's metrics with the given tagger.
+        """
+        if self.local_cache is None:
+            return
+
+        self.local_cache.set(key, structure, size)
+        tagger.measure('local_cache_resident_size', self.local_cache.resident_size)
+        tagger.tag(local_cache_hit_rate=round(self.local_cache.hit_rate, 2))
+
 
 class MongoConnection(object):
     """
@@ -322,6 +499,34 @@ class MongoConnection(object):
 
             return structure
 
+    @autoretry_read()
+    def get_structures(self, keys, course_context=None):
+        """
+        Get the structures from the persistence mechanism whose ids are the given keys.
+
+        Cached versions of the structures are used when available, and all of
+        the structures missing from the cache are fetched with a single query.
+
+        Returns a dict of key to structure for each structure that was found.
+        """
+        with TIMER.timer("get_structures", course_context) as tagger_get_structures:
+            cache = CourseStructureCache()
+
+            structures = cache.get_many(keys, course_context)
+            missing_keys = [key for key in keys if key not in structures]
+            tagger_get_structures.measure("cache_misses", len(missing_keys))
+
+            if missing_keys:
+                # Always log cache misses, because they are unexpected
+                tagger_get_structures.sample_rate = 1
+
+                for doc in self.structures.find({'_id': {'$in': missing_keys}}):
+                    structure = structure_from_mongo(doc, course_context)
+                    cache.set(structure['_id'], structure, course_context)
+                    structures[structure['_id']] = structure
+
+            return structures
+
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
         """
@@ -1143,6 +1143,57 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(course_id)
         return self._get_structure(course_id, depth, **kwargs)
 
+    def get_courses_bulk(self, course_keys, depth=0, **kwargs):
+        """
+        Gets the course descriptors for all of the given course keys, fetching
+        the course indexes with a single query and the structures with a
+        single cache request plus a single query for any cache misses.
+
+        Courses that are not found are omitted from the result.
+
+        Returns:
+            dict of each found course key (as given) to its course descriptor
+        """
+        courses = {}
+        bulk_course_keys = []
+        for course_key in course_keys:
+            if not isinstance(course_key, CourseLocator) or course_key.deprecated:
+                # The supplied CourseKey is of the wrong type, so it can't possibly be stored in this modulestore.
+                continue
+            if course_key.version_guid or self._is_in_bulk_operation(course_key):
+                # Pinned versions need head validation, and courses in a bulk operation
+                # may have unsaved changes, so look those up individually.
+                try:
+                    courses[course_key] = self.get_course(course_key, depth, **kwargs)
+                except ItemNotFoundError:
+                    pass
+            elif course_key.branch is None:
+                raise InsufficientSpecificationError(course_key)
+            else:
+                bulk_course_keys.append(course_key)
+
+        if not bulk_course_keys:
+            return courses
+
+        indexes = {
+            (index['org'], index['course'], index['run']): index
+            for index in self.db_connection.find_matching_course_indexes(course_keys=bulk_course_keys)
+        }
+        version_guids = {}
+        for course_key in bulk_course_keys:
+            index = indexes.get((course_key.org, course_key.course, course_key.run))
+            if index is not None and course_key.branch in index['versions']:
+                version_guids[course_key] = index['versions'][course_key.branch]
+
+        structures = self.db_connection.get_structures(list(set(version_guids.values())))
+        for course_key, version_guid in version_guids.iteritems():
+            structure = structures.get(version_guid)
+            if structure is None:
+                continue
+            course_entry = CourseEnvelope(course_key.replace(version_guid=version_guid), structure)
+            courses[course_key] = self._load_items(course_entry, [structure['root']], depth, **kwargs)[0]
+        return courses
+
     def get_library(self, library_id, depth=0, head_validation=True, **kwargs):
         """
         Gets the 'library' root block for the library identified by the locator
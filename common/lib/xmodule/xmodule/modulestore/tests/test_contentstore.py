@@ -1,6 +1,8 @@
 """
  Test contentstore.mongo functionality
 """
+import base64
+import itertools
 import logging
 from uuid import uuid4
 import unittest
@@ -14,8 +16,9 @@ from opaque_keys.edx.keys import AssetKey
 from xmodule.tests import DATA_DIR
 from xmodule.contentstore.mongo import MongoContentStore
 from xmodule.contentstore.content import StaticContent
-from xmodule.exceptions import NotFoundError
+from xmodule.exceptions import InvalidAssetCursorError, NotFoundError
 import ddt
+from pymongo import ASCENDING, DESCENDING
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 
 log = logging.getLogger(__name__)
@@ -165,6 +168,83 @@ class TestContentstore(unittest.TestCase):
         self.assertEqual(count, 0)
         self.assertEqual(course_assets, [])
 
+    @ddt.data(
+        *itertools.product((True, False), ('uploadDate', 'displayname', 'contentType'), (ASCENDING, DESCENDING))
+    )
+    @ddt.unpack
+    def test_get_content_pages(self, deprecated, sort_field, direction):
+        """
+        Test that the pages of get_all_content_for_course follow the order of the full listing
+        """
+        self.set_up_assets(deprecated)
+        sort = [(sort_field, direction)]
+        all_assets, count = self.contentstore.get_all_content_for_course(self.course1_key, sort=sort)
+        self.assertEqual(count, len(self.course1_files))
+
+        paged_assets = []
+        for start in range(count):
+            page, page_count = self.contentstore.get_all_content_for_course(
+                self.course1_key, start=start, maxresults=1, sort=sort
+            )
+            self.assertEqual(page_count, count)
+            paged_assets.extend(page)
+        self.assertEqual(
+            [asset['asset_key'] for asset in paged_assets],
+            [asset['asset_key'] for asset in all_assets],
+        )
+
+        # Page through the assets following the cursor of the last asset of each page.
+        paged_assets = []
+        cursor = None
+        for __ in range(count + 1):
+            page, __ = self.contentstore.get_all_content_for_course(
+                self.course1_key, maxresults=2, sort=sort, after=cursor
+            )
+            if not page:
+                break
+            paged_assets.extend(page)
+            cursor = self.contentstore.get_asset_cursor(page[-1], sort)
+        self.assertEqual(
+            [asset['asset_key'] for asset in paged_assets],
+            [asset['asset_key'] for asset in all_assets],
+        )
+
+    @ddt.data('invalid', base64.urlsafe_b64encode('{}'), base64.urlsafe_b64encode('["uploadDate", null, "id"]'))
+    def test_get_content_page_with_invalid_cursor(self, cursor):
+        """
+        Test that get_all_content_for_course rejects cursors it can't parse, or of another sort order
+        """
+        self.set_up_assets(False)
+        with self.assertRaises(InvalidAssetCursorError):
+            self.contentstore.get_all_content_for_course(
+                self.course1_key, maxresults=1, sort=[('displayname', ASCENDING)], after=cursor
+            )
+
+    @ddt.data(True, False)
+    def test_count_after_changes(self, deprecated):
+        """
+        Test that the cached counts of paginated listings are updated when assets change
+        """
+        self.set_up_assets(deprecated)
+        filter_params = {'locked': True}
+        __, count = self.contentstore.get_all_content_for_course(
+            self.course1_key, maxresults=10, filter_params=filter_params
+        )
+        self.assertEqual(count, 1)
+
+        asset_key = self.course1_key.make_asset_key('asset', self.course1_files[0])
+        self.contentstore.set_attr(asset_key, 'locked', True)
+        __, count = self.contentstore.get_all_content_for_course(
+            self.course1_key, maxresults=10, filter_params=filter_params
+        )
+        self.assertEqual(count, 2)
+
+        self.contentstore.delete(asset_key)
+        __, count = self.contentstore.get_all_content_for_course(
+            self.course1_key, maxresults=10, filter_params=filter_params
+        )
+        self.assertEqual(count, 1)
+
     @ddt.data(True, False)
     def test_attrs(self, deprecated):
         """
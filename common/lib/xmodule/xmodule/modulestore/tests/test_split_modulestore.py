@@ -32,7 +32,8 @@ from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
-from xmodule.modulestore.tests.factories import check_mongo_calls
+from xmodule.modulestore.split_mongo.mongo_connection import LocalStructureCache
+from xmodule.modulestore.tests.factories import check_exact_number_of_calls, check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
@@ -654,6 +655,29 @@ class SplitModuleCourseTests(SplitModuleTest):
         self.assertEqual(len(courses), 4)
         self.assertIn(new_draft_course.id.version_agnostic(), [c.id for c in courses])
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_get_courses_bulk(self, _from_json):
+        courses = modulestore().get_courses(branch=BRANCH_NAME_DRAFT)
+        course_keys = [course.id.for_branch(BRANCH_NAME_DRAFT) for course in courses]
+        missing_key = CourseLocator(org='testx', course='missing', run='run', branch=BRANCH_NAME_DRAFT)
+
+        # the indexes and the structures are each fetched with a single request
+        db_connection = modulestore().db_connection
+        with check_exact_number_of_calls(db_connection, 'find_matching_course_indexes', 1):
+            with check_exact_number_of_calls(db_connection, 'get_structures', 1):
+                with check_exact_number_of_calls(db_connection, 'get_structure', 0):
+                    bulk_courses = modulestore().get_courses_bulk(course_keys + [missing_key])
+
+        self.assertItemsEqual(bulk_courses.keys(), course_keys)
+        for course_key, course in bulk_courses.iteritems():
+            expected_course = modulestore().get_course(course_key)
+            self.assertEqual(course.location, expected_course.location)
+            self.assertEqual(course.display_name, expected_course.display_name)
+
+    def test_get_courses_bulk_requires_branch(self):
+        with self.assertRaises(InsufficientSpecificationError):
+            modulestore().get_courses_bulk([CourseLocator(org='testx', course='GreekHero', run='run')])
+
     @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
     def test_get_org_courses(self, _from_json):
         courses = modulestore().get_courses(branch=BRANCH_NAME_DRAFT, org='guestx')
@@ -999,6 +1023,24 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_local_structure_cache')
+    def test_local_structure_cache(self, mock_get_local_cache):
+        local_cache = LocalStructureCache(max_size=10 ** 8)
+        mock_get_local_cache.return_value = local_cache
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # the dummy course_structure_cache doesn't cache anything, so
+        # this is served by the process-local cache
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        self.assertIs(cached_structure, not_cached_structure)
+        self.assertEqual(local_cache.hits, 1)
+        self.assertEqual(local_cache.stats()['entries'], 1)
+        self.assertGreater(local_cache.resident_size, 0)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1008,6 +1050,55 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestLocalStructureCache(unittest.TestCase):
+    """Tests for the LocalStructureCache"""
+
+    def setUp(self):
+        super(TestLocalStructureCache, self).setUp()
+        self.cache = LocalStructureCache(max_size=100)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', {'_id': 'a'}, 10)
+        self.assertEqual(self.cache.get('a'), {'_id': 'a'})
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hit_rate, 0.5)
+        self.assertEqual(self.cache.resident_size, 10)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 'structure a', 40)
+        self.cache.set('b', 'structure b', 40)
+        # mark 'a' as recently used, so 'b' is evicted first
+        self.cache.get('a')
+        self.cache.set('c', 'structure c', 40)
+
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'structure a')
+        self.assertEqual(self.cache.get('c'), 'structure c')
+        self.assertEqual(self.cache.resident_size, 80)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_replace_entry(self):
+        self.cache.set('a', 'structure a', 40)
+        self.cache.set('a', 'structure a', 60)
+        self.assertEqual(self.cache.resident_size, 60)
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+    def test_too_large(self):
+        self.cache.set('a', 'structure a', 101)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.resident_size, 0)
+
+    def test_clear(self):
+        self.cache.set('a', 'structure a', 10)
+        self.cache.get('a')
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.resident_size, 0)
+        self.assertEqual(self.cache.hits, 0)
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
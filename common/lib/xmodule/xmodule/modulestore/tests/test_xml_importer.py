@@ -1,10 +1,13 @@
 """
 Tests for XML importer.
 """
+import hashlib
+
 import mock
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import String, Scope, ScopeIds, List
 from xblock.runtime import Runtime, KvsFieldData, DictKeyValueStore
+from xmodule.contentstore.content import StaticContent
 from xmodule.x_module import XModuleMixin
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -375,6 +378,47 @@ class StaticContentImporterTest(unittest.TestCase):
                 'static/inner/file1.txt', base_dir=expected_base_dir
             )
 
+    def test_import_static_content_directory_with_threads(self):
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=self.course_data_path,
+            target_id=CourseKey.from_string('course-v1:edX+DemoX+Demo_Course'),
+            num_threads=2,
+        )
+        mocked_os_walk_yield = [
+            ('static', None, ['file1.txt', 'file2.txt']),
+            ('static/inner', None, ['file1.txt']),
+        ]
+        with mock.patch(
+            'xmodule.modulestore.xml_importer.os.walk',
+            return_value=mocked_os_walk_yield
+        ), mock.patch.object(
+            static_content_importer, 'import_static_file', side_effect=lambda file_path, base_dir: (file_path, 'key')
+        ):
+            self.assertEqual(static_content_importer.import_static_content_directory('static'), {})
+            self.assertEqual(static_content_importer.wait_for_imports(), {
+                'static/file1.txt': 'key',
+                'static/file2.txt': 'key',
+                'static/inner/file1.txt': 'key',
+            })
+
+    def test_import_static_content_directory_with_threads_error(self):
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=self.course_data_path,
+            target_id=CourseKey.from_string('course-v1:edX+DemoX+Demo_Course'),
+            num_threads=2,
+        )
+        with mock.patch(
+            'xmodule.modulestore.xml_importer.os.walk',
+            return_value=[('static', None, ['file1.txt'])]
+        ), mock.patch.object(
+            static_content_importer, 'import_static_file', side_effect=IOError
+        ):
+            static_content_importer.import_static_content_directory('static')
+            with self.assertRaises(IOError):
+                static_content_importer.wait_for_imports()
+
     def test_import_static_file(self):
         base_dir = path('/path/to/dir')
         full_file_path = os.path.join(base_dir, 'static/some_file.txt')
@@ -386,3 +430,33 @@ class StaticContentImporterTest(unittest.TestCase):
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.assert_called_once()
+
+    def test_import_unchanged_static_file(self):
+        base_dir = path('/path/to/dir')
+        full_file_path = os.path.join(base_dir, 'static/some_file.txt')
+        target_id = CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        stored_asset = {
+            'asset_key': StaticContent.compute_location(target_id, 'static/some_file.txt'),
+            'md5': hashlib.md5('data').hexdigest(),
+            'displayname': 'some_file.txt',
+            'contentType': 'text/plain',
+            'import_path': 'static/some_file.txt',
+        }
+        self.mocked_content_store.get_all_content_for_course.return_value = ([stored_asset], 1)
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=self.course_data_path,
+            target_id=target_id,
+            skip_unchanged=True,
+        )
+        self.mocked_content_store.generate_thumbnail.return_value = (None, None)
+
+        with mock.patch("__builtin__.open", mock.mock_open(read_data="data")):
+            static_content_importer.import_static_file(full_file_path=full_file_path, base_dir=base_dir)
+        self.mocked_content_store.save.assert_not_called()
+        self.assertEqual(static_content_importer.skipped_files, ['static/some_file.txt'])
+
+        with mock.patch("__builtin__.open", mock.mock_open(read_data="changed data")):
+            static_content_importer.import_static_file(full_file_path=full_file_path, base_dir=base_dir)
+        self.assertEqual(self.mocked_content_store.save.call_count, 1)
+        self.assertEqual(static_content_importer.skipped_files, ['static/some_file.txt'])
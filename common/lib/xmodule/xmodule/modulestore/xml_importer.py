@@ -21,12 +21,14 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
 from __future__ import print_function
+import hashlib
 import json
 import logging
 import mimetypes
 import os
 import re
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 
 import xblock
 from lxml import etree
@@ -81,10 +83,29 @@ class LocationMixin(XBlockMixin):
 
 
 class StaticContentImporter:
-    def __init__(self, static_content_store, course_data_path, target_id):
+    """
+    Imports the static files of a course into the contentstore.
+
+    If `num_threads` is given, the files found by import_static_content_directory
+    are read and saved by a pool of that many threads, while the caller goes on
+    with the rest of the import.  wait_for_imports must then be called to wait
+    for them.
+
+    If `skip_unchanged` is True, files whose content digest and attributes match
+    those of the asset already stored at their location aren't saved again.  The
+    paths of the skipped files are listed in `skipped_files`.
+    """
+    def __init__(self, static_content_store, course_data_path, target_id, num_threads=0, skip_unchanged=False):
         self.static_content_store = static_content_store
         self.target_id = target_id
         self.course_data_path = course_data_path
+        self.pool = ThreadPool(num_threads) if num_threads else None
+        self.pending_imports = []
+        self.skipped_files = []
+        self.stored_assets = None
+        if skip_unchanged:
+            stored_assets, __ = static_content_store.get_all_content_for_course(target_id)
+            self.stored_assets = {asset['asset_key']: asset for asset in stored_assets}
         try:
             with open(course_data_path / 'policies/assets.json') as f:
                 self.policy = json.load(f)
@@ -114,6 +135,12 @@ class StaticContentImporter:
                 if verbose:
                     log.debug('importing static content %s...', file_path)
 
+                if self.pool is not None:
+                    self.pending_imports.append(
+                        self.pool.apply_async(self.import_static_file, (file_path,), {'base_dir': static_dir})
+                    )
+                    continue
+
                 imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
 
                 if imported_file_attrs:
@@ -123,6 +150,42 @@ class StaticContentImporter:
 
         return remap_dict
 
+    def wait_for_imports(self):
+        """
+        Waits for the files being imported by the thread pool, and returns their
+        remapping information, as import_static_content_directory does.  Errors
+        raised while importing a file are raised here.
+        """
+        remap_dict = {}
+        if self.pool is None:
+            return remap_dict
+
+        self.pool.close()
+        try:
+            for pending_import in self.pending_imports:
+                imported_file_attrs = pending_import.get()
+                if imported_file_attrs:
+                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+        finally:
+            self.pool.terminate()
+            self.pool.join()
+            self.pending_imports = []
+        return remap_dict
+
+    def is_unchanged(self, content):
+        """
+        Returns whether the content is already stored, with the same data and attributes.
+        """
+        stored_asset = self.stored_assets.get(content.location)
+        return (
+            stored_asset is not None and
+            stored_asset.get('md5') == hashlib.md5(content.data).hexdigest() and
+            stored_asset.get('displayname') == content.name and
+            stored_asset.get('contentType') == content.content_type and
+            stored_asset.get('import_path') == content.import_path and
+            stored_asset.get('locked', False) == content.locked
+        )
+
     def import_static_file(self, full_file_path, base_dir):
         filename = os.path.basename(full_file_path)
         try:
@@ -160,6 +223,10 @@ class StaticContentImporter:
             import_path=file_subpath, locked=locked
         )
 
+        if self.stored_assets is not None and self.is_unchanged(content):
+            self.skipped_files.append(file_subpath)
+            return file_subpath, asset_key
+
         # first let's save a thumbnail so we can get back a thumbnail location
         thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
 
@@ -219,6 +286,12 @@ class ImportManager(object):
             create this file to implement custom logic in their course.
 
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
+
+        static_import_threads: If greater than 0, the static files are saved into static_content_store
+            by this many threads, while the blocks of the courselike are being imported.
+
+        incremental: If True, static files that are unchanged since they were last imported aren't saved
+            again, and are listed in `skipped_static_files`.
     """
     store_class = XMLModuleStore
 
@@ -231,6 +304,7 @@ class ImportManager(object):
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
             python_lib_filename='python_lib.zip',
+            static_import_threads=0, incremental=False,
     ):
         self.store = store
         self.user_id = user_id
@@ -246,6 +320,9 @@ class ImportManager(object):
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_import_threads = static_import_threads
+        self.incremental = incremental
+        self.skipped_static_files = []
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -269,15 +346,20 @@ class ImportManager(object):
     def import_static(self, data_path, dest_id):
         """
         Import all static items into the content store.
+
+        Returns the StaticContentImporter, whose imports may still be running
+        in its threads, or None if there's no static content store.
         """
         if self.static_content_store is None:
             log.warning("Static content store is None. Skipping static content import...")
-            return
+            return None
 
         static_content_importer = StaticContentImporter(
             self.static_content_store,
             course_data_path=data_path,
-            target_id=dest_id
+            target_id=dest_id,
+            num_threads=self.static_import_threads,
+            skip_unchanged=self.incremental,
         )
         if self.do_import_static:
             if self.verbose:
@@ -316,6 +398,8 @@ class ImportManager(object):
                 content_subdir=simport, verbose=self.verbose
             )
 
+        return static_content_importer
+
     def import_asset_metadata(self, data_dir, course_id):
         """
         Read in assets XML file, parse it, and add all asset metadata to the modulestore.
@@ -501,14 +585,25 @@ class ImportManager(object):
                 # Retrieve the course itself.
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
-                # Import all static pieces.
-                self.import_static(data_path, dest_id)
-
-                # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
-
-                # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                # Import all static pieces.  With static import threads, they're
+                # saved while the rest of the courselike is imported.
+                static_content_importer = self.import_static(data_path, dest_id)
+                try:
+                    # Import asset metadata stored in XML.
+                    self.import_asset_metadata(data_path, dest_id)
+
+                    # Import all children
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                finally:
+                    if static_content_importer is not None:
+                        static_content_importer.wait_for_imports()
+
+                if static_content_importer is not None and self.incremental:
+                    self.skipped_static_files.extend(static_content_importer.skipped_files)
+                    log.info(
+                        u'Skipped %d unchanged static files importing %s',
+                        len(static_content_importer.skipped_files), dest_id
+                    )
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
@@ -1,8 +1,18 @@
 import re
+
+from capa.safe_exec import LocalResultCache, TieredResultCache
 from django.conf import settings
 
+try:
+    import newrelic.agent
+except ImportError:
+    newrelic = None  # pylint: disable=invalid-name
+
 DEFAULT_PYTHON_LIB_FILENAME = 'python_lib.zip'
 
+# The TieredResultCache of this process for each shared cache.
+_SAFE_EXEC_CACHES = {}
+
 
 def can_execute_unsafe_code(course_id):
     """
@@ -38,3 +48,30 @@ def get_python_lib_zip(contentstore, course_id):
         return zip_lib.data
     else:
         return None
+
+
+def get_safe_exec_cache(shared_cache):
+    """
+    Return the cache to use for safe_exec results.
+
+    When SAFE_EXEC_LOCAL_CACHE['PATH'] is set, this is a TieredResultCache
+    that checks a local SQLite database at that path before the given
+    shared cache.  Otherwise, it's the shared cache itself.
+    """
+    local_cache_settings = getattr(settings, 'SAFE_EXEC_LOCAL_CACHE', {})
+    if not local_cache_settings.get('PATH'):
+        return shared_cache
+
+    if shared_cache not in _SAFE_EXEC_CACHES:
+        _SAFE_EXEC_CACHES[shared_cache] = TieredResultCache(
+            LocalResultCache(local_cache_settings['PATH'], local_cache_settings['MAX_SIZE']),
+            shared_cache,
+            on_lookup=_record_safe_exec_cache_lookup,
+        )
+    return _SAFE_EXEC_CACHES[shared_cache]
+
+
+def _record_safe_exec_cache_lookup(slug, lookup):
+    """Report the result of a safe_exec cache lookup for the problem slug."""
+    if newrelic:
+        newrelic.agent.add_custom_parameter('safe_exec_cache.{}'.format(lookup), slug)
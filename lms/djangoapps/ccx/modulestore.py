@@ -153,6 +153,22 @@ class CCXModulestoreWrapper(object):
                 course_key, depth=depth, **kwargs
             ))
 
+    def get_courses_bulk(self, course_keys, depth=0, **kwargs):
+        """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
+        # CCX keys for the same course would share a single course module, so
+        # they are fetched individually and restored to their own CCX keys.
+        ccx_keys = [course_key for course_key in course_keys if isinstance(course_key, CCXLocator)]
+        courses = self._modulestore.get_courses_bulk(
+            [course_key for course_key in course_keys if not isinstance(course_key, CCXLocator)],
+            depth=depth,
+            **kwargs
+        )
+        for course_key in ccx_keys:
+            course = self.get_course(course_key, depth=depth, **kwargs)
+            if course is not None:
+                courses[course_key] = course
+        return courses
+
     def has_course(self, course_id, ignore_case=False, **kwargs):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         with remove_ccx(course_id) as (course_id, restore):
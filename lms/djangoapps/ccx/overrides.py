@@ -4,17 +4,23 @@ by the individual custom courses feature.
 """
 import json
 import logging
+from uuid import uuid4
 
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from openedx.core.lib.cache_utils import get_cache
-from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider
+from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider, clear_override_index
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+OVERRIDES_VERSION_CACHE_KEY = u'ccx.overrides.version.{ccx_id}'
+OVERRIDES_CACHE_KEY = u'ccx.overrides.{ccx_id}.{version}'
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -117,26 +123,69 @@ def _clean_ccx_key(block_location):
 
 def _get_overrides_for_ccx(ccx):
     """
-    Returns a dictionary mapping field name to overriden value for any
-    overrides set on this block for this CCX.
+    Returns a dictionary mapping block locations to dictionaries of the
+    overridden values of their fields, and of the ids of the overrides,
+    for this CCX.
     """
     overrides_cache = get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
+        overrides = {}
+        for location, block_overrides in json.loads(_get_serialized_overrides_for_ccx(ccx)).iteritems():
+            block_overrides_map = overrides.setdefault(UsageKey.from_string(location), {})
+            for field, (override_id, value) in block_overrides.iteritems():
+                block_overrides_map[field] = value
+                block_overrides_map[field + "_id"] = override_id
+
+        overrides_cache[ccx] = overrides
+
+    return overrides_cache[ccx]
+
+
+def _get_serialized_overrides_for_ccx(ccx):
+    """
+    Returns the overrides of this CCX as a JSON document mapping block
+    locations to the ids and values of the overrides of their fields.
+    The document is cached across requests under the current version of
+    the overrides of the CCX, so the rows aren't loaded and decoded again
+    until they're changed.
+    """
+    version_key = OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id)
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid4().hex
+        cache.set(version_key, version, None)
+
+    cache_key = OVERRIDES_CACHE_KEY.format(ccx_id=ccx.id, version=version)
+    serialized_overrides = cache.get(cache_key)
+    if serialized_overrides is None:
         overrides = {}
         query = CcxFieldOverride.objects.filter(
             ccx=ccx,
-        )
+        ).values_list('location', 'field', 'id', 'value')
 
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+        for location, field, override_id, value in query:
+            overrides.setdefault(unicode(location), {})[field] = [override_id, json.loads(value)]
 
-        overrides_cache[ccx] = overrides
+        serialized_overrides = json.dumps(overrides, separators=(',', ':'))
+        cache.set(cache_key, serialized_overrides, settings.CCX_OVERRIDES_CACHE_TIMEOUT)
 
-    return overrides_cache[ccx]
+    return serialized_overrides
+
+
+def _clear_cached_overrides_for_ccx(ccx):
+    """
+    Makes the overrides of this CCX cached across requests unreachable,
+    after they're changed.  The version is changed again when the
+    transaction commits, in case another request cached the old overrides
+    in the meantime.
+    """
+    def _bump_version():
+        cache.set(OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id), uuid4().hex, None)
+
+    _bump_version()
+    transaction.on_commit(_bump_version)
+    clear_override_index()
 
 
 @transaction.atomic
@@ -149,31 +198,26 @@ def override_field_for_ccx(ccx, block, name, value):
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
-    override_has_changes = False
-    clean_ccx_key = _clean_ccx_key(block.location)
-
-    override = get_override_for_ccx(ccx, block, name + "_instance")
-    if override:
-        override_has_changes = serialized_value != override.value
+    block_overrides = _get_overrides_for_ccx(ccx).setdefault(_clean_ccx_key(block.location), {})
 
-    if not override:
+    override_id = block_overrides.get(name + "_id")
+    if override_id is not None:
+        if serialized_value != json.dumps(block_overrides.get(name)):
+            CcxFieldOverride.objects.filter(id=override_id).update(value=serialized_value)
+    else:
         override, created = CcxFieldOverride.objects.get_or_create(
             ccx=ccx,
             location=block.location,
             field=name,
             defaults={'value': serialized_value},
         )
-        if created:
-            _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_id"] = override.id
-        else:
-            override_has_changes = serialized_value != override.value
-
-    if override_has_changes:
-        override.value = serialized_value
-        override.save()
+        if not created and serialized_value != override.value:
+            override.value = serialized_value
+            override.save()
+        block_overrides[name + "_id"] = override.id
 
-    _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
-    _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+    block_overrides[name] = value_json
+    _clear_cached_overrides_for_ccx(ccx)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -204,9 +248,9 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):
         ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})
         ccx_override_map.pop(name)
         ccx_override_map.pop(name + "_id")
-        ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
+    _clear_cached_overrides_for_ccx(ccx)
 
 
 def bulk_delete_ccx_override_fields(ccx, ids):
@@ -217,3 +261,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _clear_cached_overrides_for_ccx(ccx)
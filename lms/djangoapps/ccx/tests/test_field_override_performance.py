@@ -3,6 +3,8 @@
 Performance tests for field overrides.
 """
 import itertools
+import timeit
+import unittest
 from datetime import datetime
 
 import ddt
@@ -18,6 +20,7 @@ from django.core.cache import caches
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
+from lms.djangoapps.ccx.overrides import CustomCoursesForEdxOverrideProvider
 from lms.djangoapps.ccx.tests.factories import CcxFactory
 from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -287,3 +290,44 @@ class TestFieldOverrideSplitPerformance(FieldOverridePerformanceTestCase):
         ('ccx', 2, False, False): (QUERY_COUNT, 3),
         ('ccx', 3, False, False): (QUERY_COUNT, 3),
     }
+
+
+@unittest.skip
+class FieldOverrideBenchmark(FieldOverridePerformanceTestCase):
+    """
+    Times rendering the progress page of a CCX course, which reads the
+    fields of all its blocks, and counts the calls to the CCX provider.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+    __test__ = True
+    MODULESTORE = TEST_DATA_SPLIT_MODULESTORE
+    TEST_DATA = TestFieldOverrideSplitPerformance.TEST_DATA
+
+    COURSE_WIDTH = 4
+    NUM_RUNS = 5
+
+    def test_progress_render_timings(self):
+        course_key = self.setup_course(self.COURSE_WIDTH, enable_ccx=True, view_as_ccx=True)
+        ContentTypeGatingConfig.objects.create(enabled=True, enabled_as_of=datetime(2018, 1, 1))
+        with self.settings(
+            MODULESTORE_BRANCH='published-only',
+            XBLOCK_FIELD_DATA_WRAPPERS=['lms.djangoapps.courseware.field_overrides:OverrideModulestoreFieldData.wrap'],
+            MODULESTORE_FIELD_OVERRIDE_PROVIDERS=('ccx.overrides.CustomCoursesForEdxOverrideProvider',),
+        ):
+            OverrideFieldData.provider_classes = None
+
+            def _render():
+                RequestCache.clear_all_namespaces()
+                self.grade_course(course_key)
+
+            # Fill the modulestore caches before timing.
+            _render()
+            with mock.patch.object(
+                CustomCoursesForEdxOverrideProvider, 'get',
+                autospec=True, side_effect=CustomCoursesForEdxOverrideProvider.get,
+            ) as mock_get:
+                _render()
+            print(u'CCX course of width {}:'.format(self.COURSE_WIDTH))
+            print(u'  provider calls: {} per render'.format(mock_get.call_count))
+            print(u'  {:.4f}s per render'.format(timeit.timeit(_render, number=self.NUM_RUNS) / self.NUM_RUNS))
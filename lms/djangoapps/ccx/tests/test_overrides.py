@@ -14,7 +14,7 @@ from courseware.courses import get_course_by_id
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from courseware.testutils import FieldOverrideTestMixin
 from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.overrides import clear_override_for_ccx, get_override_for_ccx, override_field_for_ccx
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
 from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
 from student.tests.factories import AdminFactory
@@ -146,6 +146,27 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         with self.assertNumQueries(6):
             override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
 
+    def test_overrides_cached_across_requests(self):
+        """
+        Test that the overrides are loaded once, until they're changed.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx_course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        # Simulate new requests.
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(get_override_for_ccx(self.ccx, chapter, 'start_id'))
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+        clear_override_for_ccx(self.ccx, chapter, 'start')
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_override_for_ccx(self.ccx, chapter, 'start'))
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
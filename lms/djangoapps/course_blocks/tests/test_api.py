@@ -0,0 +1,91 @@
+"""
+Performance tests for get_course_blocks.
+"""
+import sys
+import timeit
+import unittest
+
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.block_structure import FieldData
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from ..api import get_course_blocks
+
+
+def _collected_data_size(block_structure):
+    """
+    Returns the number of bytes used by the collected data of the blocks
+    of the given block structure, including the collected values.
+    """
+    seen = set()
+
+    def _size(obj):
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            size += sum(_size(key) + _size(value) for key, value in obj.iteritems())
+        elif isinstance(obj, (list, tuple)):
+            size += sum(_size(item) for item in obj)
+        elif isinstance(obj, FieldData):
+            size += _size(getattr(obj, '__dict__', {}))
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, '__slots__', ()):
+                    # Field tables are shared by all the blocks.
+                    if name != '_field_table':
+                        size += _size(getattr(obj, name, None))
+        return size
+
+    return sum(_size(block_data) for block_data in block_structure.itervalues())
+
+
+@unittest.skip
+class GetCourseBlocksBenchmark(SharedModuleStoreTestCase):
+    """
+    Measures the memory used by the collected data of a large generated
+    course, and the time taken by get_course_blocks for it.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    # 10 chapters of 10 sequentials of 10 verticals of 4 problems: 5110 blocks.
+    NUM_CHILDREN = (('chapter', 10), ('sequential', 10), ('vertical', 10), ('problem', 4))
+    NUM_RUNS = 5
+
+    @classmethod
+    def setUpClass(cls):
+        super(GetCourseBlocksBenchmark, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        with cls.store.bulk_operations(cls.course.id):
+            parents = [cls.course]
+            for category, num_children in cls.NUM_CHILDREN:
+                parents = [
+                    ItemFactory.create(parent=parent, category=category, publish_item=False)
+                    for parent in parents
+                    for _ in range(num_children)
+                ]
+
+    def test_get_course_blocks(self):
+        user = UserFactory.create()
+        manager = get_block_structure_manager(self.course.id)
+        collected_block_structure = manager.get_collected()
+
+        print(u'Course with {} blocks:'.format(len(collected_block_structure)))
+        print(u'  collected data: {} bytes'.format(_collected_data_size(collected_block_structure)))
+        print(u'  from the cache: {:.4f}s per call'.format(
+            timeit.timeit(
+                lambda: get_course_blocks(user, self.course.location),
+                number=self.NUM_RUNS,
+            ) / self.NUM_RUNS
+        ))
+        print(u'  from a collected structure: {:.4f}s per call'.format(
+            timeit.timeit(
+                lambda: get_course_blocks(
+                    user, self.course.location, collected_block_structure=collected_block_structure,
+                ),
+                number=self.NUM_RUNS,
+            ) / self.NUM_RUNS
+        ))
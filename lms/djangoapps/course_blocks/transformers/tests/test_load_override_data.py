@@ -152,3 +152,13 @@ class TestOverrideDataTransformer(ModuleStoreTestCase):
             assert get_override_for_user(self.learner, self.block, field) == expected_overrides.get(field)
             # other learner2 dont have overridden data
             assert get_override_for_user(self.learner2, self.block, field) is None
+
+    def test_overrides_fetched_once_per_course(self):
+        """Test that the overrides of all the blocks of the course are fetched with one query"""
+        section = self.course.get_children()[0]
+        subsection = section.get_children()[0]
+        override_field_for_user(self.learner, section, 'due', expected_overrides['due'])
+        with self.assertNumQueries(1):
+            assert get_override_for_user(self.learner, section, 'due') == expected_overrides['due']
+            assert get_override_for_user(self.learner, subsection, 'due') is None
+            assert get_override_for_user(self.learner, self.course, 'due') is None
@@ -19,7 +19,7 @@ from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 
 from django.conf import settings
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -27,6 +27,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+OVERRIDE_INDEX_NAMESPACE = u'courseware.field_overrides.index'
 
 
 def resolve_dotted(name):
@@ -91,6 +92,14 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def clear_override_index():
+    """
+    Clears the inherited overrides looked up during the current request.
+    Must be called when overrides are changed.
+    """
+    RequestCache(OVERRIDE_INDEX_NAMESPACE).clear()
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -104,6 +113,10 @@ class FieldOverrideProvider(object):
     """
     __metaclass__ = ABCMeta
 
+    # The names of the fields this provider can override, or None if it can
+    # override any field.  Providers aren't asked for the other fields.
+    overridable_fields = None
+
     def __init__(self, user, fallback_field_data):
         self.user = user
         self.fallback_field_data = fallback_field_data
@@ -148,6 +161,10 @@ class OverrideFieldData(FieldData):
     """
     provider_classes = None
 
+    # Map of (provider classes, field name) to the indices of the providers
+    # that can override the field.
+    _field_provider_indices = {}
+
     @classmethod
     def wrap(cls, user, course, wrapped):
         """
@@ -200,6 +217,22 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self._provider_classes = tuple(providers)
+        self._user_id = getattr(user, 'id', None)
+
+    def _providers_for_field(self, name):
+        """
+        Returns the providers that can override the field named `name`.
+        """
+        key = (self._provider_classes, name)
+        indices = self._field_provider_indices.get(key)
+        if indices is None:
+            indices = tuple(
+                index for index, provider_class in enumerate(self._provider_classes)
+                if provider_class.overridable_fields is None or name in provider_class.overridable_fields
+            )
+            self._field_provider_indices[key] = indices
+        return [self.providers[index] for index in indices]
 
     def get_override(self, block, name):
         """
@@ -207,12 +240,33 @@ class OverrideFieldData(FieldData):
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
-            for provider in self.providers:
+            for provider in self._providers_for_field(name):
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
                     return value
         return NOTSET
 
+    def _get_inherited_override(self, block, name):
+        """
+        Returns the first override of the inheritable field named `name` set
+        on an ancestor of `block`, or `NOTSET`.  The overrides of the
+        ancestors are indexed for the rest of the request, since all their
+        descendants look them up.
+        """
+        if overrides_disabled() or not self._providers_for_field(name):
+            return NOTSET
+
+        override_index = RequestCache(OVERRIDE_INDEX_NAMESPACE).data
+        for ancestor in _lineage(block):
+            key = (self._provider_classes, self._user_id, ancestor.location, name)
+            try:
+                value = override_index[key]
+            except KeyError:
+                value = override_index[key] = self.get_override(ancestor, name)
+            if value is not NOTSET:
+                return value
+        return NOTSET
+
     def get(self, block, name):
         value = self.get_override(block, name)
         if value is not NOTSET:
@@ -234,11 +288,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in InheritanceMixin.fields:
+                if self._get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -248,13 +300,10 @@ class OverrideFieldData(FieldData):
     def default(self, block, name):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
-        if self.providers and not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+        if self.providers and name in InheritanceMixin.fields:
+            value = self._get_inherited_override(block, name)
+            if value is not NOTSET:
+                return value
         return self.fallback.default(block, name)
 
 
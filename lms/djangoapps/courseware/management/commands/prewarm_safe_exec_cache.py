@@ -0,0 +1,103 @@
+"""
+Run the Python scripts of a course's problems for the most common random seeds,
+so that their results are in the safe_exec cache before learners load them.
+
+Problems randomized per student use one of NUM_RANDOMIZATION_BINS seeds per
+learner, so by default their scripts are run for each of these seeds.  Problems
+that aren't randomized are run for their only seed.  Problems randomized on
+each attempt or reset are skipped, as they draw their seeds from
+MAX_RANDOMIZATION_BINS seeds and prewarming a few of them would rarely help.
+Problems whose scripts use the learner's anonymous id are skipped too, as
+their results aren't shared.
+
+When SAFE_EXEC_LOCAL_CACHE is configured, this fills the local cache of the
+server the command runs on, as well as the shared cache.
+"""
+import gettext
+import logging
+from textwrap import dedent
+
+from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from xmodule.capa_base import NUM_RANDOMIZATION_BINS, RANDOMIZATION
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip, get_safe_exec_cache
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id',
+                            help='the course whose problems to run')
+        parser.add_argument('--seeds',
+                            type=int,
+                            default=NUM_RANDOMIZATION_BINS,
+                            help='number of seeds to run problems randomized per student for')
+
+    def handle(self, *args, **options):
+        try:
+            course_key = CourseKey.from_string(options['course_id'])
+        except InvalidKeyError:
+            raise CommandError(u'Invalid course_id: {}'.format(options['course_id']))
+
+        store = modulestore()
+        if store.get_course(course_key) is None:
+            raise CommandError(u'Course not found: {}'.format(course_key))
+
+        safe_exec_cache = get_safe_exec_cache(cache)
+        python_lib_zip = get_python_lib_zip(contentstore, course_key)
+        unsafely = can_execute_unsafe_code(course_key)
+
+        num_runs = 0
+        for problem in store.get_items(course_key, qualifiers={'category': 'problem'}):
+            if '<script' not in problem.data or 'anonymous_student_id' in problem.data:
+                continue
+
+            if problem.rerandomize == RANDOMIZATION.NEVER:
+                seeds = [1]
+            elif problem.rerandomize == RANDOMIZATION.PER_STUDENT:
+                seeds = range(options['seeds'])
+            else:
+                continue
+
+            for seed in seeds:
+                capa_system = LoncapaSystem(
+                    ajax_url=None,
+                    anonymous_student_id=None,
+                    cache=safe_exec_cache,
+                    can_execute_unsafe_code=lambda: unsafely,
+                    get_python_lib_zip=lambda: python_lib_zip,
+                    DEBUG=settings.DEBUG,
+                    filestore=problem.runtime.resources_fs,
+                    i18n=gettext.NullTranslations(),
+                    node_path=settings.NODE_PATH,
+                    render_template=None,
+                    seed=seed,
+                    STATIC_URL=settings.STATIC_URL,
+                    xqueue=None,
+                )
+                try:
+                    LoncapaProblem(
+                        problem_text=problem.data,
+                        id=problem.location.html_id(),
+                        capa_system=capa_system,
+                        capa_module=None,
+                        seed=seed,
+                        extract_tree=False,
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(u'Unable to run the scripts of %s with seed %s', problem.location, seed)
+                    break
+                num_runs += 1
+
+        self.stdout.write(u'Ran the scripts of {} problems and seeds in {}.'.format(num_runs, course_key))
+        for slug, lookups in sorted(getattr(safe_exec_cache, 'stats', {}).items()):
+            self.stdout.write(u'  {}: {}'.format(slug, dict(lookups)))
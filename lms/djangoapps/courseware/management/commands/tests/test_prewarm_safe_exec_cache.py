@@ -0,0 +1,76 @@
+"""
+Tests for the prewarm_safe_exec_cache management command.
+"""
+import os.path
+import shutil
+import sqlite3
+import tempfile
+from textwrap import dedent
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test.utils import override_settings
+from mock import patch
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+PROBLEM_XML = dedent("""
+    <problem>
+        <script type="loncapa/python">
+    value = random.randint(0, 1000) {}
+    def check(expect, answer):
+        return answer == str(value)
+        </script>
+        <customresponse cfn="check">
+            <textline/>
+        </customresponse>
+    </problem>
+""")
+
+
+class PrewarmSafeExecCacheTestCase(SharedModuleStoreTestCase):
+    """
+    Tests that the command runs the scripts of a course's problems for
+    each seed.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(PrewarmSafeExecCacheTestCase, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        ItemFactory.create(
+            parent=cls.course, category='problem', data=PROBLEM_XML.format(''),
+            metadata={'rerandomize': 'per_student'},
+        )
+        ItemFactory.create(
+            parent=cls.course, category='problem', data=PROBLEM_XML.format('+ 2'), metadata={'rerandomize': 'always'},
+        )
+        ItemFactory.create(
+            parent=cls.course, category='problem', data=PROBLEM_XML.format('+ 1'), metadata={'rerandomize': 'never'},
+        )
+        ItemFactory.create(
+            parent=cls.course, category='problem', data=PROBLEM_XML.format('+ len(anonymous_student_id)'),
+        )
+
+    def setUp(self):
+        super(PrewarmSafeExecCacheTestCase, self).setUp()
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.path = os.path.join(temp_dir, 'results.sqlite')
+
+        caches_patch = patch.dict('xmodule.util.sandboxing._SAFE_EXEC_CACHES', clear=True)
+        caches_patch.start()
+        self.addCleanup(caches_patch.stop)
+
+    def test_prewarm(self):
+        with override_settings(SAFE_EXEC_LOCAL_CACHE={'PATH': self.path, 'MAX_SIZE': 1024 * 1024}):
+            call_command('prewarm_safe_exec_cache', unicode(self.course.id), '--seeds', '5')
+
+        # Each seed of the problem randomized per student, and the only seed
+        # of the problem that isn't randomized.
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM results').fetchone()[0], 6)
+
+    def test_invalid_course(self):
+        with self.assertRaises(CommandError):
+            call_command('prewarm_safe_exec_cache', 'course-v1:edX+Missing+Course')
@@ -23,18 +23,23 @@ DjangoOrmFieldCache: A base-class for single-row-per-field caches.
 
 import json
 import logging
+import threading
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
+from contextlib import contextmanager
 
 from contracts import contract, new_contract
-from django.db import DatabaseError, IntegrityError, transaction
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.backends.utils import CursorWrapper
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import CourseKey
-from xblock.core import XBlockAside
+from xblock.core import XBlock, XBlockAside
 from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
-from xblock.fields import Scope, UserScope
-from xblock.runtime import KeyValueStore
+from xblock.fields import Scope, ScopeIds, UserScope
+from xblock.plugin import PluginMissingError
+from xblock.runtime import KeyValueStore, Mixologist
 
 from courseware.user_state_client import DjangoXBlockUserStateClient
 from xmodule.modulestore.django import modulestore
@@ -44,6 +49,53 @@ from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsF
 log = logging.getLogger(__name__)
 
 
+class _QueryCountingCursorWrapper(CursorWrapper):
+    """
+    Wraps a cursor of the given connection, calling `counter` for each query
+    it executes.  Used on Django versions whose database connections have
+    no execute_wrapper.
+    """
+    def __init__(self, cursor, db, counter):
+        super(_QueryCountingCursorWrapper, self).__init__(cursor, db)
+        self.counter = counter
+
+    def execute(self, sql, params=None):
+        self.counter()
+        return super(_QueryCountingCursorWrapper, self).execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        self.counter()
+        return super(_QueryCountingCursorWrapper, self).executemany(sql, param_list)
+
+
+@contextmanager
+def _counting_queries(counter):
+    """
+    Calls `counter` for each SQL query executed on the default database
+    connection within the block.  Unlike django.test's CaptureQueriesContext,
+    the queries themselves aren't recorded.
+    """
+    def count_query(execute, sql, params, many, context):
+        counter()
+        return execute(sql, params, many, context)
+
+    if hasattr(connection, 'execute_wrapper'):
+        with connection.execute_wrapper(count_query):
+            yield
+        return
+
+    make_cursor, make_debug_cursor = connection.make_cursor, connection.make_debug_cursor
+    connection.make_cursor = lambda cursor: _QueryCountingCursorWrapper(make_cursor(cursor), connection, counter)
+    connection.make_debug_cursor = lambda cursor: _QueryCountingCursorWrapper(
+        make_debug_cursor(cursor), connection, counter,
+    )
+    try:
+        yield
+    finally:
+        del connection.make_cursor
+        del connection.make_debug_cursor
+
+
 class InvalidWriteError(Exception):
     """
     Raised to indicate that writing to a particular key
@@ -82,6 +134,37 @@ def _all_block_types(descriptors, aside_types):
     return block_types
 
 
+class _BlockStructureBlock(object):
+    """
+    Stands in for the descriptor of a block in a BlockStructure, with the
+    attributes FieldDataCache needs to prefetch the block's field data.
+    """
+    _block_classes = {}
+
+    def __init__(self, usage_key, block_class, has_score):
+        self.location = usage_key
+        self.scope_ids = ScopeIds(None, usage_key.block_type, usage_key, usage_key)
+        self.entry_point = block_class.entry_point
+        self.fields = block_class.fields
+        self.has_score = has_score
+
+    @classmethod
+    def block_class(cls, block_type):
+        """
+        Return the class, with the LMS's mixins, of blocks of the given type,
+        or None if the type isn't installed.
+        """
+        if block_type not in cls._block_classes:
+            try:
+                block_class = XBlock.load_class(block_type, select=settings.XBLOCK_SELECT_FUNCTION)
+            except PluginMissingError:
+                block_class = None
+            else:
+                block_class = Mixologist(settings.XBLOCK_MIXINS).mix(block_class)
+            cls._block_classes[block_type] = block_class
+        return cls._block_classes[block_type]
+
+
 class DjangoKeyValueStore(KeyValueStore):
     """
     This KeyValueStore will read and write data in the following scopes to django models
@@ -341,12 +424,59 @@ class DjangoOrmFieldCache(object):
         raise NotImplementedError()
 
 
+# The UserStateCaches with writes buffered by deferred_user_state_writes in
+# the current thread, or None outside of it.
+_DEFERRED_WRITES = threading.local()
+
+
+@contextmanager
+def deferred_user_state_writes(enabled=True):
+    """
+    Buffers the Scope.user_state writes made within the context, and saves
+    them when it exits.
+
+    XBlocks may save their state several times while handling a request, and
+    each save updates the StudentModule of the block.  Within this context,
+    the fields written to each block are merged, and each changed
+    StudentModule is saved once, so that it gets a single history entry
+    holding its final state.  Reads see the buffered values.
+
+    Arguments:
+        enabled (bool): Whether to buffer the writes.  If False, they are
+            saved immediately, as they are outside of the context.
+    """
+    if not enabled or getattr(_DEFERRED_WRITES, 'caches', None) is not None:
+        yield
+        return
+
+    _DEFERRED_WRITES.caches = []
+    try:
+        yield
+    finally:
+        try:
+            flush_deferred_user_state_writes()
+        finally:
+            _DEFERRED_WRITES.caches = None
+
+
+def flush_deferred_user_state_writes():
+    """
+    Saves the Scope.user_state writes buffered so far by
+    deferred_user_state_writes, e.g. before publishing a score, so that the
+    state is stored before the score as it would be without buffering.
+    """
+    caches = getattr(_DEFERRED_WRITES, 'caches', None) or []
+    while caches:
+        caches.pop(0).flush()
+
+
 class UserStateCache(object):
     """
     Cache for Scope.user_state xblock field data.
     """
     def __init__(self, user, course_id):
         self._cache = defaultdict(dict)
+        self._pending_updates = defaultdict(dict)
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
@@ -389,6 +519,7 @@ class UserStateCache(object):
 
         Returns: datetime if there was a modified date, or None otherwise
         """
+        self.flush()
         try:
             return self._client.get(
                 self.user.username,
@@ -413,6 +544,15 @@ class UserStateCache(object):
 
             pending_updates[cache_key][kvs_key.field_name] = value
 
+        deferred_caches = getattr(_DEFERRED_WRITES, 'caches', None)
+        if deferred_caches is not None:
+            if self not in deferred_caches:
+                deferred_caches.append(self)
+            for cache_key, state in pending_updates.items():
+                self._pending_updates[cache_key].update(state)
+            self._cache.update(pending_updates)
+            return
+
         try:
             self._client.set_many(
                 self.user.username,
@@ -424,6 +564,25 @@ class UserStateCache(object):
         finally:
             self._cache.update(pending_updates)
 
+    def flush(self):
+        """
+        Save the writes buffered by :func:`deferred_user_state_writes`,
+        with one update per changed block.
+        """
+        pending_updates = {cache_key: state for cache_key, state in self._pending_updates.items() if state}
+        self._pending_updates = defaultdict(dict)
+        if not pending_updates:
+            return
+
+        try:
+            self._client.set_many(
+                self.user.username,
+                pending_updates
+            )
+        except DatabaseError:
+            log.exception(u"Saving user state failed for %s", self.user.username)
+            raise KeyValueMultiSaveError([])
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
         """
@@ -462,6 +621,7 @@ class UserStateCache(object):
 
         self._client.delete(self.user.username, cache_key, fields=[kvs_key.field_name])
         del field_state[kvs_key.field_name]
+        self._pending_updates.get(cache_key, {}).pop(kvs_key.field_name, None)
 
     @contract(kvs_key=DjangoKeyValueStore.Key, returns=bool)
     def has(self, kvs_key):
@@ -722,6 +882,8 @@ class FieldDataCache(object):
             ),
         }
         self.scorable_locations = set()
+        # The number of SQL queries made to prefetch field data.
+        self.num_queries = 0
         self.add_descriptors_to_cache(descriptors)
 
     def add_descriptors_to_cache(self, descriptors):
@@ -730,11 +892,40 @@ class FieldDataCache(object):
         """
         if self.user.is_authenticated:
             self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
-            for scope, fields in self._fields_to_cache(descriptors).items():
-                if scope not in self.cache:
-                    continue
+            with _counting_queries(self._count_query):
+                for scope, fields in self._fields_to_cache(descriptors).items():
+                    if scope not in self.cache:
+                        continue
+
+                    self.cache[scope].cache_fields(fields, descriptors, self.asides)
 
-                self.cache[scope].cache_fields(fields, descriptors, self.asides)
+    def _count_query(self):
+        """
+        Counts a SQL query made to prefetch field data.
+        """
+        self.num_queries += 1
+
+    def add_block_structure_to_cache(self, block_structure, block_keys=None):
+        """
+        Add the blocks of `block_structure` to this FieldDataCache, in a
+        single pass of bulk queries, without loading their descriptors.
+
+        Arguments:
+            block_structure: A BlockStructure of the course, with the
+                `has_score` xBlock field collected.
+            block_keys: The usage keys of the blocks to add, or None to
+                add all the blocks in the block structure.
+        """
+        if block_keys is None:
+            block_keys = block_structure.get_block_keys()
+
+        blocks = []
+        for block_key in block_keys:
+            block_class = _BlockStructureBlock.block_class(block_key.block_type)
+            if block_class is not None:
+                has_score = block_structure.get_xblock_field(block_key, 'has_score', False)
+                blocks.append(_BlockStructureBlock(block_key, block_class, has_score))
+        self.add_descriptors_to_cache(blocks)
 
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
@@ -793,6 +984,20 @@ class FieldDataCache(object):
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
+    @classmethod
+    def cache_for_block_structure(cls, course_id, user, block_structure, block_keys=None,
+                                  asides=None, read_only=False):
+        """
+        course_id: the course in the context of which we want StudentModules.
+        user: the django user for whom to load modules.
+        block_structure: A BlockStructure of the course
+        block_keys: The usage keys of the blocks in block_structure to load field data for,
+            or None to load field data for all of them
+        """
+        cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
+        cache.add_block_structure_to_cache(block_structure, block_keys)
+        return cache
+
     def _fields_to_cache(self, descriptors):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -49,7 +49,12 @@ from courseware.masquerade import (
     is_masquerading_as_specific_student,
     setup_masquerade
 )
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    deferred_user_state_writes,
+    flush_deferred_user_state_writes
+)
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
@@ -62,6 +67,7 @@ from openedx.core.djangoapps.bookmarks.services import BookmarksService
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.util.user_utils import SystemUser
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
 from openedx.core.lib.api.authentication import OAuth2AuthenticationAllowInactiveUser
 from openedx.core.djangolib.markup import HTML
 from openedx.core.lib.api.view_utils import view_auth_classes
@@ -71,9 +77,7 @@ from openedx.core.lib.url_utils import quote_slashes, unquote_slashes
 from openedx.core.lib.xblock_utils import request_token as xblock_request_token
 from openedx.core.lib.xblock_utils import (
     add_staff_markup,
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls,
+    replace_urls,
     wrap_xblock,
     is_xblock_aside,
     get_aside_from_xblock,
@@ -85,7 +89,7 @@ from track import contexts
 from util import milestones_helpers
 from util.json_request import JsonResponse
 from web_fragments.fragment import Fragment
-from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
+from xmodule.util.sandboxing import can_execute_unsafe_code, get_python_lib_zip, get_safe_exec_cache
 from xblock_django.user_service import DjangoXBlockUserService
 from xmodule.contentstore.django import contentstore
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
@@ -111,6 +115,11 @@ XQUEUE_INTERFACE = XQueueInterface(
     REQUESTS_AUTH,
 )
 
+WAFFLE_SWITCHES = WaffleSwitchNamespace(name='courseware')
+
+# Coalesce the user state saves of an XBlock handler call into one update per block.
+COALESCE_HANDLER_STATE_WRITES = 'coalesce_handler_state_writes'
+
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
 # coupled enough that it's kind of tricky--you've been warned!
@@ -571,6 +580,8 @@ def get_module_system_for_user(
         """
         Submit a grade for the block.
         """
+        # Store the state saved so far before the score, as blocks expect.
+        flush_deferred_user_state_writes()
         grades_signals.SCORE_PUBLISHED.send(
             sender=None,
             block=block,
@@ -697,27 +708,21 @@ def get_module_system_for_user(
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
+    # Rewrite, in a single pass over the fragment:
+    # * urls beginning in /static to point to course-specific content
+    # * URLs of the form '/course/' to refer to the root of multicourse directory
     #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # * intra-courseware links (/jump_to_id/<id>). This format is an improvement over
+    #   the /course/... format for studio authored courses, because it is agnostic to
+    #   course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
+        getattr(descriptor, 'data_dir', None),
         course_id,
         reverse('jump_to_id', kwargs={'course_id': text_type(course_id), 'module_id': ''}),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     block_wrappers.append(partial(display_access_messages, user))
@@ -792,7 +797,7 @@ def get_module_system_for_user(
         publish=publish,
         anonymous_student_id=anonymous_student_id,
         course_id=course_id,
-        cache=cache,
+        cache=get_safe_exec_cache(cache),
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
         get_python_lib_zip=(lambda: get_python_lib_zip(contentstore, course_id)),
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
@@ -1171,7 +1176,8 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
                     handler_instance = get_aside_from_xblock(instance, usage_key.aside_type)
                 else:
                     handler_instance = instance
-                resp = handler_instance.handle(handler, req, suffix)
+                with deferred_user_state_writes(WAFFLE_SWITCHES.is_enabled(COALESCE_HANDLER_STATE_WRITES)):
+                    resp = handler_instance.handle(handler, req, suffix)
                 if suffix == 'problem_check' \
                         and course \
                         and getattr(course, 'entrance_exam_enabled', False) \
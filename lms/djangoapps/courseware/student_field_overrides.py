@@ -4,10 +4,14 @@ by the individual due dates feature.
 """
 import json
 
+from edx_django_utils.cache import RequestCache
+
 from courseware.models import StudentFieldOverride
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_override_index
+
+OVERRIDES_NAMESPACE = u'courseware.student_field_overrides'
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -54,19 +58,44 @@ def _get_overrides_for_user(user, block):
     else:
         location = block.location
 
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=location,
-        student_id=user.id,
-    )
+    course_overrides = _get_course_overrides_for_user(user, block.runtime.course_id)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, serialized_value in course_overrides.get(unicode(location), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(serialized_value))
     return overrides
 
 
+def _get_course_overrides_for_user(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the
+    course with one query, once per request.  Returns a dictionary of
+    serialized override values keyed by location and field name.
+    """
+    request_cache = RequestCache(OVERRIDES_NAMESPACE).data
+    cache_key = (user.id, unicode(course_id))
+    if cache_key not in request_cache:
+        course_overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        ).values_list('location', 'field', 'value')
+        for location, field_name, serialized_value in query:
+            course_overrides.setdefault(unicode(location), {})[field_name] = serialized_value
+        request_cache[cache_key] = course_overrides
+    return request_cache[cache_key]
+
+
+def _clear_overrides_for_user(user, block):
+    """
+    Clears the overrides of the user cached for the block and its course,
+    after one of them is changed.
+    """
+    getattr(block, '_student_overrides', {}).pop(user.id, None)
+    RequestCache(OVERRIDES_NAMESPACE).data.pop((user.id, unicode(block.runtime.course_id)), None)
+    clear_override_index()
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -81,6 +110,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_overrides_for_user(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -98,3 +128,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_overrides_for_user(user, block)
@@ -5,6 +5,8 @@ Tests for `field_overrides` module.
 import unittest
 
 from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
+from mock import Mock, patch
 from xblock.field_data import DictFieldData
 
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -14,6 +16,7 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_override_index,
     disable_overrides,
     resolve_dotted
 )
@@ -44,6 +47,25 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestInheritedOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` for testing, which overrides the due date of
+    the blocks located at 'parent', and records the blocks it's asked for.
+    """
+    overridable_fields = frozenset(['due'])
+    lookups = []
+
+    def get(self, block, name, default):
+        self.lookups.append(block.location)
+        if block.location == 'parent':
+            return 'overridden'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -146,6 +168,49 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.TestInheritedOverrideProvider',))
+class OverrideIndexTests(OverrideFieldBase):
+    """
+    Tests for the fields and the index of the overrides looked up by
+    `OverrideFieldData`.
+    """
+
+    def setUp(self):
+        super(OverrideIndexTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        TestInheritedOverrideProvider.lookups = []
+        RequestCache.clear_all_namespaces()
+
+    def tearDown(self):
+        super(OverrideIndexTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({'foo': 'bar'}))
+
+    def test_overridable_fields(self):
+        data = self.make_one()
+        self.assertEqual(data.get('block', 'foo'), 'bar')
+        self.assertEqual(TestInheritedOverrideProvider.lookups, [])
+
+    def test_inherited_overrides_indexed(self):
+        parent = Mock(location='parent', get_parent=Mock(return_value=None))
+        children = [Mock(location='child', get_parent=Mock(return_value=parent)) for _ in range(3)]
+        for child in children:
+            data = self.make_one()
+            self.assertFalse(data.has(child, 'due'))
+            self.assertEqual(data.default(child, 'due'), 'overridden')
+        self.assertEqual(TestInheritedOverrideProvider.lookups, ['child', 'parent', 'child', 'child'])
+
+        clear_override_index()
+        self.assertEqual(self.make_one().default(children[0], 'due'), 'overridden')
+        self.assertEqual(TestInheritedOverrideProvider.lookups[-1], 'parent')
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
@@ -4,14 +4,21 @@ Test for lms courseware app, module data (runtime data storage for XBlocks)
 import json
 from functools import partial
 
-from django.db import DatabaseError
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from mock import Mock, patch
 from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError,
+    deferred_user_state_writes,
+    flush_deferred_user_state_writes
+)
 from courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -19,6 +26,7 @@ from courseware.models import (
     XModuleUserStateSummaryField
 )
 from courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from courseware.tests.factories import (
     StudentInfoFactory,
     StudentPrefsFactory,
@@ -27,6 +35,8 @@ from courseware.tests.factories import (
     location
 )
 from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 
 def mock_field(scope, name):
@@ -230,6 +240,38 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
                 self.kvs.set_many(kv_dict)
         self.assertEquals(exception_context.exception.saved_field_names, [])
 
+    def test_deferred_writes(self):
+        "Test that writes to a block within deferred_user_state_writes are saved once"
+        with self.assertNumQueries(4, using='default'):
+            with self.assertNumQueries(1, using='student_module_history'):
+                with deferred_user_state_writes():
+                    self.kvs.set(user_state_key('a_field'), 'new_value')
+                    self.kvs.set_many(self.construct_kv_dict())
+                    self.kvs.set(user_state_key('field_a'), 'newest value')
+                    # Reads see the buffered values.
+                    self.assertEquals(self.kvs.get(user_state_key('a_field')), 'new_value')
+
+        self.assertEquals(
+            {'a_field': 'new_value', 'b_field': 'b_value', 'field_a': 'newest value', 'field_b': 'newer value'},
+            json.loads(StudentModule.objects.get().state)
+        )
+
+    def test_flush_deferred_writes(self):
+        "Test that deferred writes are saved when flushed, and not saved again"
+        with deferred_user_state_writes():
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+            self.assertEquals('a_value', json.loads(StudentModule.objects.get().state)['a_field'])
+            flush_deferred_user_state_writes()
+            self.assertEquals('new_value', json.loads(StudentModule.objects.get().state)['a_field'])
+            with self.assertNumQueries(0):
+                flush_deferred_user_state_writes()
+
+    def test_deferred_writes_disabled(self):
+        "Test that writes are saved immediately if deferred_user_state_writes is disabled"
+        with deferred_user_state_writes(enabled=False):
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+            self.assertEquals('new_value', json.loads(StudentModule.objects.get().state)['a_field'])
+
 
 class TestMissingStudentModule(TestCase):
     # Tell Django to clean out all databases, not just default
@@ -427,3 +469,58 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestFieldDataCacheForBlockStructure(ModuleStoreTestCase):
+    """Tests for prefetching field data from a BlockStructure"""
+    def setUp(self):
+        super(TestFieldDataCacheForBlockStructure, self).setUp()
+        self.user = UserFactory.create()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.problems_by_sequence = {}
+        for num_problems in (1, 5):
+            sequence = ItemFactory.create(parent=chapter, category='sequential')
+            vertical = ItemFactory.create(parent=sequence, category='vertical')
+            problems = [ItemFactory.create(parent=vertical, category='problem') for _ in range(num_problems)]
+            for problem in problems:
+                cmfStudentModuleFactory.create(
+                    student=self.user,
+                    course_id=self.course.id,
+                    module_state_key=problem.location,
+                    state=json.dumps({'seed': num_problems}),
+                )
+            self.problems_by_sequence[sequence.location] = problems
+
+    def test_constant_queries_per_sequence(self):
+        block_structure = get_block_structure_manager(self.course.id).get_collected()
+
+        num_queries = set()
+        for sequence_key, problems in self.problems_by_sequence.items():
+            field_data_cache = FieldDataCache.cache_for_block_structure(
+                self.course.id,
+                self.user,
+                block_structure,
+                block_structure.topological_traversal(start_node=sequence_key),
+            )
+            num_queries.add(field_data_cache.num_queries)
+
+            for problem in problems:
+                self.assertIn(problem.location, field_data_cache.scorable_locations)
+                seed_key = DjangoKeyValueStore.Key(Scope.user_state, self.user.id, problem.location, 'seed')
+                self.assertEqual(field_data_cache.get(seed_key), len(problems))
+
+        self.assertEqual(len(num_queries), 1)
+
+    def test_num_queries(self):
+        block_structure = get_block_structure_manager(self.course.id).get_collected()
+        sequence_key = next(iter(self.problems_by_sequence))
+        with CaptureQueriesContext(connection) as queries:
+            field_data_cache = FieldDataCache.cache_for_block_structure(
+                self.course.id,
+                self.user,
+                block_structure,
+                block_structure.topological_traversal(start_node=sequence_key),
+            )
+        self.assertGreater(field_data_cache.num_queries, 0)
+        self.assertEqual(field_data_cache.num_queries, len(queries))
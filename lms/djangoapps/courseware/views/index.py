@@ -19,7 +19,7 @@ from django.utils.translation import ugettext as _
 from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.generic import View
-from edx_django_utils.monitoring import set_custom_metrics_for_course_key
+from edx_django_utils.monitoring import set_custom_metric, set_custom_metrics_for_course_key
 from opaque_keys.edx.keys import CourseKey
 from web_fragments.fragment import Fragment
 
@@ -30,6 +30,7 @@ from lms.djangoapps.courseware.exceptions import CourseAccessRedirect
 from lms.djangoapps.experiments.utils import get_experiment_user_metadata_context
 from lms.djangoapps.gating.api import get_entrance_exam_score_ratio, get_entrance_exam_usage_key
 from lms.djangoapps.grades.api import CourseGradeFactory
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
 from openedx.core.djangoapps.user_api.preferences.api import get_user_preference
@@ -68,6 +69,11 @@ log = logging.getLogger("edx.courseware.views.index")
 TEMPLATE_IMPORTS = {'urllib': urllib}
 CONTENT_DEPTH = 2
 
+# Waffle switch to prefetch the field data of the course outline and the
+# requested section in a single pass, using the course's block structure.
+WAFFLE_SWITCHES = WaffleSwitchNamespace(name='courseware')
+PREFETCH_FROM_BLOCK_STRUCTURE = 'prefetch_from_block_structure'
+
 
 class CoursewareIndex(View):
     """
@@ -114,6 +120,7 @@ class CoursewareIndex(View):
         self.chapter, self.section = None, None
         self.course = None
         self.url = request.path
+        self.prefetched_block_keys = set()
 
         try:
             set_custom_metrics_for_course_key(self.course_key)
@@ -347,13 +354,24 @@ class CoursewareIndex(View):
         Prefetches all descendant data for the requested section and
         sets up the runtime, which binds the request user to the section.
         """
-        self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            self.course_key,
-            self.effective_user,
-            self.course,
-            depth=CONTENT_DEPTH,
-            read_only=CrawlersConfig.is_crawler(request),
-        )
+        if WAFFLE_SWITCHES.is_enabled(PREFETCH_FROM_BLOCK_STRUCTURE):
+            block_structure = get_block_structure_manager(self.course_key).get_collected()
+            self.prefetched_block_keys = self._block_keys_to_prefetch(block_structure)
+            self.field_data_cache = FieldDataCache.cache_for_block_structure(
+                self.course_key,
+                self.effective_user,
+                block_structure,
+                self.prefetched_block_keys,
+                read_only=CrawlersConfig.is_crawler(request),
+            )
+        else:
+            self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                self.course_key,
+                self.effective_user,
+                self.course,
+                depth=CONTENT_DEPTH,
+                read_only=CrawlersConfig.is_crawler(request),
+            )
 
         self.course = get_module_for_descriptor(
             self.effective_user,
@@ -369,9 +387,14 @@ class CoursewareIndex(View):
         Prefetches all descendant data for the requested section and
         sets up the runtime, which binds the request user to the section.
         """
-        # Pre-fetch all descendant data
+        # Pre-fetch all descendant data that wasn't prefetched with the course
         self.section = modulestore().get_item(self.section.location, depth=None, lazy=False)
-        self.field_data_cache.add_descriptor_descendents(self.section, depth=None)
+        self.field_data_cache.add_descriptor_descendents(
+            self.section,
+            depth=None,
+            descriptor_filter=lambda descriptor: descriptor.location not in self.prefetched_block_keys,
+        )
+        set_custom_metric('field_data_cache_num_queries', self.field_data_cache.num_queries)
 
         # Bind section to user
         self.section = get_module_for_descriptor(
@@ -384,6 +407,23 @@ class CoursewareIndex(View):
             course=self.course,
         )
 
+    def _block_keys_to_prefetch(self, block_structure):
+        """
+        Returns the usage keys of the blocks in the block structure down to
+        CONTENT_DEPTH, and of all the blocks in the requested section.
+        """
+        block_keys = {block_structure.root_block_usage_key}
+        level = [block_structure.root_block_usage_key]
+        for _ in range(CONTENT_DEPTH):
+            level = [child for block_key in level for child in block_structure.get_children(block_key)]
+            block_keys.update(level)
+
+        if self.section_url_name:
+            section_key = self.course_key.make_usage_key('sequential', self.section_url_name)
+            if section_key in block_structure:
+                block_keys.update(block_structure.topological_traversal(start_node=section_key))
+        return block_keys
+
     def _save_positions(self):
         """
         Save where we are in the course and chapter.
@@ -6,8 +6,10 @@ import json
 import ddt
 import mock
 
+from django.core.cache.backends.locmem import LocMemCache
 from django.urls import reverse
 from django.test import RequestFactory, TestCase
+from django.utils import translation
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 from pytz import UTC
@@ -26,7 +28,17 @@ from lms.djangoapps.teams.tests.factories import CourseTeamFactory
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
-from openedx.core.djangoapps.django_comment_common.comment_client.utils import CommentClientMaintenanceError, perform_request
+from openedx.core.djangoapps.django_comment_common.comment_client import cache as cc_cache
+from openedx.core.djangoapps.django_comment_common.comment_client import utils as cc_utils
+from openedx.core.djangoapps.django_comment_common.comment_client.comment import Comment
+from openedx.core.djangoapps.django_comment_common.comment_client.thread import Thread
+from openedx.core.djangoapps.django_comment_common.comment_client.user import User as CommentClientUser
+from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
+    CommentClientMaintenanceError,
+    CommentClientRequestError,
+    perform_concurrently,
+    perform_request
+)
 from openedx.core.djangoapps.django_comment_common.models import (
     CourseDiscussionSettings,
     ForumsConfig,
@@ -1815,6 +1827,7 @@ class GroupModeratorPermissionsTestCase(ModuleStoreTestCase):
         })
 
 
+@ddt.ddt
 class ClientConfigurationTestCase(TestCase):
     """Simple test cases to ensure enabling/disabling the use of the comment service works as intended."""
 
@@ -1843,6 +1856,145 @@ class ClientConfigurationTestCase(TestCase):
         result = perform_request('GET', 'http://www.google.com')
         self.assertEqual(result, {})
 
+    @patch('requests.Session.request')
+    def test_connection_pool(self, mock_request):
+        """Ensures that requests are sent through a persistent session when the pool is enabled."""
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {}
+        mock_request.return_value = response
+
+        with patch.object(cc_utils, 'POOL_SIZE', 2), patch.object(cc_utils, '_SESSION', None):
+            perform_request('GET', 'http://www.google.com', metric_action='model.retrieve')
+            session = cc_utils._get_session()  # pylint: disable=protected-access
+            perform_request('GET', 'http://www.google.com', metric_action='model.retrieve')
+            self.assertIs(cc_utils._get_session(), session)  # pylint: disable=protected-access
+
+        self.assertEqual(mock_request.call_count, 2)
+        request_times = RequestCache(cc_utils.REQUEST_TIMES_NAMESPACE).data
+        self.assertEqual(request_times['model.retrieve'][0], 2)
+
+    @ddt.data(0, 2)
+    def test_perform_concurrently(self, concurrent_requests):
+        """Ensures that the results of the functions are returned in order, in the language of the request."""
+        with patch.object(cc_utils, 'CONCURRENT_REQUESTS', concurrent_requests), \
+                patch.object(cc_utils, '_THREAD_POOL', None), translation.override('eo'):
+            results = perform_concurrently(lambda: 1, translation.get_language, lambda: 3)
+        self.assertEqual(results, [1, 'eo', 3])
+
+    @ddt.data(0, 2)
+    def test_perform_concurrently_error(self, concurrent_requests):
+        """Ensures that the exception of the first failing function is raised."""
+        def _fail(message):
+            raise CommentClientRequestError(message)
+
+        with patch.object(cc_utils, 'CONCURRENT_REQUESTS', concurrent_requests), \
+                patch.object(cc_utils, '_THREAD_POOL', None):
+            with self.assertRaisesRegexp(CommentClientRequestError, 'first'):
+                perform_concurrently(lambda: 1, lambda: _fail('first'), lambda: _fail('second'))
+
+
+@ddt.ddt
+class ThreadCacheTestCase(TestCase):
+    """Tests caching the thread listings and details of the comments service."""
+
+    def setUp(self):
+        super(ThreadCacheTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        for patcher in [
+                patch.object(cc_cache, 'CACHE_TIMEOUT', 60),
+                patch.object(cc_cache, 'django_cache', LocMemCache('comment_client_cache_tests', {})),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        request_patcher = patch('requests.request')
+        self.mock_request = request_patcher.start()
+        self.addCleanup(request_patcher.stop)
+        self.mock_request.return_value = Mock(
+            status_code=200,
+            json=lambda: {'collection': [], 'page': 1, 'num_pages': 1, 'course_id': 'course-v1:x+y+z'},
+        )
+        self.thread = Thread(id='test_thread', course_id='course-v1:x+y+z', context='course')
+
+    def _search(self, user_id):
+        return Thread.search({'course_id': 'course-v1:x+y+z', 'user_id': user_id})
+
+    def _retrieve(self, user_id, mark_as_read=False):
+        return Thread(id='test_thread').retrieve(user_id=user_id, mark_as_read=mark_as_read)
+
+    def test_disabled(self):
+        with patch.object(cc_cache, 'CACHE_TIMEOUT', 0):
+            self._search('1')
+            self._search('1')
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    def test_listing_cached_per_user(self):
+        self._search('1')
+        self._search('1')
+        self._search('2')
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    @ddt.data(
+        lambda thread: thread.save(),
+        lambda thread: thread.delete(),
+        lambda thread: thread.pin(Mock(id=1), thread.id),
+        lambda thread: thread.un_pin(Mock(id=1), thread.id),
+        lambda thread: thread.flagAbuse(Mock(id=1), thread),
+        lambda thread: thread.unFlagAbuse(Mock(id=1), thread, removeAll=False),
+        lambda thread: CommentClientUser(id='1').vote(thread, 'up'),
+        lambda thread: CommentClientUser(id='1').unvote(thread),
+        lambda thread: Comment(thread_id=thread.id, course_id=thread.course_id, body='body').save(),
+    )
+    def test_write_invalidates(self, write):
+        self._search('1')
+        self._retrieve('1')
+        write(self.thread)
+        self._search('1')
+        self._retrieve('1')
+        self.assertEqual(self.mock_request.call_count, 5)
+
+    def test_failed_write_keeps_cache(self):
+        self._search('1')
+        self.mock_request.return_value = Mock(status_code=400, text='error')
+        with self.assertRaises(CommentClientRequestError):
+            CommentClientUser(id='1').vote(self.thread, 'up')
+        self._search('1')
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    def test_follow_invalidates_follower(self):
+        self._search('1')
+        self._search('2')
+        CommentClientUser(id='1').follow(self.thread)
+        self._search('1')
+        self._search('2')
+        self.assertEqual(self.mock_request.call_count, 4)
+
+    def test_read_invalidates_reader(self):
+        self._search('1')
+        self._search('2')
+        self._retrieve('1')
+        CommentClientUser(id='1').read(self.thread)
+        self._search('1')
+        self._search('2')
+        self._retrieve('1')
+        self.assertEqual(self.mock_request.call_count, 6)
+
+    def test_mark_as_read_invalidates_reader(self):
+        self._search('1')
+        self._retrieve('1')
+        self._retrieve('1', mark_as_read=True)
+        self._search('1')
+        self._retrieve('1')
+        self.assertEqual(self.mock_request.call_count, 5)
+
 
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
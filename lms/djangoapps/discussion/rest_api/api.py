@@ -4,6 +4,7 @@ Discussion API internal interface
 import itertools
 from collections import defaultdict
 from enum import Enum
+from functools import partial
 from urllib import urlencode
 from urlparse import urlunparse
 
@@ -38,7 +39,11 @@ from lms.djangoapps.courseware.exceptions import CourseAccessRedirect
 from lms.djangoapps.discussion.rest_api.pagination import DiscussionAPIPagination
 from openedx.core.djangoapps.django_comment_common.comment_client.comment import Comment
 from openedx.core.djangoapps.django_comment_common.comment_client.thread import Thread
-from openedx.core.djangoapps.django_comment_common.comment_client.utils import CommentClientRequestError
+from openedx.core.djangoapps.django_comment_common.comment_client.user import User as CommentClientUser
+from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
+    CommentClientRequestError,
+    perform_concurrently,
+)
 from openedx.core.djangoapps.django_comment_common.signals import (
     comment_created,
     comment_deleted,
@@ -108,10 +113,14 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
             retrieve_kwargs["with_responses"] = False
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        # The thread and the requester don't depend on each other.
+        cc_thread, cc_requester = perform_concurrently(
+            partial(Thread(id=thread_id).retrieve, **retrieve_kwargs),
+            CommentClientUser.from_django_user(request.user).retrieve,
+        )
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester=cc_requester)
         course_discussion_settings = get_course_discussion_settings(course_key)
         if (
                 not context["is_requester_privileged"] and
@@ -780,14 +789,14 @@ def _handle_abuse_flagged_field(form_value, user, cc_content):
 
 def _handle_voted_field(form_value, cc_content, api_content, request, context):
     """vote or undo vote on thread/comment"""
-    signal = thread_voted if cc_content.type == 'thread' else comment_voted
-    signal.send(sender=None, user=context["request"].user, post=cc_content)
     if form_value:
         context["cc_requester"].vote(cc_content, "up")
         api_content["vote_count"] += 1
     else:
         context["cc_requester"].unvote(cc_content)
         api_content["vote_count"] -= 1
+    signal = thread_voted if cc_content.type == 'thread' else comment_voted
+    signal.send(sender=None, user=context["request"].user, post=cc_content)
     track_voted_event(
         request, context["course"], cc_content, vote_value="up", undo_vote=False if form_value else True
     )
@@ -34,10 +34,13 @@ from lms.djangoapps.discussion.django_comment_client.utils import (
 from student.models import get_user_by_username_or_email
 
 
-def get_context(course, request, thread=None):
+def get_context(course, request, thread=None, cc_requester=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
+
+    cc_requester is the retrieved comments service user of the requester,
+    which is retrieved here if it isn't provided.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -54,7 +57,8 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+    if cc_requester is None:
+        cc_requester = CommentClientUser.from_django_user(requester).retrieve()
     cc_requester["course_id"] = course.id
     course_discussion_settings = get_course_discussion_settings(course.id)
     return {
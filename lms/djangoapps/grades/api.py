@@ -5,6 +5,7 @@ Python APIs exposed by the grades app to other in-process apps.
 
 # Public Grades Factories
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.course_grade_matrix import CourseGradeMatrix
 from lms.djangoapps.grades.subsection_grade_factory import SubsectionGradeFactory
 
 # Public Grades Functions
@@ -0,0 +1,166 @@
+"""
+CourseGradeMatrix Class
+
+Computes the grades of a batch of users in a course at once, from their
+persisted grades, using array operations over a (users x subsections)
+matrix instead of building CourseGrade and SubsectionGrade objects for
+each user.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .config import assume_zero_if_absent, should_persist_grades
+from .models import PersistentCourseGrade, PersistentSubsectionGrade
+from .subsection_grade import NonZeroSubsectionGrade
+
+
+# The course-level grade values of a user, as read from the persisted
+# course grade.
+CourseGradeSummary = namedtuple('CourseGradeSummary', ['percent', 'letter_grade', 'passed'])
+
+_ZERO_COURSE_GRADE = CourseGradeSummary(percent=0.0, letter_grade=None, passed=False)
+
+
+class CourseGradeMatrix(object):
+    """
+    Grades of a batch of users for the given subsections of a course.
+
+    The values match what CourseGradeFactory().read returns for each user.
+    Users whose grades can't be derived from persisted data alone (for
+    example, when a subsection grade was never persisted and needs to be
+    computed from the user's scores) are excluded, and is_graded returns
+    False for them so the caller can fall back to the per-user path.
+
+    As with CourseGrade.subsection_grade, a user is assumed to have access
+    to every subsection they have a persisted grade for.
+    """
+    def __init__(self, course_key, users, subsection_keys, course_structure):
+        self.course_key = course_key
+        self.users = list(users)
+        self.subsection_keys = list(subsection_keys)
+
+        self._user_index = {user.id: index for index, user in enumerate(self.users)}
+        self._subsection_index = {key: index for index, key in enumerate(self.subsection_keys)}
+        self._course_grades = [_ZERO_COURSE_GRADE] * len(self.users)
+
+        shape = (len(self.users), len(self.subsection_keys))
+        self._earned_graded = np.zeros(shape)
+        self._possible_graded = np.zeros(shape)
+        self._attempted_graded = np.zeros(shape, dtype=bool)
+        self._attempted = np.zeros(len(self.users), dtype=bool)
+        self._is_graded = np.zeros(len(self.users), dtype=bool)
+
+        if should_persist_grades(course_key):
+            self._read_persisted_grades(course_structure)
+
+        self.percent_graded = np.around(
+            np.divide(
+                self._earned_graded,
+                self._possible_graded,
+                out=np.zeros(shape),
+                where=self._possible_graded > 0,
+            ),
+            decimals=2,
+        )
+
+    def is_graded(self, user):
+        """
+        Returns whether the given user's grades were computed by this matrix.
+        """
+        return bool(self._is_graded[self._user_index[user.id]])
+
+    def course_grade(self, user):
+        """
+        Returns the CourseGradeSummary of the given user.
+        """
+        return self._course_grades[self._user_index[user.id]]
+
+    def subsection_grades(self, user, subsection_keys):
+        """
+        Returns a list of (attempted_graded, percent_graded) tuples for the
+        given user and subsections.
+        """
+        user_index = self._user_index[user.id]
+        columns = [self._subsection_index[key] for key in subsection_keys]
+        return zip(
+            self._attempted_graded[user_index, columns].tolist(),
+            self.percent_graded[user_index, columns].tolist(),
+        )
+
+    def assignment_averages(self, subsection_keys, grader):
+        """
+        Returns an array of each user's average for the given subsections,
+        as computed by grader.total_with_drops, or 0.0 for users who
+        haven't attempted the course.
+        """
+        columns = [self._subsection_index[key] for key in subsection_keys]
+        averages = total_with_drops(grader, self.percent_graded[:, columns])
+        averages[~self._attempted] = 0.0
+        return averages
+
+    def _read_persisted_grades(self, course_structure):
+        """
+        Fills the matrix from the persisted course and subsection grades,
+        which are read from the prefetched data when available.
+        """
+        assume_zero = assume_zero_if_absent(self.course_key)
+        for user_index, user in enumerate(self.users):
+            try:
+                course_grade = PersistentCourseGrade.read(user.id, self.course_key)
+            except PersistentCourseGrade.DoesNotExist:
+                # Without a persisted grade, the user either has a zero
+                # grade or needs to be graded from scratch.
+                self._is_graded[user_index] = assume_zero
+                continue
+
+            self._course_grades[user_index] = CourseGradeSummary(
+                percent=course_grade.percent_grade,
+                letter_grade=course_grade.letter_grade or None,
+                passed=course_grade.letter_grade != u'',
+            )
+
+            found_subsections = np.zeros(len(self.subsection_keys), dtype=bool)
+            for grade_model in PersistentSubsectionGrade.bulk_read_grades(user.id, self.course_key):
+                usage_key = grade_model.full_usage_key
+                if grade_model.first_attempted is not None and usage_key in course_structure:
+                    self._attempted[user_index] = True
+
+                subsection_index = self._subsection_index.get(usage_key)
+                if subsection_index is not None:
+                    # pylint: disable=protected-access
+                    graded_total = NonZeroSubsectionGrade._aggregated_score_from_model(grade_model, is_graded=True)
+                    self._earned_graded[user_index, subsection_index] = graded_total.earned
+                    self._possible_graded[user_index, subsection_index] = graded_total.possible
+                    self._attempted_graded[user_index, subsection_index] = graded_total.first_attempted is not None
+                    found_subsections[subsection_index] = True
+
+            if assume_zero:
+                self._attempted[user_index] = True
+                self._is_graded[user_index] = True
+            else:
+                self._is_graded[user_index] = found_subsections.all() and self._attempted[user_index]
+
+
+def total_with_drops(grader, percents):
+    """
+    Returns an array with the result of grader.total_with_drops for each
+    row of the given (users x subsections) array of percentages.
+
+    The kept percentages are summed column by column, in subsection order,
+    so the results are identical to the per-user computation.
+    """
+    num_rows, num_columns = percents.shape
+    kept = np.ones(percents.shape, dtype=bool)
+    if grader.drop_count > 0:
+        # A stable sort breaks ties in subsection order, as sorted() does.
+        ranking = np.argsort(-percents, axis=1, kind='stable')
+        kept[np.arange(num_rows)[:, np.newaxis], ranking[:, -grader.drop_count:]] = False
+
+    totals = np.zeros(num_rows)
+    for column in xrange(num_columns):
+        totals += np.where(kept[:, column], percents[:, column], 0.0)
+
+    if num_columns - grader.drop_count > 0:
+        totals /= num_columns - grader.drop_count
+    return totals
@@ -0,0 +1,130 @@
+"""
+Tests for the CourseGradeMatrix class.
+"""
+import itertools
+from unittest import TestCase
+
+import ddt
+import numpy as np
+from django.conf import settings
+from mock import patch
+
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory
+from xmodule.graders import AssignmentFormatGrader
+
+from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
+from ..course_grade import CourseGrade
+from ..course_grade_factory import CourseGradeFactory
+from ..course_grade_matrix import CourseGradeMatrix, total_with_drops
+from ..models_api import prefetch_course_and_subsection_grades
+from .base import GradeTestBase
+from .utils import mock_get_score
+
+
+@ddt.ddt
+class TestCourseGradeMatrix(GradeTestBase):
+    """
+    Tests that the grades computed by the CourseGradeMatrix match the
+    grades read by the CourseGradeFactory.
+    """
+    def setUp(self):
+        super(TestCourseGradeMatrix, self).setUp()
+        self.users = [self.request.user]
+        for _ in range(2):
+            user = UserFactory.create()
+            CourseEnrollment.enroll(user, self.course.id)
+            self.users.append(user)
+        self.subsection_keys = [self.sequence.location, self.sequence2.location]
+        self.grader = CourseGrade.get_subsection_type_graders(self.course)['Homework']
+
+    def _create_matrix(self, users):
+        """
+        Returns a CourseGradeMatrix for the given users and the course's
+        graded subsections.
+        """
+        prefetch_course_and_subsection_grades(self.course.id, users)
+        return CourseGradeMatrix(self.course.id, users, self.subsection_keys, get_course_in_cache(self.course.id))
+
+    def _assert_matches_course_grade_factory(self, grade_matrix, users):
+        """
+        Asserts the grades of the given users in the matrix match those
+        read by the CourseGradeFactory.
+        """
+        averages = grade_matrix.assignment_averages(self.subsection_keys, self.grader)
+        for user_index, user in enumerate(users):
+            self.assertTrue(grade_matrix.is_graded(user))
+            course_grade = CourseGradeFactory().read(user, self.course)
+            self.assertEqual(grade_matrix.course_grade(user).percent, course_grade.percent)
+            self.assertEqual(grade_matrix.course_grade(user).letter_grade, course_grade.letter_grade)
+
+            subsection_grades = [course_grade.subsection_grade(key) for key in self.subsection_keys]
+            self.assertEqual(
+                grade_matrix.subsection_grades(user, self.subsection_keys),
+                [(grade.attempted_graded, grade.percent_graded) for grade in subsection_grades],
+            )
+            if course_grade.attempted:
+                expected_average, _ = self.grader.total_with_drops(
+                    [{'percent': grade.percent_graded} for grade in subsection_grades]
+                )
+            else:
+                expected_average = 0.0
+            self.assertEqual(averages[user_index], expected_average)
+
+    @ddt.data((1, 2), (1, 3), (2, 2), (0, 2))
+    @ddt.unpack
+    def test_persisted_grades(self, earned, possible):
+        for user in self.users:
+            with mock_get_score(earned, possible):
+                CourseGradeFactory().update(user, self.course, force_update_subsections=True)
+        self._assert_matches_course_grade_factory(self._create_matrix(self.users), self.users)
+
+    @patch.dict(settings.FEATURES, {'ASSUME_ZERO_GRADE_IF_ABSENT_FOR_ALL_TESTS': False})
+    def test_partially_persisted_grades(self):
+        with mock_get_score(1, 2):
+            self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
+        CourseGradeFactory().update(self.request.user, self.course)
+
+        with waffle().override(ASSUME_ZERO_GRADE_IF_ABSENT, active=True):
+            grade_matrix = self._create_matrix([self.request.user])
+            self._assert_matches_course_grade_factory(grade_matrix, [self.request.user])
+
+        with waffle().override(ASSUME_ZERO_GRADE_IF_ABSENT, active=False):
+            grade_matrix = self._create_matrix([self.request.user])
+            self.assertFalse(grade_matrix.is_graded(self.request.user))
+
+    @patch.dict(settings.FEATURES, {'ASSUME_ZERO_GRADE_IF_ABSENT_FOR_ALL_TESTS': False})
+    @ddt.data(True, False)
+    def test_ungraded_users(self, assume_zero_enabled):
+        with waffle().override(ASSUME_ZERO_GRADE_IF_ABSENT, active=assume_zero_enabled):
+            grade_matrix = self._create_matrix(self.users)
+            for user in self.users:
+                self.assertEqual(grade_matrix.is_graded(user), assume_zero_enabled)
+            if assume_zero_enabled:
+                self._assert_matches_course_grade_factory(grade_matrix, self.users)
+
+    @patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+    def test_grades_not_persisted(self):
+        grade_matrix = self._create_matrix(self.users)
+        for user in self.users:
+            self.assertFalse(grade_matrix.is_graded(user))
+
+
+@ddt.ddt
+class TestTotalWithDrops(TestCase):
+    """
+    Tests that total_with_drops matches AssignmentFormatGrader.total_with_drops.
+    """
+    @ddt.data(*itertools.product((0, 1, 2, 5), (0, 1, 3, 4)))
+    @ddt.unpack
+    def test_total_with_drops(self, drop_count, num_subsections):
+        grader = AssignmentFormatGrader('Homework', min_count=num_subsections, drop_count=drop_count)
+        random_state = np.random.RandomState(seed=drop_count * 10 + num_subsections)
+        # Include repeated percentages to exercise the tie-breaking order.
+        percents = np.around(random_state.choice([0.0, 0.1, 0.33, 0.5, 1.0], size=(20, num_subsections)), 2)
+
+        totals = total_with_drops(grader, percents)
+        for row, total in zip(percents.tolist(), totals.tolist()):
+            expected_total, _ = grader.total_with_drops([{'percent': percent} for percent in row])
+            self.assertEqual(total, expected_total)
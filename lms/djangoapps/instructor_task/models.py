@@ -18,12 +18,13 @@ import hashlib
 import json
 import logging
 import os.path
+from tempfile import SpooledTemporaryFile
 from uuid import uuid4
 
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
@@ -36,6 +37,10 @@ logger = logging.getLogger(__name__)
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 
+# Size in bytes above which CSV reports are spooled to a temporary file on
+# disk, rather than kept in memory, until they are stored.
+REPORT_SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
 
 class InstructorTask(models.Model):
     """
@@ -185,9 +190,8 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Rows are streamed into the stored file, so callers can pass a
+    generator rather than the whole dataset.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -221,8 +225,8 @@ class ReportStore(object):
 
     def _get_utf8_encoded_rows(self, rows):
         """
-        Given a list of `rows` containing unicode strings, return a
-        new list of rows with those strings encoded as utf-8 for CSV
+        Given an iterable of `rows` containing unicode strings, yield
+        the rows with those strings encoded as utf-8 for CSV
         compatibility.
         """
         for row in rows:
@@ -271,14 +275,19 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` can be any iterable, including a generator.  Rows are
+        consumed one at a time and written to a temporary file that is
+        spooled to disk once it exceeds REPORT_SPOOL_MAX_SIZE, so the
+        memory used doesn't grow with the size of the report.
         """
-        output_buffer = ContentFile('')
-        # Adding unicode signature (BOM) for MS Excel 2013 compatibility
-        output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        with SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as output_file:
+            # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+            output_file.write(codecs.BOM_UTF8)
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file))
 
     def links_for(self, course_id):
         """
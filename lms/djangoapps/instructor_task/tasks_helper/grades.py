@@ -1,8 +1,13 @@
 """
 Functionality for generating grade reports.
 """
+import csv
 import logging
+import multiprocessing
+import os
 import re
+import shutil
+import tempfile
 from collections import defaultdict, OrderedDict
 from datetime import datetime
 from itertools import chain, izip, izip_longest
@@ -10,6 +15,8 @@ from time import time
 
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -23,6 +30,7 @@ from instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCertificate, certificate_info_for_user
 from lms.djangoapps.grades.api import (
     CourseGradeFactory,
+    CourseGradeMatrix,
     context as grades_context,
     prefetch_course_and_subsection_grades,
 )
@@ -44,6 +52,7 @@ from .utils import upload_csv_to_report_store
 WAFFLE_NAMESPACE = 'instructor_task'
 WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE)
 OPTIMIZE_GET_LEARNERS_FOR_COURSE = 'optimize_get_learners_for_course'
+VECTORIZED_GRADE_REPORT = 'vectorized_grade_report'
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -98,6 +107,14 @@ class _CourseGradeReportContext(object):
     def course_structure(self):
         return get_course_in_cache(self.course_id)
 
+    @lazy
+    def vectorized_grades(self):
+        """
+        Returns whether the grades of each batch of users are computed at
+        once by a CourseGradeMatrix.
+        """
+        return WAFFLE_SWITCHES.is_enabled(VECTORIZED_GRADE_REPORT)
+
     @lazy
     def course_experiments(self):
         return get_split_user_partitions(self.course.user_partitions)
@@ -202,6 +219,9 @@ class CourseGradeReport(object):
     # Batch size for chunking the list of enrollees in the course.
     USER_BATCH_SIZE = 100
 
+    # Number of enrollees in each shard of a report compiled in parallel.
+    USER_SHARD_SIZE = 1000
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
@@ -216,18 +236,93 @@ class CourseGradeReport(object):
         Internal method for generating a grade report for the given context.
         """
         context.update_status(u'Starting grades')
+        # Read the switches this report checks with a single query.
+        WAFFLE_SWITCHES.prefetch(OPTIMIZE_GET_LEARNERS_FOR_COURSE, VECTORIZED_GRADE_REPORT)
         success_headers = self._success_headers(context)
         error_headers = self._error_headers()
-        batched_rows = self._batched_rows(context)
+        if settings.GRADE_REPORT_PROCESS_POOL_SIZE > 1:
+            return self._generate_in_parallel(context, success_headers, error_headers)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+        batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Uploading grades')
+        # Rows are compiled lazily, as they're streamed into the uploaded
+        # report, so both steps happen at once.
+        context.update_status(u'Compiling and uploading grades')
+        error_rows = []
+        success_rows = self._compile(context, batched_rows, error_rows)
         self._upload(context, success_headers, success_rows, error_headers, error_rows)
 
         return context.update_status(u'Completed grades')
 
+    def _generate_in_parallel(self, context, success_headers, error_headers):
+        """
+        Generates the grade report for the given context by compiling shards
+        of the enrolled users in a pool of processes.  Each shard's rows are
+        written to partial CSV files, which are merged when uploading.
+        """
+        # Load the data shared by all shards before the processes are
+        # forked, so it's only computed once.
+        for shared_data in (
+            'graded_assignments', 'course_experiments', 'teams_enabled', 'cohorts_enabled', 'vectorized_grades',
+        ):
+            getattr(context, shared_data)
+
+        user_ids = list(
+            get_user_model().objects.filter(
+                courseenrollment__course_id=context.course_id,
+            ).values_list('id', flat=True).order_by('id')
+        )
+        shards = [
+            (shard_index, user_ids[start:start + self.USER_SHARD_SIZE])
+            for shard_index, start in enumerate(xrange(0, len(user_ids), self.USER_SHARD_SIZE))
+        ]
+        context.task_progress.total = len(user_ids)
+
+        parts_dir = tempfile.mkdtemp(prefix='grade_report_')
+        try:
+            context.update_status(u'Compiling grades')
+            success_parts, error_parts = [], []
+            pool = self._create_pool(context, parts_dir)
+            try:
+                for success_part, error_part, num_succeeded, num_failed in pool.imap(_compile_shard, shards):
+                    success_parts.append(success_part)
+                    error_parts.append(error_part)
+                    context.task_progress.succeeded += num_succeeded
+                    context.task_progress.failed += num_failed
+                    context.task_progress.attempted += num_succeeded + num_failed
+                    context.update_status(u'Compiling grades')
+            finally:
+                pool.terminate()
+                pool.join()
+            context.task_progress.total = context.task_progress.attempted
+
+            context.update_status(u'Uploading grades')
+            self._upload(
+                context,
+                success_headers,
+                _read_csv_parts(success_parts),
+                error_headers,
+                list(_read_csv_parts(error_parts)),
+            )
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+        return context.update_status(u'Completed grades')
+
+    def _create_pool(self, context, parts_dir):
+        """
+        Returns a pool of processes that compile shards of this report into
+        partial CSV files in the given directory.
+        """
+        # Database connections can't be shared with forked processes, so
+        # they're closed here and each process opens its own.
+        connections.close_all()
+        return multiprocessing.Pool(
+            settings.GRADE_REPORT_PROCESS_POOL_SIZE,
+            initializer=_init_shard_process,
+            initargs=(context, parts_dir),
+        )
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -257,29 +352,32 @@ class CourseGradeReport(object):
             users = filter(lambda u: u is not None, users)
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, error_rows):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        A generator of the success rows for the given batched_rows and
+        context.  Error rows are appended to the given error_rows list, and
+        the metrics on task status are updated as each batch is compiled.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = izip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        for batch_success_rows, batch_error_rows in batched_rows:
+            error_rows.extend(batch_error_rows)
+
+            # update metrics on task status
+            context.task_progress.succeeded += len(batch_success_rows)
+            context.task_progress.failed += len(batch_error_rows)
+            context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
+            context.task_progress.total = context.task_progress.attempted
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
+            for row in batch_success_rows:
+                yield row
 
     def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Creates and uploads a CSV for the given headers and rows.  The
+        success_rows may be a generator; it is consumed before the
+        error_rows are uploaded.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
+        upload_csv_to_report_store(chain([success_headers], success_rows), 'grade_report', context.course_id, date)
         if len(error_rows) > 0:
             error_rows = [error_headers] + error_rows
             upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
@@ -470,6 +568,72 @@ class CourseGradeReport(object):
         )
         return certificate_info
 
+    def _matrix_user_grades(self, user, grade_matrix, assignment_averages, context):
+        """
+        Returns a list of grade results for the given user from the given
+        CourseGradeMatrix, corresponding to the headers for this report.
+        """
+        grade_results = [grade_matrix.course_grade(user).percent]
+        for assignment_type, assignment_info in context.graded_assignments.iteritems():
+            grade_results.extend(
+                percent_graded if attempted_graded else u'Not Attempted'
+                for attempted_graded, percent_graded
+                in grade_matrix.subsection_grades(user, assignment_info['subsection_headers'])
+            )
+            if assignment_type in assignment_averages:
+                grade_results.append(assignment_averages[assignment_type][user.id])
+        return grade_results
+
+    def _iter_user_grades(self, context, users):
+        """
+        Yields a (user, course_grade, grade_results, error) tuple for each of
+        the given users.
+
+        When the context's vectorized_grades is set, the grades of users with
+        persisted grades are computed for the whole batch at once by a
+        CourseGradeMatrix.  The remaining users are graded one by one.
+        """
+        grade_matrix, assignment_averages = None, {}
+        if context.vectorized_grades:
+            grade_matrix = CourseGradeMatrix(
+                context.course_id,
+                users,
+                _flatten(info['subsection_headers'] for info in context.graded_assignments.itervalues()),
+                context.course_structure,
+            )
+            assignment_averages = {
+                assignment_type: dict(izip(
+                    [user.id for user in grade_matrix.users],
+                    grade_matrix.assignment_averages(
+                        assignment_info['subsection_headers'], assignment_info['grader'],
+                    ).tolist(),
+                ))
+                for assignment_type, assignment_info in context.graded_assignments.iteritems()
+                if assignment_info['separate_subsection_avg_headers'] and assignment_info['grader']
+            }
+
+        remaining_users = [user for user in users if not (grade_matrix and grade_matrix.is_graded(user))]
+        grade_results_by_user = {
+            user.id: (course_grade, error)
+            for user, course_grade, error in CourseGradeFactory().iter(
+                remaining_users,
+                course=context.course,
+                collected_block_structure=context.course_structure,
+                course_key=context.course_id,
+            )
+        }
+
+        for user in users:
+            if user.id in grade_results_by_user:
+                course_grade, error = grade_results_by_user[user.id]
+                grade_results = self._user_grades(course_grade, context) if course_grade else None
+                yield user, course_grade, grade_results, error
+            else:
+                course_grade = grade_matrix.course_grade(user)
+                yield user, course_grade, self._matrix_user_grades(
+                    user, grade_matrix, assignment_averages, context,
+                ), None
+
     def _rows_for_users(self, context, users):
         """
         Returns a list of rows for the given users for this report.
@@ -478,19 +642,14 @@ class CourseGradeReport(object):
             bulk_context = _CourseGradeBulkContext(context, users)
 
             success_rows, error_rows = [], []
-            for user, course_grade, error in CourseGradeFactory().iter(
-                users,
-                course=context.course,
-                collected_block_structure=context.course_structure,
-                course_key=context.course_id,
-            ):
+            for user, course_grade, grade_results, error in self._iter_user_grades(context, users):
                 if not course_grade:
                     # An empty gradeset means we failed to grade a student.
                     error_rows.append([user.id, user.username, text_type(error)])
                 else:
                     success_rows.append(
                         [user.id, user.email, user.username] +
-                        self._user_grades(course_grade, context) +
+                        grade_results +
                         self._user_cohort_group_names(user, context) +
                         self._user_experiment_group_names(user, context) +
                         self._user_team_names(user, bulk_context.teams) +
@@ -501,6 +660,71 @@ class CourseGradeReport(object):
             return success_rows, error_rows
 
 
+# The (context, parts_dir) of the grade report compiled by the current
+# process of a CourseGradeReport pool.
+_SHARD_PROCESS_STATE = {}
+
+
+def _init_shard_process(context, parts_dir):
+    """
+    Initializes a process of a CourseGradeReport pool.
+    """
+    # Cache connections inherited from the parent process can't be shared
+    # either, so they're closed and reopened by this process as needed.
+    for cache in caches.all():
+        cache.close()
+    _SHARD_PROCESS_STATE.update(context=context, parts_dir=parts_dir)
+
+
+def _compile_shard(shard):
+    """
+    Compiles the rows of a shard of a grade report, given as a tuple of
+    (shard_index, user_ids), into partial success and error CSV files.
+
+    Returns a tuple of (success_part_path, error_part_path, num_succeeded,
+    num_failed).
+    """
+    shard_index, user_ids = shard
+    context = _SHARD_PROCESS_STATE['context']
+    parts_dir = _SHARD_PROCESS_STATE['parts_dir']
+    report = CourseGradeReport()
+
+    success_part = os.path.join(parts_dir, u'success_{}.csv'.format(shard_index))
+    error_part = os.path.join(parts_dir, u'error_{}.csv'.format(shard_index))
+    num_succeeded, num_failed = 0, 0
+    with open(success_part, 'wb') as success_file, open(error_part, 'wb') as error_file:
+        success_writer, error_writer = csv.writer(success_file), csv.writer(error_file)
+        for start in xrange(0, len(user_ids), report.USER_BATCH_SIZE):
+            users = get_user_model().objects.filter(
+                id__in=user_ids[start:start + report.USER_BATCH_SIZE],
+                courseenrollment__course_id=context.course_id,
+            ).select_related('profile').order_by('id')
+            success_rows, error_rows = report._rows_for_users(context, list(users))  # pylint: disable=protected-access
+            success_writer.writerows(_encode_csv_rows(success_rows))
+            error_writer.writerows(_encode_csv_rows(error_rows))
+            num_succeeded += len(success_rows)
+            num_failed += len(error_rows)
+    return success_part, error_part, num_succeeded, num_failed
+
+
+def _encode_csv_rows(rows):
+    """
+    Returns the given rows with their items converted to utf-8 strings,
+    as ReportStore does when storing rows.
+    """
+    return ([text_type(item).encode('utf-8') for item in row] for row in rows)
+
+
+def _read_csv_parts(part_paths):
+    """
+    Yields the decoded rows of the given partial CSV files, in order.
+    """
+    for part_path in part_paths:
+        with open(part_path, 'rb') as part_file:
+            for row in csv.reader(part_file):
+                yield [item.decode('utf-8') for item in row]
+
+
 class ProblemGradeReport(object):
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
@@ -24,6 +24,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            Any iterable of rows is accepted.  Generators are consumed
+            lazily, so the rows don't all need to be held in memory.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
 
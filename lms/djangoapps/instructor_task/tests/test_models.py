@@ -1,11 +1,15 @@
 """
 Tests for instructor_task/models.py.
 """
+import codecs
 import copy
+import resource
 import time
+import unittest
 from cStringIO import StringIO
 
 import boto
+import ddt
 from django.conf import settings
 from django.test import SimpleTestCase, TestCase, override_settings
 from mock import patch
@@ -16,6 +20,7 @@ from lms.djangoapps.instructor_task.models import ReportStore
 from lms.djangoapps.instructor_task.tests.test_base import TestReportMixin
 
 
+@ddt.ddt
 class ReportStoreTestMixin(object):
     """
     Mixin for report store tests.
@@ -50,6 +55,24 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    @ddt.data(64, 1024 * 1024)
+    def test_store_rows_from_generator(self, spool_max_size):
+        """
+        Test that ReportStore.store_rows() consumes a generator of rows,
+        whether or not the report is spooled to disk.
+        """
+        report_store = self.create_report_store()
+        rows = ([u'r\xf6w {}'.format(index), index] for index in range(100))
+        with patch('lms.djangoapps.instructor_task.models.REPORT_SPOOL_MAX_SIZE', spool_max_size):
+            report_store.store_rows(self.course_id, 'report.csv', rows)
+
+        with report_store.storage.open(report_store.path_to(self.course_id, 'report.csv')) as report_file:
+            content = report_file.read()
+        expected_content = codecs.BOM_UTF8 + ''.join(
+            u'r\xf6w {0},{0}\r\n'.format(index).encode('utf-8') for index in range(100)
+        )
+        self.assertEqual(content, expected_content)
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -115,6 +138,37 @@ class DjangoStorageReportStoreS3TestCase(MockS3Mixin, ReportStoreTestMixin, Test
             return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
 
+@unittest.skip
+class ReportStoreMemoryBenchmark(TestReportMixin, SimpleTestCase):
+    """
+    Verifies that storing a large report doesn't grow the memory of the
+    process with the number of rows.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_ROWS = 1000000
+    MAX_RSS_GROWTH_KB = 50 * 1024
+
+    def test_store_rows_memory(self):
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        course_id = CourseLocator(org="testx", course="coursex", run="runx")
+        rows = (
+            [index, u'user{}@example.com'.format(index), u'user{}'.format(index), 0.75, u'Not Attempted']
+            for index in xrange(self.NUM_ROWS)
+        )
+
+        initial_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start_time = time.time()
+        report_store.store_rows(course_id, 'benchmark.csv', rows)
+        rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - initial_rss
+
+        print(u'Stored {} rows in {:.2f}s, max RSS grew by {} KB'.format(
+            self.NUM_ROWS, time.time() - start_time, rss_growth,
+        ))
+        self.assertLess(rss_growth, self.MAX_RSS_GROWTH_KB)
+
+
 class TestS3ReportStorage(MockS3Mixin, TestCase):
     """
     Test the S3ReportStorage to make sure that configuration overrides from settings.FINANCIAL_REPORTS
@@ -68,6 +68,8 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ENROLLED_IN_COURSE,
     NOT_ENROLLED_IN_COURSE,
+    VECTORIZED_GRADE_REPORT,
+    WAFFLE_SWITCHES,
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
@@ -1892,6 +1894,25 @@ class TestCohortStudents(TestReportMixin, InstructorTaskCourseTestCase):
         )
 
 
+class SynchronousPool(object):
+    """
+    Stand-in for multiprocessing.Pool that runs its tasks in the current
+    process.
+    """
+    def __init__(self, processes, initializer=None, initargs=()):
+        if initializer:
+            initializer(*initargs)
+
+    def imap(self, func, iterable):
+        return (func(item) for item in iterable)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
 @ddt.ddt
 @patch('lms.djangoapps.instructor_task.tasks_helper.misc.DefaultStorage', new=MockDefaultStorage)
 class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
@@ -1975,6 +1996,48 @@ class TestGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
                 ignore_other_columns=True,
             )
 
+    @ddt.data(True, False)
+    def test_vectorized_grade_report(self, create_non_zero_grade):
+        if create_non_zero_grade:
+            self.submit_student_answer(self.student.username, u'Problem1', ['Option 1'])
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+            expected_rows = self._read_csv_rows()
+            with WAFFLE_SWITCHES.override(VECTORIZED_GRADE_REPORT, active=True):
+                with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter') as mock_grades_iter:
+                    mock_grades_iter.return_value = []
+                    result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+            self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
+            self.verify_rows_in_csv(expected_rows)
+
+    def _read_csv_rows(self):
+        """
+        Returns the rows of the most recent grade report as dicts.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_csv_filename = report_store.links_for(self.course.id)[0][0]
+        report_path = report_store.path_to(self.course.id, report_csv_filename)
+        with report_store.storage.open(report_path) as csv_file:
+            return [row for row in unicodecsv.DictReader(csv_file, encoding='utf-8-sig')]
+
+    def test_parallel_grade_report(self):
+        self.submit_student_answer(self.student.username, u'Problem1', ['Option 1'])
+        for index in range(2, 6):
+            self.create_student(u'üser_{}'.format(index))
+
+        with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
+            CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+            expected_rows = self._read_csv_rows()
+            with override_settings(GRADE_REPORT_PROCESS_POOL_SIZE=2), \
+                    patch.object(CourseGradeReport, 'USER_SHARD_SIZE', 2), \
+                    patch.object(CourseGradeReport, 'USER_BATCH_SIZE', 1), \
+                    patch('lms.djangoapps.instructor_task.tasks_helper.grades.connections.close_all'), \
+                    patch('lms.djangoapps.instructor_task.tasks_helper.grades.multiprocessing.Pool', SynchronousPool):
+                result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0, 'total': 5}, result)
+        self.verify_rows_in_csv(expected_rows, verify_order=False)
+
     @ddt.data(True, False)
     def test_fast_generation(self, create_non_zero_grade):
         if create_non_zero_grade:
@@ -6,6 +6,7 @@ included early in the INSTALLED_APPS list.
 """
 
 import analytics
+from capa.safe_exec import sandbox_pool
 from django.apps import AppConfig
 from django.conf import settings
 
@@ -23,6 +24,7 @@ class LMSInitializationConfig(AppConfig):
         settings have loaded, but before most other djangoapp initializations.
         """
         self._initialize_analytics()
+        self._initialize_sandbox_pool()
 
     def _initialize_analytics(self):
         """
@@ -30,3 +32,9 @@ class LMSInitializationConfig(AppConfig):
         """
         if settings.LMS_SEGMENT_KEY:
             analytics.write_key = settings.LMS_SEGMENT_KEY
+
+    def _initialize_sandbox_pool(self):
+        """
+        Set the size of the pool of sandbox workers for problem code.
+        """
+        sandbox_pool.configure(settings.CODE_JAIL_POOL_SIZE)
@@ -901,6 +901,11 @@ MODULESTORE = {
     }
 }
 
+# Maximum total size, in bytes, of split modulestore course structures kept
+# deserialized in each process, in front of the 'course_structure_cache'.
+# Set to 0 to disable the process-local cache.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = 0
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -916,6 +921,11 @@ CODE_JAIL = {
     },
 }
 
+# Number of pre-forked sandbox workers in each LMS process, which import the
+# modules problems use once instead of for each execution of sandboxed code.
+# Set to 0 to start a new sandboxed process for each execution.
+CODE_JAIL_POOL_SIZE = 0
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -926,6 +936,15 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# Results of sandboxed code are cached in the default django cache.  They can
+# also be cached in a SQLite database on the local disk of each server, in
+# front of the django cache, by setting PATH to the database file.  The least
+# recently used results are evicted when the database grows beyond MAX_SIZE bytes.
+SAFE_EXEC_LOCAL_CACHE = {
+    'PATH': None,
+    'MAX_SIZE': 512 * 1024 * 1024,
+}
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -977,6 +996,18 @@ STATICFILES_DIRS = [
 FAVICON_PATH = 'images/favicon.ico'
 DEFAULT_COURSE_ABOUT_IMAGE_URL = 'images/pencils.jpg'
 
+# Course assets that aren't cached in memory by the contentserver can be cached
+# as files on the local disk of each server, by setting PATH to a directory.
+# Assets larger than MAX_ASSET_SIZE bytes aren't cached, and the least recently
+# used files are evicted when their total size grows beyond MAX_SIZE bytes.
+# Keep MAX_ASSET_SIZE a small fraction of MAX_SIZE, so that a single asset
+# doesn't evict most of the cache.
+COURSE_ASSETS_DISK_CACHE = {
+    'PATH': None,
+    'MAX_SIZE': 10 * 1024 * 1024 * 1024,
+    'MAX_ASSET_SIZE': 100 * 1024 * 1024,
+}
+
 # User-uploaded content
 MEDIA_ROOT = '/edx/var/edxapp/media/'
 MEDIA_URL = '/media/'
@@ -1929,6 +1960,13 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     PRUNING_ACTIVE=False,
 )
 
+################################ Course Overviews ###################################
+
+# Number of seconds course overviews are cached across requests, in memory
+# and in the default cache, or 0 to always load them from the database.
+# Cached overviews are invalidated when they're regenerated or deleted.
+COURSE_OVERVIEW_CACHE_TIMEOUT = 0
+
 ################################ Bulk Email ###################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -2567,6 +2605,11 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Number of local processes that compile a course grade report in parallel.
+# When greater than 1, the enrolled learners are split into shards that are
+# graded by a process pool and merged into a single report.
+GRADE_REPORT_PROCESS_POOL_SIZE = 1
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
@@ -3195,6 +3238,10 @@ RSS_PROXY_CACHE_TIMEOUT = 3600  # The length of time we cache RSS retrieved from
 # to compete with the MOOC.
 CCX_MAX_STUDENTS_ALLOWED = 200
 
+# Number of seconds the field overrides of a CCX are cached across requests.
+# The cache is invalidated when they're changed.
+CCX_OVERRIDES_CACHE_TIMEOUT = 24 * 60 * 60
+
 # Financial assistance settings
 
 # Maximum and minimum length of answers, in characters, for the
@@ -3426,6 +3473,21 @@ EDX_PLATFORM_REVISION = 'unknown'
 COMPLETION_VIDEO_COMPLETE_PERCENTAGE = 0.95
 COMPLETION_BY_VIEWING_DELAY_MS = 5000
 
+############## Settings for the comments service #########################
+
+# The number of persistent connections to the comments service kept by each
+# process, or 0 to open a new connection for each request.
+COMMENTS_SERVICE_POOL_SIZE = 0
+
+# The number of threads of each process making independent comments service
+# requests in parallel, or 0 to make them sequentially.
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = 0
+
+# The number of seconds thread listings and details fetched from the comments
+# service are cached for, or 0 not to cache them.  Cached responses are
+# invalidated when posts are written, read or followed through the LMS.
+COMMENTS_SERVICE_CACHE_TIMEOUT = 0
+
 ############### Settings for Django Rate limit #####################
 RATELIMIT_ENABLE = True
 RATELIMIT_RATE = '120/m'
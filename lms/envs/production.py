@@ -359,6 +359,11 @@ LOGGING = get_logger_config(LOG_DIR,
 COURSE_LISTINGS = ENV_TOKENS.get('COURSE_LISTINGS', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_SIZE = ENV_TOKENS.get('COMMENTS_SERVICE_POOL_SIZE', COMMENTS_SERVICE_POOL_SIZE)
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_CONCURRENT_REQUESTS', COMMENTS_SERVICE_CONCURRENT_REQUESTS
+)
+COMMENTS_SERVICE_CACHE_TIMEOUT = ENV_TOKENS.get('COMMENTS_SERVICE_CACHE_TIMEOUT', COMMENTS_SERVICE_CACHE_TIMEOUT)
 CERT_NAME_SHORT = ENV_TOKENS.get('CERT_NAME_SHORT', CERT_NAME_SHORT)
 CERT_NAME_LONG = ENV_TOKENS.get('CERT_NAME_LONG', CERT_NAME_LONG)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
@@ -388,9 +393,13 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
     else:
         CODE_JAIL[name] = value
 
+CODE_JAIL_POOL_SIZE = ENV_TOKENS.get('CODE_JAIL_POOL_SIZE', CODE_JAIL_POOL_SIZE)
+
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_LOCAL_CACHE.update(ENV_TOKENS.get('SAFE_EXEC_LOCAL_CACHE', {}))
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
+COURSE_ASSETS_DISK_CACHE.update(ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE', {}))
 
 # Event Tracking
 if "TRACKING_IGNORE_URL_PATTERNS" in ENV_TOKENS:
@@ -559,6 +568,9 @@ MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTOR
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE', COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE
+)
 
 EMAIL_HOST_USER = AUTH_TOKENS.get('EMAIL_HOST_USER', '')  # django default is ''
 EMAIL_HOST_PASSWORD = AUTH_TOKENS.get('EMAIL_HOST_PASSWORD', '')  # django default is ''
@@ -602,6 +614,9 @@ BROKER_USE_SSL = ENV_TOKENS.get('CELERY_BROKER_USE_SSL', False)
 # Block Structures
 BLOCK_STRUCTURES_SETTINGS = ENV_TOKENS.get('BLOCK_STRUCTURES_SETTINGS', BLOCK_STRUCTURES_SETTINGS)
 
+# Course Overviews
+COURSE_OVERVIEW_CACHE_TIMEOUT = ENV_TOKENS.get('COURSE_OVERVIEW_CACHE_TIMEOUT', COURSE_OVERVIEW_CACHE_TIMEOUT)
+
 # upload limits
 STUDENT_FILEUPLOAD_MAX_SIZE = ENV_TOKENS.get("STUDENT_FILEUPLOAD_MAX_SIZE", STUDENT_FILEUPLOAD_MAX_SIZE)
 
@@ -637,6 +652,7 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADE_REPORT_PROCESS_POOL_SIZE = ENV_TOKENS.get('GRADE_REPORT_PROCESS_POOL_SIZE', GRADE_REPORT_PROCESS_POOL_SIZE)
 
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = ENV_TOKENS.get('POLICY_CHANGE_TASK_RATE_LIMIT', POLICY_CHANGE_TASK_RATE_LIMIT)
@@ -826,6 +842,7 @@ if FEATURES.get('CUSTOM_COURSES_EDX'):
         'lms.djangoapps.ccx.overrides.CustomCoursesForEdxOverrideProvider',
     )
 CCX_MAX_STUDENTS_ALLOWED = ENV_TOKENS.get('CCX_MAX_STUDENTS_ALLOWED', CCX_MAX_STUDENTS_ALLOWED)
+CCX_OVERRIDES_CACHE_TIMEOUT = ENV_TOKENS.get('CCX_OVERRIDES_CACHE_TIMEOUT', CCX_OVERRIDES_CACHE_TIMEOUT)
 
 ##### Individual Due Date Extensions #####
 if FEATURES.get('INDIVIDUAL_DUE_DATES'):
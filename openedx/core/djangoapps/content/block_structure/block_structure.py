@@ -11,6 +11,7 @@ The following internal data structures are implemented:
 from copy import deepcopy
 from functools import partial
 from logging import getLogger
+from threading import Lock
 
 from openedx.core.lib.graph_traversals import traverse_topologically, traverse_post_order
 
@@ -277,56 +278,168 @@ class BlockStructure(object):
             block_relations[usage_key] = _BlockRelations()
 
 
+class _FieldTable(object):
+    """
+    Interned names of the fields of one kind of FieldData, mapped to the
+    indices of their values in the instances' value arrays.  A table is
+    shared by all instances of its kind within the process, and only
+    grows, so the value arrays of existing instances stay valid.
+    """
+    _tables = {}
+    _lock = Lock()
+
+    def __init__(self, name):
+        self.name = name
+
+        # List of field names, in the order of their values.
+        # list [string]
+        self.names = []
+
+        # Map of field name to the index of its values.
+        # dict {string: int}
+        self.indices = {}
+
+    @classmethod
+    def get(cls, name):
+        """
+        Returns the field table with the given name, creating it if needed.
+        """
+        try:
+            return cls._tables[name]
+        except KeyError:
+            with cls._lock:
+                return cls._tables.setdefault(name, cls(name))
+
+    def index(self, field_name):
+        """
+        Returns the index of the given field's values, adding the
+        field to the table if needed.
+        """
+        try:
+            return self.indices[field_name]
+        except KeyError:
+            with self._lock:
+                if field_name not in self.indices:
+                    self.names.append(field_name)
+                    self.indices[field_name] = len(self.names) - 1
+                return self.indices[field_name]
+
+
+# Marks the fields that have no value in a FieldData's value array.
+_MISSING = object()
+
+
 class FieldData(object):
     """
     Data structure to encapsulate collected fields.
+
+    Instead of a dict per instance, the values are stored in an array
+    indexed by the fields' positions in a _FieldTable shared by all
+    instances of the same kind.
     """
-    def class_field_names(self):
+    __slots__ = ('_field_table', '_values')
+
+    # Names of the attributes that are not collected fields.
+    _own_field_names = frozenset(['fields', '_field_table', '_values'])
+
+    # Name of the _FieldTable used by default.
+    field_table_name = u'fields'
+
+    def __init__(self, field_table_name=None):
+        self._field_table = _FieldTable.get(field_table_name or self.field_table_name)
+        self._values = []
+
+    @property
+    def fields(self):
         """
-        Returns list of names of fields that are defined directly
-        on the class. Can be overridden by subclasses. All other
-        fields are assumed to be stored in the self.fields dict.
+        Returns a new dict of the collected fields' names and values.
+        Fields are updated as attributes of this object.
         """
-        return ['fields']
+        names = self._field_table.names
+        return {names[index]: value for index, value in enumerate(self._values) if value is not _MISSING}
 
-    def __init__(self):
-        # Map of field name to the field's value for this block.
-        # dict {string: any picklable type}
-        self.fields = {}
+    @fields.setter
+    def fields(self, fields):
+        self._values = []
+        for field_name, field_value in fields.iteritems():
+            setattr(self, field_name, field_value)
+
+    def get_field(self, field_name, default=None):
+        """
+        Returns the value of the given field; returns default if not found.
+        """
+        index = self._field_table.indices.get(field_name)
+        if index is not None and index < len(self._values):
+            value = self._values[index]
+            if value is not _MISSING:
+                return value
+        elif field_name in self._own_field_names:
+            return getattr(self, field_name, default)
+        return default
 
     def __getattr__(self, field_name):
-        if self._is_own_field(field_name):
-            return super(FieldData, self).__getattr__(field_name)
-        try:
-            return self.fields[field_name]
-        except KeyError:
+        # Only called for fields, and for own fields that aren't set yet,
+        # as during unpickling.
+        if field_name in self._own_field_names:
+            raise AttributeError(field_name)
+        value = self.get_field(field_name, _MISSING)
+        if value is _MISSING:
             raise AttributeError(u"Field {0} does not exist".format(field_name))
+        return value
 
     def __setattr__(self, field_name, field_value):
-        if self._is_own_field(field_name):
+        if field_name in self._own_field_names:
             return super(FieldData, self).__setattr__(field_name, field_value)
-        else:
-            self.fields[field_name] = field_value
+        index = self._field_table.index(field_name)
+        values = self._values
+        if index >= len(values):
+            values.extend([_MISSING] * (index + 1 - len(values)))
+        values[index] = field_value
 
     def __delattr__(self, field_name):
-        if self._is_own_field(field_name):
+        if field_name in self._own_field_names:
             return super(FieldData, self).__delattr__(field_name)
-        else:
-            del self.fields[field_name]
-
-    def _is_own_field(self, field_name):
-        """
-        Returns whether the given field_name is the name of an
-        actual field of this class.
-        """
-        return field_name in self.class_field_names()
+        if self.get_field(field_name, _MISSING) is _MISSING:
+            raise AttributeError(u"Field {0} does not exist".format(field_name))
+        self._values[self._field_table.indices[field_name]] = _MISSING
+
+    def __deepcopy__(self, memo):
+        # The field table is shared, so the value array is copied as is.
+        copied = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copied
+        memo[id(_MISSING)] = _MISSING
+        copied._field_table = self._field_table
+        copied._values = deepcopy(self._values, memo)
+        return copied
+
+    def __getstate__(self):
+        # Field tables differ between processes, so fields are pickled by name.
+        return {'fields': self.fields, 'field_table': self._field_table.name}
+
+    def __setstate__(self, state):
+        # Also accepts the __dict__ of instances pickled before fields
+        # were stored in value arrays.
+        state = dict(state)
+        fields = state.pop('fields')
+        self._field_table = _FieldTable.get(state.pop('field_table', self.field_table_name))
+        self._values = []
+        for name, value in state.iteritems():
+            setattr(self, name, value)
+        self.fields = fields
 
 
 class TransformerData(FieldData):
     """
     Data structure to encapsulate collected data for a transformer.
     """
-    pass
+    __slots__ = ()
+
+    field_table_name = u'transformer'
+
+    def __init__(self, transformer_name=None):
+        super(TransformerData, self).__init__(
+            u'transformer.{}'.format(transformer_name) if transformer_name else None
+        )
 
 
 class TransformerDataMap(dict):
@@ -335,6 +448,16 @@ class TransformerDataMap(dict):
     The map can be accessed by the Transformer's name or the
     Transformer's class type.
     """
+    # Transformer data not yet decoded from the columnar serialization
+    # format, shared across all blocks of a deserialized block structure.
+    # See serialization._PendingTransformerColumns.
+    pending_columns = None
+
+    def __missing__(self, key):
+        if self.pending_columns is not None and self.pending_columns.load(key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
     def __getitem__(self, key):
         key = self._translate_key(key)
         return dict.__getitem__(self, key)
@@ -356,7 +479,7 @@ class TransformerDataMap(dict):
         try:
             return self[key]
         except KeyError:
-            new_transformer_data = TransformerData()
+            new_transformer_data = TransformerData(self._translate_key(key))
             self[key] = new_transformer_data
             return new_transformer_data
 
@@ -379,8 +502,11 @@ class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
     """
-    def class_field_names(self):
-        return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
+    __slots__ = ('location', 'transformer_data')
+
+    _own_field_names = FieldData._own_field_names | frozenset(__slots__)
+
+    field_table_name = u'xblock'
 
     def __init__(self, usage_key):
         super(BlockData, self).__init__()
@@ -391,6 +517,17 @@ class BlockData(FieldData):
         # Map of transformer name to its block-specific data.
         self.transformer_data = TransformerDataMap()
 
+    def __deepcopy__(self, memo):
+        copied = super(BlockData, self).__deepcopy__(memo)
+        copied.location = deepcopy(self.location, memo)
+        copied.transformer_data = deepcopy(self.transformer_data, memo)
+        return copied
+
+    def __getstate__(self):
+        state = super(BlockData, self).__getstate__()
+        state.update(location=self.location, transformer_data=self.transformer_data)
+        return state
+
 
 class BlockStructureBlockData(BlockStructure):
     """
@@ -464,7 +601,7 @@ class BlockStructureBlockData(BlockStructure):
                 not found.
         """
         block_data = self._block_data_map.get(usage_key)
-        return getattr(block_data, field_name, default) if block_data else default
+        return block_data.get_field(field_name, default) if block_data else default
 
     def override_xblock_field(self, usage_key, field_name, override_data):
         """
@@ -495,7 +632,7 @@ class BlockStructureBlockData(BlockStructure):
                 that is requested.
         """
         try:
-            return getattr(self.transformer_data[transformer], key, default)
+            return self.transformer_data[transformer].get_field(key, default)
         except KeyError:
             return default
 
@@ -554,7 +691,7 @@ class BlockStructureBlockData(BlockStructure):
             transformer_data = self.get_transformer_block_data(usage_key, transformer)
         except KeyError:
             return default
-        return getattr(transformer_data, key, default)
+        return transformer_data.get_field(key, default)
 
     def set_transformer_block_field(self, usage_key, transformer, key, value):
         """
@@ -0,0 +1,294 @@
+"""
+Module for the columnar serialization format of BlockStructure collected data.
+
+Previously, the entire (block relations, transformer data, block data map)
+tuple was pickled and zlib-compressed as a single object graph, which
+required unpickling every BlockData and TransformerData object on each
+cache miss.
+
+The columnar format instead stores the data in independently compressed
+sections:
+
+    block_keys - The usage keys of all blocks. When all keys share the
+        same course key, only the (block_type, block_id) pairs are stored.
+    relations - Per-block lists of children and parent indices.
+    transformer_data - The non-block-specific transformer data.
+    xblock_fields - Sparse columns of each collected xBlock field.
+    transformer.<name> - Sparse columns of each field collected by the
+        named transformer for its blocks.
+
+Per-block transformer sections are only decoded when the transformer's
+data is first accessed, so requests that use a subset of the registered
+transformers don't pay for decoding the others.
+
+Serialized layout:
+
+    MAGIC | header length (4 bytes) | header | section payloads
+
+where the header is a pickled map of section name to (offset, length)
+within the section payloads.
+"""
+import struct
+import zlib
+
+from six.moves import cPickle as pickle
+
+from .block_structure import BlockData, TransformerData, _BlockRelations  # pylint: disable=protected-access
+from .factory import BlockStructureFactory
+
+
+# Prefix of data serialized in the columnar format. Since zlib streams
+# always start with 0x78, this cannot collide with the legacy format.
+MAGIC = b'BSC\x01'
+
+_HEADER_LENGTH = struct.Struct('!I')
+
+_BLOCK_KEYS = u'block_keys'
+_RELATIONS = u'relations'
+_TRANSFORMER_DATA = u'transformer_data'
+_XBLOCK_FIELDS = u'xblock_fields'
+_TRANSFORMER_SECTION_PREFIX = u'transformer.'
+
+# Encodings for the block_keys section.
+_COURSE_RELATIVE_KEYS = u'course_relative'
+_OPAQUE_KEYS = u'opaque'
+
+
+def is_columnar(serialized_data):
+    """
+    Returns whether the given data was serialized in the columnar format.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Returns the columnar serialization of the given block structure.
+    """
+    # pylint: disable=protected-access
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    # Blocks with relations come first, followed by any blocks that
+    # only have collected data.
+    related_block_keys = list(block_relations)
+    block_keys = related_block_keys + [key for key in block_data_map if key not in block_relations]
+    index_of = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    sections = {
+        _BLOCK_KEYS: (_encode_block_keys(block_keys), len(related_block_keys)),
+        _RELATIONS: (
+            [[index_of[child] for child in block_relations[key].children] for key in related_block_keys],
+            [[index_of[parent] for parent in block_relations[key].parents] for key in related_block_keys],
+        ),
+        _TRANSFORMER_DATA: block_structure.transformer_data,
+    }
+
+    xblock_columns = {}
+    transformer_columns = {}
+    block_data_indices = []
+    for block_key, block_data in block_data_map.iteritems():
+        index = index_of[block_key]
+        block_data_indices.append(index)
+        _add_to_columns(xblock_columns, index, block_data.fields)
+
+        if block_data.transformer_data.pending_columns is not None:
+            block_data.transformer_data.pending_columns.load_all()
+        for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+            present_indices, field_columns = transformer_columns.setdefault(transformer_name, ([], {}))
+            present_indices.append(index)
+            _add_to_columns(field_columns, index, transformer_block_data.fields)
+
+    sections[_XBLOCK_FIELDS] = (block_data_indices, xblock_columns)
+    for transformer_name, columns in transformer_columns.iteritems():
+        sections[_TRANSFORMER_SECTION_PREFIX + transformer_name] = columns
+
+    return _pack_sections(sections)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Returns the block structure for the given columnar serialized data.
+    Per-block transformer data is decoded lazily, on first access.
+    """
+    sections = _SectionReader(serialized_data)
+
+    encoded_block_keys, num_related_blocks = sections.decode(_BLOCK_KEYS)
+    block_keys = _decode_block_keys(encoded_block_keys)
+
+    children_lists, parents_lists = sections.decode(_RELATIONS)
+    block_relations = {}
+    for index in xrange(num_related_blocks):
+        relations = _BlockRelations()
+        relations.children = [block_keys[child] for child in children_lists[index]]
+        relations.parents = [block_keys[parent] for parent in parents_lists[index]]
+        block_relations[block_keys[index]] = relations
+
+    block_data_indices, xblock_columns = sections.decode(_XBLOCK_FIELDS)
+    block_data_by_index = {index: BlockData(block_keys[index]) for index in block_data_indices}
+    for field_name, (indices, values) in xblock_columns.iteritems():
+        for index, value in zip(indices, values):
+            setattr(block_data_by_index[index], field_name, value)
+
+    pending_columns = _PendingTransformerColumns(
+        {
+            name[len(_TRANSFORMER_SECTION_PREFIX):]: sections.raw(name)
+            for name in sections.names()
+            if name.startswith(_TRANSFORMER_SECTION_PREFIX)
+        },
+        block_data_by_index,
+    )
+    block_data_map = {}
+    for block_data in block_data_by_index.itervalues():
+        block_data.transformer_data.pending_columns = pending_columns
+        block_data_map[block_data.location] = block_data
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        sections.decode(_TRANSFORMER_DATA),
+        block_data_map,
+    )
+
+
+class _PendingTransformerColumns(object):
+    """
+    Compressed per-block transformer sections that are not yet decoded.
+    Shared by the TransformerDataMap of every block in a deserialized
+    block structure.
+    """
+    def __init__(self, raw_sections, block_data_by_index):
+        self._raw_sections = raw_sections
+        self._block_data_by_index = block_data_by_index
+
+    def load(self, transformer_name):
+        """
+        Decodes the named transformer's section into the blocks' data.
+        Returns whether a section was found for the transformer.
+        """
+        raw_section = self._raw_sections.pop(transformer_name, None)
+        if raw_section is None:
+            return False
+
+        present_indices, field_columns = _decode_section(raw_section)
+        transformer_data_by_index = {}
+        for index in present_indices:
+            transformer_block_data = TransformerData(transformer_name)
+            transformer_data_by_index[index] = transformer_block_data
+            dict.__setitem__(
+                self._block_data_by_index[index].transformer_data,
+                transformer_name,
+                transformer_block_data,
+            )
+        for field_name, (indices, values) in field_columns.iteritems():
+            for index, value in zip(indices, values):
+                setattr(transformer_data_by_index[index], field_name, value)
+        return True
+
+    def load_all(self):
+        """
+        Decodes all remaining sections.
+        """
+        for transformer_name in list(self._raw_sections):
+            self.load(transformer_name)
+
+
+class _SectionReader(object):
+    """
+    Provides access to the sections of columnar serialized data
+    without copying the underlying buffer.
+    """
+    def __init__(self, serialized_data):
+        if not is_columnar(serialized_data):
+            raise ValueError(u'Data is not in the columnar block structure format.')
+
+        self._buffer = memoryview(serialized_data)
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header_length, = _HEADER_LENGTH.unpack_from(serialized_data, len(MAGIC))
+        self._payload_start = header_start + header_length
+        self._offsets = pickle.loads(self._buffer[header_start:self._payload_start].tobytes())
+
+    def names(self):
+        """
+        Returns the names of all sections.
+        """
+        return self._offsets.keys()
+
+    def raw(self, name):
+        """
+        Returns the still compressed data of the named section.
+        """
+        offset, length = self._offsets[name]
+        start = self._payload_start + offset
+        return self._buffer[start:start + length].tobytes()
+
+    def decode(self, name):
+        """
+        Returns the decoded data of the named section.
+        """
+        return _decode_section(self.raw(name))
+
+
+def _pack_sections(sections):
+    """
+    Returns the serialized bytes for the given map of section
+    names to section data.
+    """
+    offsets = {}
+    payloads = []
+    position = 0
+    for name, data in sections.iteritems():
+        payload = zlib.compress(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        offsets[name] = (position, len(payload))
+        payloads.append(payload)
+        position += len(payload)
+
+    header = pickle.dumps(offsets, pickle.HIGHEST_PROTOCOL)
+    return b''.join([MAGIC, _HEADER_LENGTH.pack(len(header)), header] + payloads)
+
+
+def _decode_section(raw_section):
+    """
+    Returns the decoded data of the given compressed section.
+    """
+    return pickle.loads(zlib.decompress(raw_section))
+
+
+def _add_to_columns(columns, index, fields):
+    """
+    Appends the values of the given fields dict for the block at the
+    given index to their sparse (indices, values) columns.
+    """
+    for field_name, value in fields.iteritems():
+        indices, values = columns.setdefault(field_name, ([], []))
+        indices.append(index)
+        values.append(value)
+
+
+def _encode_block_keys(block_keys):
+    """
+    Returns a compact encoding of the given block keys. When all keys
+    belong to the same course, only their block types and ids are kept.
+    """
+    course_key = getattr(block_keys[0], 'course_key', None) if block_keys else None
+    if course_key is not None:
+        try:
+            encoded_keys = [(key.block_type, key.block_id) for key in block_keys]
+            if all(
+                    course_key.make_usage_key(block_type, block_id) == key
+                    for key, (block_type, block_id) in zip(block_keys, encoded_keys)
+            ):
+                return _COURSE_RELATIVE_KEYS, course_key, encoded_keys
+        except AttributeError:
+            pass
+    return _OPAQUE_KEYS, None, block_keys
+
+
+def _decode_block_keys(encoded_block_keys):
+    """
+    Returns the list of block keys for the given encoding.
+    """
+    encoding, course_key, keys = encoded_block_keys
+    if encoding == _COURSE_RELATIVE_KEYS:
+        return [course_key.make_usage_key(block_type, block_id) for block_type, block_id in keys]
+    return keys
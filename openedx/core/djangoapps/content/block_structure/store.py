@@ -6,7 +6,7 @@ from logging import getLogger
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
@@ -191,6 +191,9 @@ class BlockStructureStore(object):
         """
         Serializes the data for the given block_structure.
         """
+        if config.waffle().is_enabled(config.COLUMNAR_SERIALIZATION):
+            return serialization.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -201,7 +204,11 @@ class BlockStructureStore(object):
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either the columnar or the legacy pickled format is supported.
         """
+        if serialization.is_columnar(serialized_data):
+            return serialization.deserialize(serialized_data, root_block_usage_key)
+
         block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         return BlockStructureFactory.create_new(
             root_block_usage_key,
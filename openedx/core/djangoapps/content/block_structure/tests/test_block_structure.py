@@ -12,11 +12,12 @@ from unittest import TestCase
 
 import ddt
 import six
+from six.moves import cPickle as pickle
 from six.moves import range
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockData, BlockStructure, BlockStructureModulestoreData, TransformerDataMap
 from ..exceptions import TransformerException
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
@@ -200,6 +201,43 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
             override_due_date
         )
 
+    def test_block_data_fields(self):
+        block_data = BlockData('block')
+        block_data.field1 = 'val1'
+        block_data.field2 = None
+        self.assertEquals(block_data.fields, {'field1': 'val1', 'field2': None})
+
+        del block_data.field2
+        self.assertEquals(block_data.fields, {'field1': 'val1'})
+        self.assertEquals(block_data.get_field('field2', 'default'), 'default')
+        with self.assertRaises(AttributeError):
+            block_data.field2  # pylint: disable=pointless-statement
+
+        self.assertEquals(block_data.get_field('location'), 'block')
+        self.assertFalse(hasattr(block_data, '__dict__'))
+
+    @ddt.data(0, pickle.HIGHEST_PROTOCOL)
+    def test_block_data_pickling(self, protocol):
+        block_data = BlockData('block')
+        block_data.field1 = 'val1'
+        block_data.transformer_data.get_or_create('transformer').test_key = 'test_value'
+
+        unpickled = pickle.loads(pickle.dumps(block_data, protocol))
+        self.assertEquals(unpickled.location, 'block')
+        self.assertEquals(unpickled.fields, {'field1': 'val1'})
+        self.assertEquals(unpickled.transformer_data['transformer'].fields, {'test_key': 'test_value'})
+
+    def test_legacy_block_data_unpickling(self):
+        # The state of BlockData pickled when fields were stored in a dict per instance.
+        block_data = BlockData.__new__(BlockData)
+        block_data.__setstate__({
+            'location': 'block',
+            'fields': {'field1': 'val1'},
+            'transformer_data': TransformerDataMap(),
+        })
+        self.assertEquals(block_data.location, 'block')
+        self.assertEquals(block_data.field1, 'val1')
+
     @ddt.data(
         *itertools.product(
             [True, False],
@@ -0,0 +1,200 @@
+"""
+Tests for serialization.py
+"""
+from __future__ import absolute_import
+
+import timeit
+import unittest
+from copy import deepcopy
+from unittest import TestCase
+
+import ddt
+from six.moves import range
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .. import serialization
+from ..block_structure import BlockStructureBlockData
+from ..factory import BlockStructureFactory
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+class OtherMockTransformer(MockTransformer):
+    """
+    A second mock transformer, whose collected data is stored in its
+    own section.
+    """
+    pass
+
+
+class SerializationTestMixin(ChildrenMapTestMixin):
+    """
+    Mixin for creating block structures with collected data.
+    """
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with
+        xBlock fields and transformer data for each block.
+        """
+        block_structure = self.create_block_structure(children_map)
+        for transformer in (MockTransformer, OtherMockTransformer):
+            block_structure._add_transformer(transformer)  # pylint: disable=protected-access
+            block_structure.set_transformer_data(transformer, 'structure_field', transformer.name())
+
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_data = block_structure._get_or_create_block(block_key)  # pylint: disable=protected-access
+            block_data.display_name = u'Block {}'.format(block_id)
+            if block_id % 2:
+                block_data.graded = True
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'value', block_id)
+            if block_id % 3 == 0:
+                block_structure.set_transformer_block_field(block_key, OtherMockTransformer, 'list', [block_id])
+        return block_structure
+
+    def assert_collected_data_equal(self, block_structure, expected):
+        """
+        Verifies the given block structure has the same relations and
+        collected data as the expected block structure.
+        """
+        self.assertEqual(set(block_structure), set(expected))
+        self.assertEqual(block_structure.root_block_usage_key, expected.root_block_usage_key)
+        for block_key in expected:
+            self.assertEqual(block_structure.get_children(block_key), expected.get_children(block_key))
+            self.assertEqual(block_structure.get_parents(block_key), expected.get_parents(block_key))
+            self.assertEqual(block_structure[block_key].fields, expected[block_key].fields)
+            for transformer in (MockTransformer, OtherMockTransformer):
+                for field_name in ('value', 'list'):
+                    self.assertEqual(
+                        block_structure.get_transformer_block_field(block_key, transformer, field_name),
+                        expected.get_transformer_block_field(block_key, transformer, field_name),
+                    )
+        for transformer in (MockTransformer, OtherMockTransformer):
+            self.assertEqual(
+                block_structure.transformer_data[transformer].fields,
+                expected.transformer_data[transformer].fields,
+            )
+
+
+@ddt.ddt
+class TestColumnarSerialization(SerializationTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format with integer block keys.
+    """
+    @ddt.data(
+        [[]],
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        serialized_data = serialization.serialize(block_structure)
+
+        self.assertTrue(serialization.is_columnar(serialized_data))
+        self.assertFalse(serialization.is_columnar(zpickle(block_structure)))
+        self.assert_collected_data_equal(
+            serialization.deserialize(serialized_data, block_structure.root_block_usage_key),
+            block_structure,
+        )
+
+    def test_lazy_transformer_decoding(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        deserialized = serialization.deserialize(
+            serialization.serialize(block_structure),
+            block_structure.root_block_usage_key,
+        )
+        block_data = deserialized[0]
+        self.assertEqual(list(dict.keys(block_data.transformer_data)), [])
+
+        self.assertEqual(deserialized.get_transformer_block_field(0, MockTransformer, 'value'), 0)
+        self.assertEqual(list(dict.keys(block_data.transformer_data)), [MockTransformer.name()])
+        self.assertIsNone(deserialized.get_transformer_block_field(1, OtherMockTransformer, 'list'))
+
+    def test_copy_and_reserialize(self):
+        block_structure = self.create_collected_block_structure(self.DAG_CHILDREN_MAP)
+        deserialized = serialization.deserialize(
+            serialization.serialize(block_structure),
+            block_structure.root_block_usage_key,
+        )
+        copied = deserialized.copy()
+        copied.set_transformer_block_field(0, MockTransformer, 'value', 'changed')
+        self.assertEqual(deserialized.get_transformer_block_field(0, MockTransformer, 'value'), 0)
+
+        reserialized = serialization.deserialize(
+            serialization.serialize(deepcopy(deserialized)),
+            block_structure.root_block_usage_key,
+        )
+        self.assert_collected_data_equal(reserialized, block_structure)
+
+    def test_blocks_without_relations(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        block_structure._get_or_create_block(100).display_name = u'Orphan'  # pylint: disable=protected-access
+        deserialized = serialization.deserialize(
+            serialization.serialize(block_structure),
+            block_structure.root_block_usage_key,
+        )
+        self.assertNotIn(100, deserialized)
+        self.assertEqual(deserialized.get_xblock_field(100, 'display_name'), u'Orphan')
+
+
+class TestColumnarSerializationWithUsageKeys(UsageKeyFactoryMixin, SerializationTestMixin, TestCase):
+    """
+    Tests for the columnar serialization format with course-relative
+    usage keys.
+    """
+    def test_round_trip(self):
+        block_structure = self.create_collected_block_structure(self.DAG_CHILDREN_MAP)
+        self.assert_collected_data_equal(
+            serialization.deserialize(
+                serialization.serialize(block_structure),
+                block_structure.root_block_usage_key,
+            ),
+            block_structure,
+        )
+
+
+@unittest.skip
+class ColumnarSerializationBenchmark(UsageKeyFactoryMixin, SerializationTestMixin, TestCase):
+    """
+    Compares the columnar format against the legacy pickled format on a
+    large generated course.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    NUM_BLOCKS = 5000
+    NUM_RUNS = 10
+
+    def test_deserialization_timings(self):
+        children_map = [[child] for child in range(1, self.NUM_BLOCKS)] + [[]]
+        block_structure = self.create_collected_block_structure(children_map)
+        root_block_usage_key = block_structure.root_block_usage_key
+
+        legacy_data = zpickle((
+            block_structure._block_relations,  # pylint: disable=protected-access
+            block_structure.transformer_data,
+            block_structure._block_data_map,  # pylint: disable=protected-access
+        ))
+        columnar_data = serialization.serialize(block_structure)
+
+        def _deserialize_legacy():
+            block_relations, transformer_data, block_data_map = zunpickle(legacy_data)
+            BlockStructureFactory.create_new(root_block_usage_key, block_relations, transformer_data, block_data_map)
+
+        def _deserialize_columnar():
+            deserialized = serialization.deserialize(columnar_data, root_block_usage_key)
+            deserialized.get_transformer_block_field(root_block_usage_key, MockTransformer, 'value')
+
+        print(u'Block structure with {} blocks:'.format(self.NUM_BLOCKS))
+        print(u'  legacy size: {}, columnar size: {}'.format(len(legacy_data), len(columnar_data)))
+        print(u'  legacy: {:.4f}s per deserialization'.format(
+            timeit.timeit(_deserialize_legacy, number=self.NUM_RUNS) / self.NUM_RUNS
+        ))
+        print(u'  columnar: {:.4f}s per deserialization'.format(
+            timeit.timeit(_deserialize_columnar, number=self.NUM_RUNS) / self.NUM_RUNS
+        ))
+        self.assertIsInstance(
+            serialization.deserialize(columnar_data, root_block_usage_key),
+            BlockStructureBlockData,
+        )
@@ -7,9 +7,10 @@ import ddt
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import COLUMNAR_SERIALIZATION, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..serialization import is_columnar
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
@@ -67,6 +68,22 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with self.assertRaises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
+    @ddt.data(True, False)
+    def test_serialization_format(self, columnar):
+        with waffle().override(COLUMNAR_SERIALIZATION, active=columnar):
+            self.store.add(self.block_structure)
+        cached_value = list(self.mock_cache.map.values())[0]
+        self.assertEqual(is_columnar(cached_value), columnar)
+
+        # Data in either format can be read regardless of the switch.
+        with waffle().override(COLUMNAR_SERIALIZATION, active=not columnar):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        self.assertEqual(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+
     def test_uncached_without_storage(self):
         self.store.add(self.block_structure)
         self.mock_cache.map.clear()
@@ -12,7 +12,12 @@ from openedx.core.djangoapps.content.course_overviews.tasks import (
     DEFAULT_ALL_COURSES,
     DEFAULT_CHUNK_SIZE,
     DEFAULT_FORCE_UPDATE,
-    enqueue_async_course_overview_update_tasks
+    FAILED,
+    SKIPPED,
+    UPDATED,
+    enqueue_async_course_overview_update_tasks,
+    get_course_keys,
+    update_course_overviews_in_pool
 )
 
 
@@ -24,6 +29,7 @@ class Command(BaseCommand):
     Example usage:
         $ ./manage.py lms generate_course_overview --all-courses --settings=devstack --chunk-size=100
         $ ./manage.py lms generate_course_overview 'edX/DemoX/Demo_Course' --settings=devstack
+        $ ./manage.py lms generate_course_overview --all-courses --settings=devstack --processes=8
     """
     args = '<course_id course_id ...>'
     help = 'Generates and stores course overview for one or more courses.'
@@ -57,11 +63,24 @@ class Command(BaseCommand):
             dest='routing_key',
             help=u'The celery routing key to use.'
         )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            help=(
+                u'Generate the course overviews in this many local processes instead of celery tasks, '
+                u'skipping the courses that were not published since their overview was generated, '
+                u'unless --force-update is given.'
+            )
+        )
 
     def handle(self, *args, **options):
         if not options.get('all_courses') and len(args) < 1:
             raise CommandError('At least one course or --all-courses must be specified.')
 
+        if options.get('processes'):
+            self._generate_in_pool(args, options)
+            return
+
         kwargs = {}
         for key in ('all_courses', 'force_update', 'chunk_size', 'routing_key'):
             if options.get(key):
@@ -74,3 +93,26 @@ class Command(BaseCommand):
             )
         except InvalidKeyError as exc:
             raise CommandError(u'Invalid Course Key: ' + unicode(exc))
+
+    def _generate_in_pool(self, course_ids, options):
+        """
+        Generates the course overviews in a local pool of processes, and
+        reports the results.
+        """
+        try:
+            course_keys = get_course_keys(course_ids, options.get('all_courses'))
+        except InvalidKeyError as exc:
+            raise CommandError(u'Invalid Course Key: ' + unicode(exc))
+
+        results = update_course_overviews_in_pool(
+            course_keys,
+            options['processes'],
+            force_update=options.get('force_update', DEFAULT_FORCE_UPDATE),
+        )
+        self.stdout.write(
+            u'Processed {} courses in {:.1f}s: {} updated, {} skipped, {} failed.'.format(
+                len(course_keys), results['duration'], results[UPDATED], results[SKIPPED], results[FAILED],
+            )
+        )
+        for course_key_string in results['failed_course_keys']:
+            self.stdout.write(u'Failed: {}'.format(course_key_string))
@@ -3,6 +3,7 @@ Tests that the generate_course_overview management command actually generates co
 """
 from django.core.management.base import CommandError
 from mock import patch
+from six import StringIO
 
 from openedx.core.djangoapps.content.course_overviews.management.commands import generate_course_overview
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
@@ -11,6 +12,25 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
 
+class SynchronousPool(object):
+    """
+    Stand-in for multiprocessing.Pool that runs its tasks in the current
+    process.
+    """
+    def __init__(self, processes, initializer=None, initargs=()):
+        if initializer:
+            initializer(*initargs)
+
+    def imap_unordered(self, func, iterable, chunksize=1):  # pylint: disable=unused-argument
+        return (func(item) for item in iterable)
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
 class TestGenerateCourseOverview(ModuleStoreTestCase):
     """
     Tests course overview management command.
@@ -115,3 +135,22 @@ class TestGenerateCourseOverview(ModuleStoreTestCase):
         }, called_kwargs
         )
         self.assertEqual(1, mock_async_task.apply_async.call_count)
+
+    @patch('openedx.core.djangoapps.content.course_overviews.tasks.connections.close_all')
+    @patch('openedx.core.djangoapps.content.course_overviews.tasks.multiprocessing.Pool', SynchronousPool)
+    def test_generate_in_pool(self, _mock_close_all):
+        self.command.stdout = StringIO()
+        self.command.handle(unicode(self.course_key_1), 'fake/course/id', all_courses=False, processes=2)
+        self._assert_courses_in_overview(self.course_key_1)
+        self._assert_courses_not_in_overview(self.course_key_2)
+        self.assertIn(u'1 updated, 0 skipped, 1 failed', self.command.stdout.getvalue())
+        self.assertIn(u'Failed: fake/course/id', self.command.stdout.getvalue())
+
+        # Courses without an up to date overview are updated, the others skipped.
+        self.command.stdout = StringIO()
+        self.command.handle(all_courses=True, processes=2)
+        self.assertIn(u'1 updated, 1 skipped, 0 failed', self.command.stdout.getvalue())
+
+        self.command.stdout = StringIO()
+        self.command.handle(all_courses=True, force_update=True, processes=2)
+        self.assertIn(u'2 updated, 0 skipped, 0 failed', self.command.stdout.getvalue())
@@ -1,11 +1,14 @@
 """
 Declaration of CourseOverview model
 """
+import cPickle as pickle
 import json
 import logging
 from urlparse import urlparse, urlunparse
+from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
@@ -29,6 +32,14 @@ from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
 
+CACHE_VERSION_KEY = u'course_overviews.version.{course_id}'
+CACHE_KEY = u'course_overviews.overview.{model_version}.{course_id}.{version}'
+
+# Pickled overviews cached in this process, by cache key.  The keys change
+# when the overviews are invalidated, so stale entries are never read.
+_LOCAL_CACHE = {}
+_LOCAL_CACHE_MAX_ENTRIES = 1000
+
 
 class CourseOverview(TimeStampedModel):
     """
@@ -256,6 +267,7 @@ class CourseOverview(TimeStampedModel):
                     )
                     raise
 
+                cls.invalidate_cache(course_id)
                 return course_overview
             elif course is not None:
                 raise IOError(
@@ -288,14 +300,19 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Throw away old versions of CourseOverview, as they might contain stale data.
-                course_overview.delete()
+        course_overview = None
+        if settings.COURSE_OVERVIEW_CACHE_TIMEOUT:
+            course_overview = cls.get_many([course_id]).get(course_id)
+
+        if course_overview is None:
+            try:
+                course_overview = cls.objects.select_related('image_set').get(id=course_id)
+                if course_overview.version < cls.VERSION:
+                    # Throw away old versions of CourseOverview, as they might contain stale data.
+                    course_overview.delete()
+                    course_overview = None
+            except cls.DoesNotExist:
                 course_overview = None
-        except cls.DoesNotExist:
-            course_overview = None
 
         # Regenerate the thumbnail images if they're missing (either because
         # they were never generated, or because they were flushed out after
@@ -317,6 +334,9 @@ class CourseOverview(TimeStampedModel):
         Callers should assume that this list is incomplete and fall back to
         get_from_id if they need to guarantee CourseOverview generation.
         """
+        if settings.COURSE_OVERVIEW_CACHE_TIMEOUT:
+            return cls.get_many(course_ids)
+
         return {
             overview.id: overview
             for overview
@@ -326,6 +346,81 @@ class CourseOverview(TimeStampedModel):
             )
         }
 
+    @classmethod
+    def get_many(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, if they exist,
+        with their tabs and image set loaded.
+
+        The overviews are read through a cache kept in this process and in
+        the default cache for COURSE_OVERVIEW_CACHE_TIMEOUT seconds.  The
+        ones that aren't cached are loaded with one query, and another to
+        prefetch their tabs.  Like get_from_ids_if_exists, this method will
+        *not* generate new CourseOverviews or delete outdated ones.
+        """
+        course_ids = set(course_ids)
+        if not course_ids:
+            return {}
+
+        version_keys = {course_id: CACHE_VERSION_KEY.format(course_id=course_id) for course_id in course_ids}
+        versions = cache.get_many(version_keys.values())
+        new_versions = {key: uuid4().hex for key in version_keys.itervalues() if key not in versions}
+        if new_versions:
+            cache.set_many(new_versions, None)
+            versions.update(new_versions)
+
+        cache_keys = {
+            course_id: CACHE_KEY.format(
+                model_version=cls.VERSION, course_id=course_id, version=versions[version_key],
+            )
+            for course_id, version_key in version_keys.iteritems()
+        }
+        pickled_overviews = {}
+        for cache_key in cache_keys.itervalues():
+            pickled_overview = _LOCAL_CACHE.get(cache_key)
+            if pickled_overview is not None:
+                pickled_overviews[cache_key] = pickled_overview
+        remote_keys = [cache_key for cache_key in cache_keys.itervalues() if cache_key not in pickled_overviews]
+        if remote_keys:
+            remote_overviews = cache.get_many(remote_keys)
+            _cache_locally(remote_overviews)
+            pickled_overviews.update(remote_overviews)
+
+        overviews = {}
+        missing_ids = []
+        for course_id, cache_key in cache_keys.iteritems():
+            if cache_key in pickled_overviews:
+                overviews[course_id] = pickle.loads(pickled_overviews[cache_key])
+            else:
+                missing_ids.append(course_id)
+
+        if missing_ids:
+            new_pickled_overviews = {}
+            query = cls.objects.select_related('image_set').prefetch_related('tabs').filter(
+                id__in=missing_ids,
+                version__gte=cls.VERSION
+            )
+            for overview in query:
+                overviews[overview.id] = overview
+                new_pickled_overviews[cache_keys[overview.id]] = pickle.dumps(overview, pickle.HIGHEST_PROTOCOL)
+            cache.set_many(new_pickled_overviews, settings.COURSE_OVERVIEW_CACHE_TIMEOUT)
+            _cache_locally(new_pickled_overviews)
+
+        return overviews
+
+    @classmethod
+    def invalidate_cache(cls, course_id):
+        """
+        Makes the cached overview of the course unreachable, after it's
+        changed.  The version is changed again when the transaction commits,
+        in case another process cached the old overview in the meantime.
+        """
+        def _bump_version():
+            cache.set(CACHE_VERSION_KEY.format(course_id=course_id), uuid4().hex, None)
+
+        _bump_version()
+        transaction.on_commit(_bump_version)
+
     @classmethod
     def get_from_id_if_exists(cls, course_id):
         """
@@ -706,6 +801,16 @@ class CourseOverview(TimeStampedModel):
         return unicode(self.id)
 
 
+def _cache_locally(pickled_overviews):
+    """
+    Caches the pickled overviews in this process, dropping all the others
+    when there's no room left.
+    """
+    if len(_LOCAL_CACHE) + len(pickled_overviews) > _LOCAL_CACHE_MAX_ENTRIES:
+        _LOCAL_CACHE.clear()
+    _LOCAL_CACHE.update(pickled_overviews)
+
+
 class CourseOverviewTab(models.Model):
     """
     Model for storing and caching tabs information of a course.
@@ -839,6 +944,7 @@ class CourseOverviewImageSet(TimeStampedModel):
             with transaction.atomic():
                 image_set.save()
                 course_overview.image_set = image_set
+            CourseOverview.invalidate_cache(course_overview.id)
         except (IntegrityError, ValueError):
             # In the event of a race condition that tries to save two image sets
             # to the same CourseOverview, we'll just silently pass on the one
@@ -3,6 +3,7 @@ Signal handler for invalidating cached course overviews
 """
 import logging
 
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal
 from django.dispatch.dispatcher import receiver
 
@@ -40,6 +41,16 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     CourseAboutSearchIndexer.remove_deleted_items(course_key)
 
 
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+def _invalidate_cached_course_overview(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached overview of a course when it's saved or deleted
+    outside of the course publish and delete handlers.
+    """
+    CourseOverview.invalidate_cache(instance.id)
+
+
 def _check_for_course_changes(previous_course_overview, updated_course_overview):
     if previous_course_overview:
         _check_for_course_date_changes(previous_course_overview, updated_course_overview)
@@ -1,8 +1,13 @@
 import logging
+import multiprocessing
+import time
+from functools import partial
 
 from celery import task
 from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
 from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
 
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
@@ -19,6 +24,13 @@ DEFAULT_CHUNK_SIZE = 50
 
 DEFAULT_FORCE_UPDATE = False
 
+# Number of courses after which the progress of a local update is logged.
+PROGRESS_LOG_INTERVAL = 100
+
+UPDATED = 'updated'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
 
 def chunks(sequence, chunk_size):
     return (sequence[index: index + chunk_size] for index in xrange(0, len(sequence), chunk_size))
@@ -33,6 +45,16 @@ def _task_options(routing_key):
     return task_options
 
 
+def get_course_keys(course_ids, all_courses=False):
+    """
+    Returns the keys of the given courses, or of all the courses in the
+    modulestore.
+    """
+    if all_courses:
+        return [course.id for course in modulestore().get_course_summaries()]
+    return [CourseKey.from_string(id) for id in course_ids]
+
+
 def enqueue_async_course_overview_update_tasks(
         course_ids,
         all_courses=False,
@@ -40,10 +62,7 @@ def enqueue_async_course_overview_update_tasks(
         chunk_size=DEFAULT_CHUNK_SIZE,
         routing_key=None
 ):
-    if all_courses:
-        course_keys = [course.id for course in modulestore().get_course_summaries()]
-    else:
-        course_keys = [CourseKey.from_string(id) for id in course_ids]
+    course_keys = get_course_keys(course_ids, all_courses)
 
     for course_key_group in chunks(course_keys, chunk_size):
         course_key_strings = [unicode(key) for key in course_key_group]
@@ -60,3 +79,95 @@ def enqueue_async_course_overview_update_tasks(
 def async_course_overview_update(*args, **kwargs):
     course_keys = [CourseKey.from_string(arg) for arg in args]
     CourseOverview.update_select_courses(course_keys, force_update=kwargs['force_update'])
+
+
+def update_course_overviews_in_pool(course_keys, processes, force_update=False, chunk_size=1):
+    """
+    Updates the CourseOverviews of the given courses in a local pool of
+    `processes` processes, logging the throughput as they're updated.
+
+    Unless `force_update` is true, courses with an overview of the current
+    version that was built after the course was last published are skipped.
+
+    Returns a dict of the numbers of courses updated, skipped and failed,
+    the keys of the failed courses, and the duration of the update.
+    """
+    results = {UPDATED: 0, SKIPPED: 0, FAILED: 0, 'failed_course_keys': []}
+    start = time.time()
+
+    # Database connections can't be shared with forked processes, so
+    # they're closed here and each process opens its own.
+    connections.close_all()
+    pool = multiprocessing.Pool(processes, initializer=_init_update_process)
+    try:
+        course_key_strings = [unicode(course_key) for course_key in course_keys]
+        update = partial(_update_course_overview, force_update=force_update)
+        for index, (course_key_string, status) in enumerate(
+                pool.imap_unordered(update, course_key_strings, chunk_size), 1
+        ):
+            results[status] += 1
+            if status == FAILED:
+                results['failed_course_keys'].append(course_key_string)
+            if index % PROGRESS_LOG_INTERVAL == 0:
+                _log_update_progress(index, len(course_key_strings), results, start)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    results['duration'] = time.time() - start
+    _log_update_progress(len(course_keys), len(course_keys), results, start)
+    return results
+
+
+def _log_update_progress(num_done, num_courses, results, start):
+    """
+    Logs the progress of update_course_overviews_in_pool.
+    """
+    duration = time.time() - start
+    log.info(
+        u'Processed %d of %d course overviews in %.1fs (%.1f courses/s): %d updated, %d skipped, %d failed.',
+        num_done, num_courses, duration, num_done / duration if duration else 0,
+        results[UPDATED], results[SKIPPED], results[FAILED],
+    )
+
+
+def _init_update_process():
+    """
+    Initializes a process of an update_course_overviews_in_pool pool.
+    """
+    # Cache connections inherited from the parent process can't be shared
+    # either, so they're closed and reopened by this process as needed.
+    for cache in caches.all():
+        cache.close()
+
+
+def _update_course_overview(course_key_string, force_update):
+    """
+    Updates the CourseOverview of the course, unless it's up to date and
+    `force_update` is false.
+
+    Returns a tuple of (course_key_string, status).
+    """
+    course_key = CourseKey.from_string(course_key_string)
+    try:
+        with modulestore().bulk_operations(course_key):
+            if not force_update and _course_overview_is_current(course_key):
+                return course_key_string, SKIPPED
+            CourseOverview.load_from_module_store(course_key)
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u'An error occurred while generating course overview for %s', course_key_string)
+        return course_key_string, FAILED
+    return course_key_string, UPDATED
+
+
+def _course_overview_is_current(course_key):
+    """
+    Returns whether the course has an overview of the current version that
+    was built after the course was last published.
+    """
+    course_overview = CourseOverview.get_from_id_if_exists(course_key)
+    if course_overview is None:
+        return False
+    course = modulestore().get_course(course_key)
+    edited_on = getattr(course, 'subtree_edited_on', None)
+    return edited_on is not None and edited_on <= course_overview.modified
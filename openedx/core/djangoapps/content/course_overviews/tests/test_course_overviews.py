@@ -544,6 +544,29 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         self.assertEqual(len(course_ids_to_overviews), 1)
         self.assertIn(course_with_overview_1.id, course_ids_to_overviews)
 
+    @override_settings(COURSE_OVERVIEW_CACHE_TIMEOUT=60)
+    def test_get_many_cached(self):
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(2)]
+
+        # One query for the overviews and their image sets, one for their tabs.
+        with self.assertNumQueries(2):
+            overviews = CourseOverview.get_many(course_ids)
+        self.assertEqual(set(overviews), set(course_ids))
+
+        with self.assertNumQueries(0):
+            cached_overviews = CourseOverview.get_many(course_ids)
+            self.assertEqual(
+                [tab.tab_id for tab in cached_overviews[course_ids[0]].tabs.all()],
+                [tab.tab_id for tab in overviews[course_ids[0]].tabs.all()],
+            )
+
+        # Saving an overview invalidates its cached copy only.
+        overview = cached_overviews[course_ids[0]]
+        overview.display_name = u'New name'
+        overview.save()
+        with self.assertNumQueries(2):
+            self.assertEqual(CourseOverview.get_many(course_ids)[course_ids[0]].display_name, u'New name')
+
     def test_get_from_id_if_exists(self):
         course_with_overview = CourseFactory.create(emit_signals=True)
         course_id_to_overview = CourseOverview.get_from_id_if_exists(course_with_overview.id)
@@ -1,12 +1,29 @@
 """
 Helper functions for caching course assets.
+
+Small assets are cached in memory, as StaticContent objects in the
+"course_assets" django cache.  Larger assets can be cached as files on the
+local disk of each server by an AssetDiskCache, when
+COURSE_ASSETS_DISK_CACHE['PATH'] is set, so that they're served from disk
+rather than streamed from the contentstore on each request.  Assets are
+written to the disk cache while they're streamed to the first client that
+requests them.
 """
+import logging
+import os
+import sqlite3
+import tempfile
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
+from openedx.core.lib.sqlite_lru import SQLiteLRUIndex
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
 
+log = logging.getLogger(__name__)
+
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
 try:
@@ -48,3 +65,160 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+
+
+class AssetDiskCache(object):
+    """
+    A cache of course asset files on the local disk, addressed by the digest
+    of their content, so that new versions of an asset never collide with
+    old ones and identical assets of different courses are stored once.
+
+    The files are stored under `path`, and indexed by a SQLiteLRUIndex
+    there, which records their sizes, when they were last used and how many
+    times they've been served.  When the total size of the files grows
+    beyond `max_size` bytes, the least recently used ones are evicted.
+    Assets larger than `max_asset_size` bytes aren't cached.
+
+    The cache may be shared by all the processes on a server.  Errors are
+    logged and treated as cache misses.
+    """
+    def __init__(self, path, max_size, max_asset_size):
+        self.path = path
+        self.max_size = max_size
+        self.max_asset_size = max_asset_size
+        self._index = SQLiteLRUIndex(os.path.join(path, 'index.sqlite'), 'assets', max_size)
+
+    def can_store(self, digest, length):
+        """
+        Returns whether an asset with the given digest and length can be cached.
+        """
+        return bool(digest) and digest.isalnum() and length is not None and length <= self.max_asset_size
+
+    def open(self, digest):
+        """
+        Returns the cached file of the asset with the given digest, opened
+        for reading, or None.  Counts a hit for the asset.
+        """
+        if not os.path.isdir(self.path):
+            return None
+        try:
+            if self._index.get(digest) is None:
+                return None
+        except sqlite3.Error:
+            log.exception(u'Unable to read from the asset disk cache at %s', self.path)
+            return None
+
+        try:
+            return open(self._file_path(digest), 'rb')
+        except IOError:
+            # The file was removed since the index was read.
+            return None
+
+    def fill(self, digest, chunks):
+        """
+        Yields the chunks of the asset with the given digest, while writing
+        them to its cache file, so that the asset is streamed to the client
+        as it's cached.  The file is added to the cache, evicting old files
+        if needed, once all the chunks have been written.  If the chunks
+        aren't all consumed, e.g. because the client went away, or can't
+        be written, nothing is cached.
+        """
+        file_path = self._file_path(digest)
+        temp_file = None
+        try:
+            if not os.path.isdir(os.path.dirname(file_path)):
+                os.makedirs(os.path.dirname(file_path))
+            temp_file = tempfile.NamedTemporaryFile(dir=os.path.dirname(file_path), delete=False)
+        except (IOError, OSError):
+            log.exception(u'Unable to write to the asset disk cache at %s', self.path)
+
+        try:
+            size = 0
+            for chunk in chunks:
+                if temp_file is not None:
+                    try:
+                        temp_file.write(chunk)
+                    except (IOError, OSError):
+                        log.exception(u'Unable to write to the asset disk cache at %s', self.path)
+                        self._discard(temp_file)
+                        temp_file = None
+                size += len(chunk)
+                yield chunk
+
+            if temp_file is not None:
+                self._add(digest, temp_file, size)
+                temp_file = None
+        finally:
+            if temp_file is not None:
+                self._discard(temp_file)
+
+    def hits(self, digest):
+        """
+        Returns how many times the asset with the given digest was served from the cache.
+        """
+        return self._index.hits(digest)
+
+    def size(self):
+        """
+        Returns the total size of the cached files, in bytes.
+        """
+        return self._index.total_size()
+
+    def _file_path(self, digest):
+        """
+        Returns the path of the cache file of the asset with the given digest.
+        """
+        return os.path.join(self.path, digest[:2], digest)
+
+    def _add(self, digest, temp_file, size):
+        """
+        Moves the complete temporary file of the asset with the given digest
+        into place, indexes it and evicts old files if needed.
+        """
+        try:
+            temp_file.close()
+            # Renaming is atomic, so other processes never read partial files.
+            os.rename(temp_file.name, self._file_path(digest))
+            evicted_digests = self._index.put(digest, size)
+        except (IOError, OSError, sqlite3.Error):
+            log.exception(u'Unable to write to the asset disk cache at %s', self.path)
+            self._discard(temp_file)
+            return
+
+        for evicted_digest in evicted_digests:
+            # Processes serving the file keep reading it after it's removed.
+            try:
+                os.remove(self._file_path(evicted_digest))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _discard(temp_file):
+        """
+        Closes and removes the given temporary file, if it still exists.
+        """
+        temp_file.close()
+        try:
+            os.remove(temp_file.name)
+        except OSError:
+            pass
+
+
+_ASSET_DISK_CACHES = {}
+
+
+def get_asset_disk_cache():
+    """
+    Returns the AssetDiskCache configured by COURSE_ASSETS_DISK_CACHE, or
+    None if it's disabled.
+    """
+    disk_cache_settings = getattr(settings, 'COURSE_ASSETS_DISK_CACHE', {})
+    path = disk_cache_settings.get('PATH')
+    if not path:
+        return None
+
+    if path not in _ASSET_DISK_CACHES:
+        _ASSET_DISK_CACHES[path] = AssetDiskCache(
+            path, disk_cache_settings['MAX_SIZE'], disk_cache_settings['MAX_ASSET_SIZE'],
+        )
+    return _ASSET_DISK_CACHES[path]
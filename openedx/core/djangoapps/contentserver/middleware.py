@@ -10,18 +10,18 @@ try:
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
 from django.http import (
-    HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect, StreamingHttpResponse)
 from six import text_type
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import get_asset_disk_cache, get_cached_content, set_cached_content
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -115,6 +115,12 @@ class StaticContentServer(object):
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
+            # Assets that aren't cached in memory are served from the local disk cache,
+            # rather than streamed from the contentstore.
+            cached_file = disk_cache = None
+            if isinstance(content, StaticContentStream):
+                content, cached_file, disk_cache = self.load_asset_from_disk_cache(content)
+
             # *** File streaming within a byte range ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
@@ -122,55 +128,71 @@ class StaticContentServer(object):
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
-            if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
-                header_value = request.META['HTTP_RANGE']
-                try:
-                    unit, ranges = parse_range_header(header_value, content.length)
-                except ValueError as exception:
-                    # If the header field is syntactically invalid it should be ignored.
-                    log.exception(
-                        u"%s in Range header: %s for content: %s", text_type(exception), header_value, unicode(loc)
-                    )
-                else:
-                    if unit != 'bytes':
-                        # Only accept ranges in bytes
-                        log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
+            try:
+                if request.META.get('HTTP_RANGE'):
+                    # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
+                    if not isinstance(content, StaticContentStream):
+                        content = AssetManager.find(loc, as_stream=True)
+
+                    header_value = request.META['HTTP_RANGE']
+                    try:
+                        unit, ranges = parse_range_header(header_value, content.length)
+                    except ValueError as exception:
+                        # If the header field is syntactically invalid it should be ignored.
+                        log.exception(
+                            u"%s in Range header: %s for content: %s", text_type(exception), header_value, unicode(loc)
                         )
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
-                            response['Content-Range'] = b'bytes {first}-{last}/{length}'.format(
-                                first=first, last=last, length=content.length
+                        if unit != 'bytes':
+                            # Only accept ranges in bytes
+                            log.warning(
+                                u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc)
                             )
-                            response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
+                        elif len(ranges) > 1:
+                            # According to Http/1.1 spec content for multiple ranges should be sent as a
+                            # multipart message.
+                            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+                            # But we send back the full content.
                             log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s",
-                                header_value, text_type(loc)
+                                u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
                             )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
-
-            # If Range header is absent or syntactically invalid return a full content response.
-            if response is None:
-                response = HttpResponse(content.stream_data())
-                response['Content-Length'] = content.length
+                        else:
+                            first, last = ranges[0]
+
+                            if 0 <= first <= last < content.length:
+                                # If the byte range is satisfiable
+                                response = HttpResponse(content.stream_data_in_range(first, last))
+                                response['Content-Range'] = b'bytes {first}-{last}/{length}'.format(
+                                    first=first, last=last, length=content.length
+                                )
+                                response['Content-Length'] = str(last - first + 1)
+                                response.status_code = 206  # Partial Content
+
+                                if newrelic:
+                                    newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                            else:
+                                log.warning(
+                                    u"Cannot satisfy ranges in Range header: %s for content: %s",
+                                    header_value, text_type(loc)
+                                )
+                                return HttpResponse(status=416)  # Requested Range Not Satisfiable
+
+                # If Range header is absent or syntactically invalid return a full content response.
+                if response is None:
+                    if cached_file is not None:
+                        # Lets the server send the file without copying it through Python.
+                        response = FileResponse(cached_file)
+                        # The response closes the file once it's sent.
+                        cached_file = None
+                    elif disk_cache is not None:
+                        # Streams the asset to the client while it's written to the disk cache.
+                        response = StreamingHttpResponse(disk_cache.fill(content.content_digest, content.stream_data()))
+                    else:
+                        response = HttpResponse(content.stream_data())
+                    response['Content-Length'] = content.length
+            finally:
+                if cached_file is not None:
+                    cached_file.close()
 
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
@@ -292,6 +314,34 @@ class StaticContentServer(object):
 
         return content
 
+    def load_asset_from_disk_cache(self, content):
+        """
+        Returns the given streamed asset, its file in the local disk cache and
+        the disk cache.  If the asset's file is cached, the returned content
+        streams from the file rather than the contentstore.  Otherwise, the file
+        is None, and the disk cache is returned for the asset to be written to
+        it as it's streamed.  The disk cache is None if it's disabled or the
+        asset can't be cached.
+        """
+        disk_cache = get_asset_disk_cache()
+        if disk_cache is None or not disk_cache.can_store(content.content_digest, content.length):
+            return content, None, None
+
+        cached_file = disk_cache.open(content.content_digest)
+        if newrelic:
+            newrelic.agent.add_custom_parameter('contentserver.disk_cache_hit', cached_file is not None)
+        if cached_file is None:
+            return content, None, disk_cache
+
+        content.close()
+        content = StaticContentStream(
+            content.location, content.name, content.content_type, cached_file,
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked,
+            content_digest=content.content_digest,
+        )
+        return content, cached_file, disk_cache
+
 
 def parse_range_header(header_value, content_length):
     """
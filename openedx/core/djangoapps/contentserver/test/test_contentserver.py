@@ -6,10 +6,14 @@ import copy
 import datetime
 import ddt
 import logging
+import os.path
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
 from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -27,6 +31,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import AssetDiskCache, get_asset_disk_cache
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -402,6 +407,95 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         is_from_cdn = StaticContentServer.is_cdn_request(browser_request)
         self.assertEqual(is_from_cdn, True)
 
+    def test_disk_cache(self):
+        """
+        Test that streamed assets are stored in the disk cache, and served from there.
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        disk_cache_settings = {'PATH': temp_dir, 'MAX_SIZE': 1024 * 1024, 'MAX_ASSET_SIZE': 1024 * 1024}
+        content = AssetManager.find(self.unlocked_asset)
+
+        def load_asset_as_stream(_, location):
+            """Skip the memory cache, which holds the small assets of the toy course."""
+            return AssetManager.find(location, as_stream=True)
+
+        with override_settings(COURSE_ASSETS_DISK_CACHE=disk_cache_settings):
+            with patch.dict('openedx.core.djangoapps.contentserver.caching._ASSET_DISK_CACHES', clear=True):
+                with patch.object(StaticContentServer, 'load_asset_from_location', load_asset_as_stream):
+                    response_classes = []
+                    for _ in range(3):
+                        response = self.client.get(self.url_unlocked)
+                        self.assertEqual(response.status_code, 200)
+                        self.assertEqual(b''.join(response.streaming_content), content.data)
+                        self.assertEqual(response['Content-Length'], str(self.length_unlocked))
+                        response_classes.append(type(response))
+                    ranged_response = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+
+                    self.assertEqual(ranged_response.status_code, 206)
+                    self.assertEqual(ranged_response.content, content.data[:10])
+
+                    # The first request streamed the asset while storing it, and the
+                    # others were served from its file.
+                    self.assertEqual(response_classes, [StreamingHttpResponse, FileResponse, FileResponse])
+                    self.assertEqual(get_asset_disk_cache().hits(content.content_digest), 3)
+                    self.assertTrue(os.path.exists(
+                        os.path.join(temp_dir, content.content_digest[:2], content.content_digest)
+                    ))
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for the AssetDiskCache.
+    """
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_fill_and_open(self):
+        disk_cache = AssetDiskCache(self.temp_dir, max_size=1024 * 1024, max_asset_size=1024)
+        self.assertIsNone(disk_cache.open(FAKE_MD5_HASH))
+        chunks = disk_cache.fill(FAKE_MD5_HASH, [b'first chunk, ', b'second chunk'])
+        self.assertEqual(next(chunks), b'first chunk, ')
+        # The asset isn't cached until all of its chunks were streamed.
+        self.assertIsNone(disk_cache.open(FAKE_MD5_HASH))
+        self.assertEqual(list(chunks), [b'second chunk'])
+
+        with disk_cache.open(FAKE_MD5_HASH) as cached_file:
+            self.assertEqual(cached_file.read(), b'first chunk, second chunk')
+        self.assertEqual(disk_cache.hits(FAKE_MD5_HASH), 1)
+
+    def test_interrupted_fill(self):
+        disk_cache = AssetDiskCache(self.temp_dir, max_size=1024 * 1024, max_asset_size=1024)
+        chunks = disk_cache.fill(FAKE_MD5_HASH, [b'first chunk, ', b'second chunk'])
+        next(chunks)
+        chunks.close()
+
+        self.assertIsNone(disk_cache.open(FAKE_MD5_HASH))
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, FAKE_MD5_HASH[:2])), [])
+
+    def test_can_store(self):
+        disk_cache = AssetDiskCache(self.temp_dir, max_size=1024 * 1024, max_asset_size=1024)
+        self.assertTrue(disk_cache.can_store(FAKE_MD5_HASH, 1024))
+        self.assertFalse(disk_cache.can_store(FAKE_MD5_HASH, 1025))
+        self.assertFalse(disk_cache.can_store(FAKE_MD5_HASH, None))
+        self.assertFalse(disk_cache.can_store(None, 1024))
+        self.assertFalse(disk_cache.can_store('../../etc', 1024))
+
+    def test_evicts_least_recently_used(self):
+        disk_cache = AssetDiskCache(self.temp_dir, max_size=3500, max_asset_size=1024)
+        for digest in ('aaaa', 'bbbb', 'cccc'):
+            list(disk_cache.fill(digest, [b'x' * 1000]))
+        disk_cache.open('aaaa').close()
+
+        list(disk_cache.fill('dddd', [b'x' * 1000]))
+        self.assertLessEqual(disk_cache.size(), 3500)
+        self.assertIsNone(disk_cache.open('bbbb'))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'bb', 'bbbb')))
+        for digest in ('aaaa', 'cccc', 'dddd'):
+            disk_cache.open(digest).close()
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
@@ -0,0 +1,82 @@
+"""
+A short-lived cache of the comments service's thread listings and details.
+
+Cached responses are keyed by the request and by version tokens of the course
+or thread they describe, and of the requesting user's view of it (read and
+followed state).  Bumping a version with invalidate() makes all the responses
+cached under the previous one unreachable, so writes don't have to know which
+queries they affect.
+
+The cache is disabled unless COMMENTS_SERVICE_CACHE_TIMEOUT is positive.
+"""
+import hashlib
+import json
+from uuid import uuid4
+
+from django.core.cache import cache as django_cache
+
+from .settings import CACHE_TIMEOUT
+
+KEY_PREFIX = 'comment_client'
+
+
+def version_key(kind, object_id, user_id=None):
+    """
+    Returns the cache key of the version of a course or thread (`kind`), or
+    of the user's view of it when `user_id` is given.
+    """
+    key = u'{}.version.{}.{}'.format(KEY_PREFIX, kind, object_id)
+    if user_id is not None:
+        key = u'{}.{}'.format(key, user_id)
+    return key
+
+
+def get_response(version_keys, request_parts, perform_request):
+    """
+    Returns the cached response of the request, or performs it with
+    `perform_request` and caches its response under the current versions.
+    """
+    if not CACHE_TIMEOUT:
+        return perform_request()
+
+    # Version keys live until they're evicted, entries expire after the timeout.
+    versions = django_cache.get_many(version_keys)
+    new_versions = {key: uuid4().hex for key in version_keys if key not in versions}
+    if new_versions:
+        django_cache.set_many(new_versions, None)
+        versions.update(new_versions)
+
+    key_source = json.dumps([[versions[key] for key in version_keys], request_parts], sort_keys=True)
+    key = u'{}.response.{}'.format(KEY_PREFIX, hashlib.md5(key_source).hexdigest())
+    response = django_cache.get(key)
+    if response is None:
+        response = perform_request()
+        django_cache.set(key, response, CACHE_TIMEOUT)
+    return response
+
+
+def invalidate(*version_keys):
+    """
+    Makes the responses cached under these versions unreachable.
+    """
+    if CACHE_TIMEOUT:
+        django_cache.set_many({key: uuid4().hex for key in version_keys}, None)
+
+
+def invalidate_post(post):
+    """
+    Makes the cached listings of the course of the post, a thread or comment,
+    and the cached details of its thread unreachable.  Called once a write to
+    the post has succeeded.
+    """
+    thread_id = post.id if post.type == 'thread' else post.get('thread_id')
+    invalidate(version_key('course', post.get('course_id')), version_key('thread', thread_id))
+
+
+def invalidate_user_view(user_id, source):
+    """
+    Makes the user's cached listings of the course of the source, a thread,
+    and cached details of the source unreachable.  Called once a write to
+    the user's read or followed state has succeeded.
+    """
+    invalidate(version_key(source.type, source.id, user_id), version_key('course', source.get('course_id'), user_id))
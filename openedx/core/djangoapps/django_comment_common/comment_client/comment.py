@@ -1,5 +1,5 @@
 # pylint: disable=missing-docstring,protected-access
-from openedx.core.djangoapps.django_comment_common.comment_client import models, settings
+from openedx.core.djangoapps.django_comment_common.comment_client import cache, models, settings
 
 from .thread import Thread, _url_for_flag_abuse_thread, _url_for_unflag_abuse_thread
 from .utils import CommentClientRequestError, perform_request
@@ -58,6 +58,14 @@ class Comment(models.Model):
         else:
             return super(Comment, cls).url(action, params)
 
+    @classmethod
+    def after_save(cls, instance):
+        cache.invalidate_post(instance)
+
+    def delete(self):
+        super(Comment, self).delete()
+        cache.invalidate_post(self)
+
     def flagAbuse(self, user, voteable):
         if voteable.type == 'thread':
             url = _url_for_flag_abuse_thread(voteable.id)
@@ -74,6 +82,7 @@ class Comment(models.Model):
             metric_action='comment.abuse.flagged'
         )
         voteable._update_from_response(response)
+        cache.invalidate_post(voteable)
 
     def unFlagAbuse(self, user, voteable, removeAll):
         if voteable.type == 'thread':
@@ -95,6 +104,7 @@ class Comment(models.Model):
             metric_action='comment.abuse.unflagged'
         )
         voteable._update_from_response(response)
+        cache.invalidate_post(voteable)
 
 
 def _url_for_thread_comments(thread_id):
@@ -7,3 +7,7 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+POOL_SIZE = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 0)
+CONCURRENT_REQUESTS = getattr(settings, 'COMMENTS_SERVICE_CONCURRENT_REQUESTS', 0)
+CACHE_TIMEOUT = getattr(settings, 'COMMENTS_SERVICE_CACHE_TIMEOUT', 0)
@@ -2,6 +2,7 @@
 import logging
 
 from eventtracking import tracker
+from . import cache
 from . import models
 from . import settings
 from . import utils
@@ -65,13 +66,20 @@ class Thread(models.Model):
             url = cls.url(action='get_all', params=utils.extract(params, 'commentable_id'))
             if params.get('commentable_id'):
                 del params['commentable_id']
-        response = utils.perform_request(
-            'get',
-            url,
-            params,
-            metric_tags=[u'course_id:{}'.format(query_params['course_id'])],
-            metric_action='thread.search',
-            paged_results=True
+        response = cache.get_response(
+            [
+                cache.version_key('course', params['course_id']),
+                cache.version_key('course', params['course_id'], params.get('user_id')),
+            ],
+            [url, params],
+            lambda: utils.perform_request(
+                'get',
+                url,
+                params,
+                metric_tags=[u'course_id:{}'.format(query_params['course_id'])],
+                metric_action='thread.search',
+                paged_results=True
+            )
         )
         if query_params.get('text'):
             search_query = query_params['text']
@@ -137,6 +145,14 @@ class Thread(models.Model):
         else:
             return super(Thread, cls).url(action, params)
 
+    @classmethod
+    def after_save(cls, instance):
+        cache.invalidate_post(instance)
+
+    def delete(self):
+        super(Thread, self).delete()
+        cache.invalidate_post(self)
+
     # TODO: This is currently overriding Model._retrieve only to add parameters
     # for the request. Model._retrieve should be modified to handle this such
     # that subclasses don't need to override for this.
@@ -152,13 +168,30 @@ class Thread(models.Model):
         }
         request_params = utils.strip_none(request_params)
 
-        response = utils.perform_request(
-            'get',
-            url,
-            request_params,
-            metric_action='model.retrieve',
-            metric_tags=self._metric_tags
-        )
+        def _perform_request():
+            return utils.perform_request(
+                'get',
+                url,
+                request_params,
+                metric_action='model.retrieve',
+                metric_tags=self._metric_tags
+            )
+
+        user_id = request_params.get('user_id')
+        if request_params['mark_as_read']:
+            response = _perform_request()
+            if user_id is not None:
+                # The thread and the course's thread listings are now read by the user.
+                cache.invalidate(
+                    cache.version_key('thread', self.id, user_id),
+                    cache.version_key('course', response.get('course_id'), user_id),
+                )
+        else:
+            response = cache.get_response(
+                [cache.version_key('thread', self.id), cache.version_key('thread', self.id, user_id)],
+                [url, request_params],
+                _perform_request,
+            )
         self._update_from_response(response)
 
     def flagAbuse(self, user, voteable):
@@ -175,6 +208,7 @@ class Thread(models.Model):
             metric_tags=self._metric_tags
         )
         voteable._update_from_response(response)
+        cache.invalidate_post(voteable)
 
     def unFlagAbuse(self, user, voteable, removeAll):
         if voteable.type == 'thread':
@@ -194,6 +228,7 @@ class Thread(models.Model):
             metric_action='thread.abuse.unflagged'
         )
         voteable._update_from_response(response)
+        cache.invalidate_post(voteable)
 
     def pin(self, user, thread_id):
         url = _url_for_pin_thread(thread_id)
@@ -206,6 +241,7 @@ class Thread(models.Model):
             metric_action='thread.pin'
         )
         self._update_from_response(response)
+        cache.invalidate_post(self)
 
     def un_pin(self, user, thread_id):
         url = _url_for_un_pin_thread(thread_id)
@@ -218,6 +254,7 @@ class Thread(models.Model):
             metric_action='thread.unpin'
         )
         self._update_from_response(response)
+        cache.invalidate_post(self)
 
 
 def _url_for_flag_abuse_thread(thread_id):
@@ -2,6 +2,7 @@
 """ User model wrapper for comment service"""
 from six import text_type
 
+from . import cache
 from . import models
 from . import settings
 from . import utils
@@ -44,6 +45,7 @@ class User(models.Model):
             metric_action='user.read',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        cache.invalidate_user_view(self.id, source)
 
     def follow(self, source):
         params = {'source_type': source.type, 'source_id': source.id}
@@ -54,6 +56,7 @@ class User(models.Model):
             metric_action='user.follow',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        cache.invalidate_user_view(self.id, source)
 
     def unfollow(self, source):
         params = {'source_type': source.type, 'source_id': source.id}
@@ -64,6 +67,7 @@ class User(models.Model):
             metric_action='user.unfollow',
             metric_tags=self._metric_tags + ['target.type:{}'.format(source.type)],
         )
+        cache.invalidate_user_view(self.id, source)
 
     def vote(self, voteable, value):
         if voteable.type == 'thread':
@@ -81,6 +85,7 @@ class User(models.Model):
             metric_tags=self._metric_tags + ['target.type:{}'.format(voteable.type)],
         )
         voteable._update_from_response(response)
+        cache.invalidate_post(voteable)
 
     def unvote(self, voteable):
         if voteable.type == 'thread':
@@ -98,6 +103,7 @@ class User(models.Model):
             metric_tags=self._metric_tags + ['target.type:{}'.format(voteable.type)],
         )
         voteable._update_from_response(response)
+        cache.invalidate_post(voteable)
 
     def active_threads(self, query_params=None):
         if query_params is None:
@@ -1,15 +1,36 @@
 # pylint: disable=missing-docstring,unused-argument,broad-except
 """" Common utilities for comment client wrapper """
 import logging
+import os
+import sys
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 from uuid import uuid4
 
 import requests
-from django.utils.translation import get_language
-
+import six
+from django.db import connections
+from django.utils.translation import get_language, override
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
+from requests.adapters import HTTPAdapter
+
+from .settings import CONCURRENT_REQUESTS, POOL_SIZE
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+REQUEST_TIMES_NAMESPACE = 'comment_client.request_times'
+
+_SESSION = None
+_SESSION_PID = None
+_THREAD_POOL = None
+_THREAD_POOL_PID = None
+
+# The request times of the calls of perform_concurrently running in the current thread.
+_WORKER = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -52,6 +73,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
     }
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
+    session = _get_session()
 
     if method in ['post', 'put', 'patch']:
         data = data_or_params
@@ -60,7 +82,8 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
+    start_time = time.time()
+    response = (session or requests).request(
         method,
         url,
         data=data,
@@ -68,6 +91,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         headers=headers,
         timeout=config.connection_timeout
     )
+    _record_request_time(metric_action or u'unknown', time.time() - start_time)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
@@ -98,6 +122,107 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def _get_session():
+    """
+    Returns the requests session of the current process, which keeps a pool
+    of persistent connections to the comments service, or None if the pool
+    is disabled.
+    """
+    global _SESSION, _SESSION_PID  # pylint: disable=global-statement
+    if not POOL_SIZE:
+        return None
+    # Connections can't be shared with a forked process.
+    if _SESSION is None or _SESSION_PID != os.getpid():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _SESSION, _SESSION_PID = session, os.getpid()
+    return _SESSION
+
+
+def _get_thread_pool():
+    """
+    Returns the pool of threads of the current process making comments
+    service requests in parallel, or None if concurrent requests are disabled.
+    """
+    global _THREAD_POOL, _THREAD_POOL_PID  # pylint: disable=global-statement
+    if not CONCURRENT_REQUESTS:
+        return None
+    if _THREAD_POOL is None or _THREAD_POOL_PID != os.getpid():
+        _THREAD_POOL, _THREAD_POOL_PID = ThreadPool(CONCURRENT_REQUESTS), os.getpid()
+    return _THREAD_POOL
+
+
+def _record_request_time(metric_action, duration):
+    """
+    Adds the duration of a comments service request to the number and total
+    time of the requests of its action in the current request, which are
+    set as custom metrics.
+    """
+    worker_request_times = getattr(_WORKER, 'request_times', None)
+    if worker_request_times is not None:
+        # Recorded by perform_concurrently, in the thread of the request.
+        worker_request_times.append((metric_action, duration))
+        return
+
+    request_times = RequestCache(REQUEST_TIMES_NAMESPACE).data
+    count, total = request_times.get(metric_action, (0, 0))
+    request_times[metric_action] = count, total = count + 1, total + duration
+    set_custom_metric(u'forums.{}.count'.format(metric_action), count)
+    set_custom_metric(u'forums.{}.time_ms'.format(metric_action), int(total * 1000))
+
+
+def _call_in_worker(func, language):
+    """
+    Calls the function in a thread of the pool, with the language of the
+    request.  Returns whether it succeeded, its result or exception info, and
+    the times of the comments service requests it made.
+    """
+    _WORKER.request_times = request_times = []
+    try:
+        with override(language):
+            return True, func(), request_times
+    except Exception:
+        return False, sys.exc_info(), request_times
+    finally:
+        _WORKER.request_times = None
+        # The database connections of the thread would never be closed otherwise.
+        for connection in connections.all():
+            connection.close()
+
+
+def perform_concurrently(*funcs):
+    """
+    Calls the functions, which should each make independent comments service
+    requests, and returns the list of their results.
+
+    The functions are called in parallel threads if
+    COMMENTS_SERVICE_CONCURRENT_REQUESTS is set, and sequentially otherwise.
+    If any function raises an exception, the exception of the first of them
+    is raised once they've all returned.
+    """
+    pool = _get_thread_pool()
+    if pool is None or len(funcs) < 2:
+        return [func() for func in funcs]
+
+    language = get_language()
+    async_results = [pool.apply_async(_call_in_worker, (func, language)) for func in funcs]
+    results = []
+    error = None
+    for async_result in async_results:
+        succeeded, result, request_times = async_result.get()
+        for metric_action, duration in request_times:
+            _record_request_time(metric_action, duration)
+        if succeeded:
+            results.append(result)
+        elif error is None:
+            error = result
+    if error is not None:
+        six.reraise(*error)
+    return results
+
+
 class CommentClientError(Exception):
     pass
 
@@ -137,6 +137,26 @@ class WaffleSwitchNamespace(WaffleNamespace):
             self._cached_switches[namespaced_switch_name] = value
         return value
 
+    def prefetch(self, *switch_names):
+        """
+        Caches whether each of the given waffle switches is enabled, reading
+        the switches that aren't cached yet with a single query.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from waffle.models import Switch
+        namespaced_switch_names = [
+            namespaced_switch_name
+            for namespaced_switch_name in (self._namespaced_name(switch_name) for switch_name in switch_names)
+            if self._cached_switches.get(namespaced_switch_name) is None
+        ]
+        if not namespaced_switch_names:
+            return
+        active_switch_names = set(
+            Switch.objects.filter(name__in=namespaced_switch_names, active=True).values_list('name', flat=True)
+        )
+        for namespaced_switch_name in namespaced_switch_names:
+            self._cached_switches[namespaced_switch_name] = namespaced_switch_name in active_switch_names
+
     @contextmanager
     def override(self, switch_name, active=True):
         """
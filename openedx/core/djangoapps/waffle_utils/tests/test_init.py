@@ -8,7 +8,7 @@ from django.test.client import RequestFactory
 from edx_django_utils.cache import RequestCache
 from mock import patch
 from opaque_keys.edx.keys import CourseKey
-from waffle.testutils import override_flag
+from waffle.testutils import override_flag, override_switch
 
 from .. import CourseWaffleFlag, WaffleFlagNamespace, WaffleSwitchNamespace, WaffleSwitch
 from ..models import WaffleFlagCourseOverrideModel
@@ -132,3 +132,16 @@ class TestWaffleSwitch(TestCase):
         expected = self.NAMESPACE_NAME + "." + self.WAFFLE_SWITCH_NAME
         actual = self.WAFFLE_SWITCH.namespaced_switch_name
         self.assertEqual(actual, expected)
+
+    def test_prefetch(self):
+        """
+        Verify prefetch caches the given switches with a single query
+        """
+        RequestCache.clear_all_namespaces()
+        with override_switch(self.WAFFLE_SWITCH.namespaced_switch_name, True):
+            with self.assertNumQueries(1):
+                self.TEST_NAMESPACE.prefetch(self.WAFFLE_SWITCH_NAME, 'other_switch_name')
+            with self.assertNumQueries(0):
+                self.assertTrue(self.WAFFLE_SWITCH.is_enabled())
+                self.assertFalse(self.TEST_NAMESPACE.is_enabled('other_switch_name'))
+                self.TEST_NAMESPACE.prefetch(self.WAFFLE_SWITCH_NAME)
@@ -0,0 +1,198 @@
+"""
+A least recently used index of entries in a SQLite database on the local disk.
+
+Local disk caches, such as the safe_exec result cache and the course asset
+disk cache, are shared by all the processes of a server and use a
+`SQLiteLRUIndex` to record the sizes of their entries and when they were
+last used, and to evict the least recently used entries when the total size
+grows beyond a maximum.
+
+The database uses write-ahead logging, so that reads don't wait for writes.
+Lookups are only ever reads: the times and counts of accesses are buffered in
+each process and written in batches, and the total size of the entries is
+kept up to date on each write rather than computed by scanning the table.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteLRUIndex(object):
+    """
+    An index of entries, keyed by text, in the `table` of the SQLite database
+    at `path`.
+
+    Each entry has a size, the time it was last accessed and the number of
+    times it was accessed.  `extra_columns` is a sequence of (name, type)
+    pairs of columns stored along with them, such as the value of the entry.
+
+    When the total size of the entries grows beyond `max_size`, the least
+    recently used entries are deleted.  Each process and thread uses its own
+    connection to the database.
+    """
+    # The fraction of max_size to evict down to, so that evictions aren't
+    # needed again on each following write.
+    EVICTION_TARGET = 0.9
+
+    # The number of seconds, and of buffered accesses, after which the
+    # accesses buffered by a process are written to the database.
+    ACCESS_FLUSH_INTERVAL = 10
+    ACCESS_FLUSH_SIZE = 1000
+
+    def __init__(self, path, table, max_size, extra_columns=()):
+        self.path = path
+        self.table = table
+        self.max_size = max_size
+        self.extra_columns = tuple(extra_columns)
+        self._local = threading.local()
+        # The process whose accesses are buffered.
+        self._pid = os.getpid()
+        self._accesses = {}
+        self._accesses_lock = threading.Lock()
+        self._last_flush = time.time()
+
+    def get(self, key, columns=()):
+        """
+        Returns a tuple of the values of the given extra columns of the entry
+        with the given key, or None if there's no such entry.  Records an
+        access to the entry.
+        """
+        selected = ', '.join(('size',) + tuple(columns))
+        row = self.connection().execute(
+            'SELECT {} FROM {} WHERE key = ?'.format(selected, self.table), (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.touch(key)
+        return tuple(row[1:])
+
+    def touch(self, key):
+        """
+        Records an access to the entry with the given key.  Accesses are
+        written to the database in batches.
+        """
+        with self._accesses_lock:
+            _, count = self._accesses.get(key, (None, 0))
+            self._accesses[key] = (time.time(), count + 1)
+            should_flush = (
+                len(self._accesses) >= self.ACCESS_FLUSH_SIZE or
+                time.time() - self._last_flush >= self.ACCESS_FLUSH_INTERVAL
+            )
+        if should_flush:
+            with self.connection() as connection:
+                self._flush_accesses(connection)
+
+    def put(self, key, size, **values):
+        """
+        Adds or replaces the entry with the given key and size, storing the
+        given values in its extra columns.  Returns the keys of the entries
+        evicted to make room for it.
+        """
+        columns = ('key', 'size', 'accessed', 'hits') + tuple(values)
+        placeholders = ', '.join('?' * len(columns))
+        with self.connection() as connection:
+            self._delete(connection, [key])
+            connection.execute(
+                'INSERT INTO {} ({}) VALUES ({})'.format(self.table, ', '.join(columns), placeholders),
+                (key, size, time.time(), 0) + tuple(values.values()),
+            )
+            self._add_to_total_size(connection, size)
+            return self._evict(connection)
+
+    def hits(self, key):
+        """
+        Returns the number of recorded accesses to the entry with the given key.
+        """
+        with self.connection() as connection:
+            self._flush_accesses(connection)
+            row = connection.execute('SELECT hits FROM {} WHERE key = ?'.format(self.table), (key,)).fetchone()
+        return row[0] if row else 0
+
+    def total_size(self):
+        """
+        Returns the total size of the entries.
+        """
+        return self.connection().execute('SELECT total FROM {}_size'.format(self.table)).fetchone()[0]
+
+    def connection(self):
+        """
+        Returns the connection of the current process and thread, creating
+        the database if needed.  Connections aren't reused across a fork.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS {} (key TEXT PRIMARY KEY, size INTEGER, accessed REAL, hits INTEGER{})'
+                    .format(self.table, ''.join(', {} {}'.format(*column) for column in self.extra_columns))
+                )
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS {0}_accessed ON {0} (accessed)'.format(self.table)
+                )
+                connection.execute('CREATE TABLE IF NOT EXISTS {}_size (total INTEGER)'.format(self.table))
+                connection.execute(
+                    'INSERT INTO {0}_size (total) SELECT COALESCE(SUM(size), 0) FROM {0} '
+                    'WHERE NOT EXISTS (SELECT 1 FROM {0}_size)'.format(self.table)
+                )
+            with self._accesses_lock:
+                if self._pid != os.getpid():
+                    # Accesses buffered before a fork are written by the parent.
+                    self._accesses = {}
+                    self._pid = os.getpid()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _flush_accesses(self, connection):
+        """
+        Writes the buffered accesses to the database.
+        """
+        with self._accesses_lock:
+            accesses, self._accesses = self._accesses, {}
+            self._last_flush = time.time()
+        connection.executemany(
+            'UPDATE {} SET accessed = MAX(accessed, ?), hits = hits + ? WHERE key = ?'.format(self.table),
+            [(accessed, count, key) for key, (accessed, count) in accesses.items()],
+        )
+
+    def _add_to_total_size(self, connection, size):
+        """
+        Adds the given size, which may be negative, to the total size of the entries.
+        """
+        connection.execute('UPDATE {}_size SET total = total + ?'.format(self.table), (size,))
+
+    def _delete(self, connection, keys):
+        """
+        Deletes the entries with the given keys, keeping the total size up to date.
+        """
+        keys = [(key,) for key in keys]
+        connection.executemany(
+            'UPDATE {0}_size SET total = total - COALESCE((SELECT size FROM {0} WHERE key = ?), 0)'.format(self.table),
+            keys,
+        )
+        connection.executemany('DELETE FROM {} WHERE key = ?'.format(self.table), keys)
+
+    def _evict(self, connection):
+        """
+        Deletes the least recently used entries while the total size is
+        above max_size, and returns their keys.
+        """
+        total_size = connection.execute('SELECT total FROM {}_size'.format(self.table)).fetchone()[0]
+        if total_size <= self.max_size:
+            return []
+
+        self._flush_accesses(connection)
+        excess = total_size - int(self.max_size * self.EVICTION_TARGET)
+        evicted_keys = []
+        cursor = connection.execute('SELECT key, size FROM {} ORDER BY accessed, rowid'.format(self.table))
+        for key, size in cursor:
+            evicted_keys.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        cursor.close()
+        self._delete(connection, evicted_keys)
+        return evicted_keys
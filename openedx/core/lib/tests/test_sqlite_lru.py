@@ -0,0 +1,89 @@
+"""
+Tests for sqlite_lru.py
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from mock import patch
+
+from openedx.core.lib.sqlite_lru import SQLiteLRUIndex
+
+
+class SQLiteLRUIndexTestCase(unittest.TestCase):
+    """
+    Test the SQLite index of least recently used entries.
+    """
+    def setUp(self):
+        super(SQLiteLRUIndexTestCase, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.path = os.path.join(self.temp_dir, 'index.sqlite')
+
+    def create_index(self, max_size=1000):
+        """
+        Returns an index of entries with a value, in the test database.
+        """
+        return SQLiteLRUIndex(self.path, 'entries', max_size, extra_columns=[('value', 'TEXT')])
+
+    def test_uses_write_ahead_logging(self):
+        index = self.create_index()
+        self.assertEqual(index.connection().execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_put_and_get(self):
+        index = self.create_index()
+        self.assertIsNone(index.get('key', columns=['value']))
+        index.put('key', 10, value=u'value')
+        self.assertEqual(index.get('key', columns=['value']), (u'value',))
+        self.assertEqual(self.create_index().get('key', columns=['value']), (u'value',))
+
+    def test_total_size_is_kept_up_to_date(self):
+        index = self.create_index()
+        index.put('first', 100)
+        index.put('second', 200)
+        index.put('first', 50)
+        self.assertEqual(index.total_size(), 250)
+        self.assertEqual(self.create_index().total_size(), 250)
+
+    def test_evicts_least_recently_used(self):
+        index = self.create_index(max_size=350)
+        for key in ('first', 'second', 'third'):
+            index.put(key, 100)
+        index.get('first')
+
+        self.assertEqual(index.put('fourth', 100), ['second'])
+        self.assertEqual(index.total_size(), 300)
+        self.assertIsNone(index.get('second'))
+
+    def test_accesses_are_written_in_batches(self):
+        index = self.create_index()
+        index.put('key', 10)
+        with patch.object(index, '_flush_accesses') as flush_accesses:
+            for __ in range(3):
+                index.get('key')
+        flush_accesses.assert_not_called()
+        self.assertEqual(index.hits('key'), 3)
+
+        index.ACCESS_FLUSH_SIZE = 1
+        index.get('key')
+        self.assertEqual(self.create_index().hits('key'), 4)
+
+    def test_new_threads_keep_buffered_accesses(self):
+        index = self.create_index()
+        index.put('key', 10)
+        index.get('key')
+
+        thread = threading.Thread(target=index.get, args=('key',))
+        thread.start()
+        thread.join()
+        self.assertEqual(index.hits('key'), 2)
+
+    def test_accesses_buffered_before_a_fork_are_dropped(self):
+        index = self.create_index()
+        index.put('key', 10)
+        index.get('key')
+
+        with patch('os.getpid', return_value=os.getpid() + 1):
+            self.assertEqual(index.hits('key'), 0)
@@ -15,6 +15,8 @@ class ContentTypeGatingFieldOverride(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which forces
     graded content to only be accessible to the Full Access group
     """
+    overridable_fields = frozenset(['group_access'])
+
     def get(self, block, name, default):
         if name != 'group_access':
             return default